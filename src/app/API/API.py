@@ -9,7 +9,45 @@ API request flows.
 from app.API.models.base import Auth, ErrorResponse
 from app.API.models.endpoints import *
 from app.error.errors import DomainException
+from app.util import metrics
 
+from typing import Any, Callable
+
+
+
+STAGE_LATENCY = metrics.Histogram(
+    "zeta_stage_seconds",
+    "Request flow stage latency (authenticate, logic, sign)",
+    ("flow", "stage")
+)
+# per-flow stage latency histogram
+
+
+
+def _run(
+    flow: str,
+    data: Auth,
+    logic: Callable[[Any], Any],
+    sign: Callable[[Any], Auth]
+) -> Auth:
+    """
+    Run a request flow (authenticate, logic, and sign stages), timing each stage.
+
+    :param flow: flow name (stage latency label)
+    :param data: user request
+    :param logic: function generating the response model from the request contents
+    :param sign: function signing the response model
+    :return: server response
+    """
+
+    with STAGE_LATENCY.time(flow, "authenticate"):
+        request = data.authenticate()
+
+    with STAGE_LATENCY.time(flow, "logic"):
+        response = logic(request)
+
+    with STAGE_LATENCY.time(flow, "sign"):
+        return sign(response)
 
 
 def create_event(data: Auth[CreateRequest]) -> Auth[CreateResponse]:
@@ -20,10 +58,12 @@ def create_event(data: Auth[CreateRequest]) -> Auth[CreateResponse]:
     :return: server response
     """
 
-    request = data.authenticate()
-    response = CreateResponse.generate(request, data.public_key)
-    
-    return Auth[CreateResponse].load(response)
+    return _run(
+        "create_event",
+        data,
+        lambda request: CreateResponse.generate(request, data.public_key),
+        Auth[CreateResponse].load
+    )
 
 
 def search_events(data: Auth[SearchRequest]) -> Auth[SearchResponse]:
@@ -34,10 +74,12 @@ def search_events(data: Auth[SearchRequest]) -> Auth[SearchResponse]:
     :return: server response
     """
 
-    request = data.authenticate()
-    response = SearchResponse.generate(request)
-
-    return Auth[SearchResponse].load(response)
+    return _run(
+        "search_events",
+        data,
+        SearchResponse.generate,
+        lambda response: Auth[SearchResponse].load_public(response, data.data.nonce)
+    )
 
 
 def register_user(data: Auth[RegisterRequest]) -> Auth[RegisterResponse]:
@@ -48,10 +90,28 @@ def register_user(data: Auth[RegisterRequest]) -> Auth[RegisterResponse]:
     :return: server response
     """
 
-    request = data.authenticate()
-    response = RegisterResponse.generate(request, data.public_key)
+    return _run(
+        "register_user",
+        data,
+        lambda request: RegisterResponse.generate(request, data.public_key),
+        Auth[RegisterResponse].load
+    )
 
-    return Auth[RegisterResponse].load(response)
+
+def register_users(data: Auth[BulkRegisterRequest]) -> Auth[BulkRegisterResponse]:
+    """
+    /register/bulk request flow.
+
+    :param data: user request
+    :return: server response
+    """
+
+    return _run(
+        "register_users",
+        data,
+        lambda request: BulkRegisterResponse.generate(request, data.public_key),
+        Auth[BulkRegisterResponse].load
+    )
 
 
 def transfer_ticket(data: Auth[TransferRequest]) -> Auth[TransferResponse]:
@@ -62,10 +122,12 @@ def transfer_ticket(data: Auth[TransferRequest]) -> Auth[TransferResponse]:
     :return: server response
     """
 
-    request = data.authenticate()
-    response = TransferResponse.generate(request, data.public_key)
-
-    return Auth[TransferResponse].load(response)
+    return _run(
+        "transfer_ticket",
+        data,
+        lambda request: TransferResponse.generate(request, data.public_key),
+        Auth[TransferResponse].load
+    )
 
 
 def redeem_ticket(data: Auth[RedeemRequest]) -> Auth[RedeemResponse]:
@@ -76,10 +138,12 @@ def redeem_ticket(data: Auth[RedeemRequest]) -> Auth[RedeemResponse]:
     :return: server response
     """
 
-    request = data.authenticate()
-    response = RedeemResponse.generate(request, data.public_key)
-
-    return Auth[RedeemResponse].load(response)
+    return _run(
+        "redeem_ticket",
+        data,
+        lambda request: RedeemResponse.generate(request, data.public_key),
+        Auth[RedeemResponse].load
+    )
 
 
 def validate_ticket(data: Auth[ValidateRequest]) -> Auth[ValidateResponse]:
@@ -90,10 +154,60 @@ def validate_ticket(data: Auth[ValidateRequest]) -> Auth[ValidateResponse]:
     :return: server response
     """
 
-    request = data.authenticate()
-    response = ValidateResponse.generate(request, data.public_key)
+    return _run(
+        "validate_ticket",
+        data,
+        lambda request: ValidateResponse.generate(request, data.public_key),
+        Auth[ValidateResponse].load
+    )
 
-    return Auth[ValidateResponse].load(response)
+
+def validate_tickets(data: Auth[BatchValidateRequest]) -> Auth[BatchValidateResponse]:
+    """
+    /validate/batch request flow.
+
+    :param data: user request
+    :return: server response
+    """
+
+    return _run(
+        "validate_tickets",
+        data,
+        lambda request: BatchValidateResponse.generate(request, data.public_key),
+        Auth[BatchValidateResponse].load
+    )
+
+
+def snapshot_event(data: Auth[SnapshotRequest]) -> Auth[SnapshotResponse]:
+    """
+    /snapshot request flow.
+
+    :param data: user request
+    :return: server response
+    """
+
+    return _run(
+        "snapshot_event",
+        data,
+        lambda request: SnapshotResponse.generate(request, data.public_key),
+        Auth[SnapshotResponse].load
+    )
+
+
+def upload_stamps(data: Auth[StampUploadRequest]) -> Auth[StampUploadResponse]:
+    """
+    /snapshot/stamps request flow.
+
+    :param data: user request
+    :return: server response
+    """
+
+    return _run(
+        "upload_stamps",
+        data,
+        lambda request: StampUploadResponse.generate(request, data.public_key),
+        Auth[StampUploadResponse].load
+    )
 
 
 def flag_ticket(data: Auth[FlagRequest]) -> Auth[FlagResponse]:
@@ -104,10 +218,12 @@ def flag_ticket(data: Auth[FlagRequest]) -> Auth[FlagResponse]:
     :return: server response
     """
 
-    request = data.authenticate()
-    response = FlagResponse.generate(request, data.public_key)
-
-    return Auth[FlagResponse].load(response)
+    return _run(
+        "flag_ticket",
+        data,
+        lambda request: FlagResponse.generate(request, data.public_key),
+        Auth[FlagResponse].load
+    )
 
 
 def cancel_ticket(data: Auth[CancelRequest]) -> Auth[CancelResponse]:
@@ -118,10 +234,12 @@ def cancel_ticket(data: Auth[CancelRequest]) -> Auth[CancelResponse]:
     :return: server response
     """
 
-    request = data.authenticate()
-    response = CancelResponse.generate(request, data.public_key)
-
-    return Auth[CancelResponse].load(response)
+    return _run(
+        "cancel_ticket",
+        data,
+        lambda request: CancelResponse.generate(request, data.public_key),
+        Auth[CancelResponse].load
+    )
 
 
 def delete_event(data: Auth[DeleteRequest]) -> Auth[DeleteResponse]:
@@ -132,10 +250,12 @@ def delete_event(data: Auth[DeleteRequest]) -> Auth[DeleteResponse]:
     :return: server response
     """
 
-    request = data.authenticate()
-    response = DeleteResponse.generate(request, data.public_key)
-
-    return Auth[DeleteResponse].load(response)
+    return _run(
+        "delete_event",
+        data,
+        lambda request: DeleteResponse.generate(request, data.public_key),
+        Auth[DeleteResponse].load
+    )
 
 
 def update_permissions(data: Auth[PermissionsRequest]) -> Auth[PermissionsResponse]:
@@ -146,10 +266,12 @@ def update_permissions(data: Auth[PermissionsRequest]) -> Auth[PermissionsRespon
     :return: server response
     """
 
-    request = data.authenticate()
-    response = PermissionsResponse.generate(request, data.public_key)
-
-    return Auth[PermissionsResponse].load(response)
+    return _run(
+        "update_permissions",
+        data,
+        lambda request: PermissionsResponse.generate(request, data.public_key),
+        Auth[PermissionsResponse].load
+    )
 
 
 def exception_handler(exception: DomainException) -> Auth[ErrorResponse]:
@@ -160,6 +282,8 @@ def exception_handler(exception: DomainException) -> Auth[ErrorResponse]:
     :return: server error response
     """
 
-    response = ErrorResponse.generate(exception)
+    with STAGE_LATENCY.time("exception_handler", "logic"):
+        response = ErrorResponse.generate(exception)
 
-    return Auth[ErrorResponse].load(response)
\ No newline at end of file
+    with STAGE_LATENCY.time("exception_handler", "sign"):
+        return Auth[ErrorResponse].load(response)
\ No newline at end of file
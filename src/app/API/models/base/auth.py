@@ -6,10 +6,15 @@ Base authenticated data packet models.
 
 
 
-from app.crypto.asymmetric import AKC
+from app.crypto.asymmetric import ALGORITHMS, Algorithm, Signer
+from app.crypto.canon import canonicalize
 from app.error.errors import DomainException, ErrorKind
-from app.util import keys
+from app.util import keys, metrics, readiness
+from app.util.cache import LRUCache
+from app.util.nonce import NonceStore, RedisNonceBatcher
+from config import SIGNATURE_CACHE_WINDOW
 
+import hashlib
 import math
 import time
 import uuid
@@ -35,11 +40,115 @@ REDIS = None
 # Redis client
 
 
-STATE_CLEANUP_INTERVAL = 10
+REDIS_BATCH_WINDOW = 0.0002
+# time (in seconds) to collect concurrent Redis nonce checks into one pipeline
+# (None to send one SET command per check)
+
+
+REDIS_BATCH_SIZE = 256
+# maximum number of nonce checks per Redis pipeline
+
+
+REDIS_BATCH_FLUSHERS = 2
+# number of concurrent Redis nonce pipelines
+
+
+REDIS_BATCH_TIMEOUT = 2
+# maximum time (in seconds) to wait for a batched Redis nonce check (a check without a
+# result in time fails, and its request is rejected)
+
+
+nonce_batcher = None
+# Redis nonce check batcher
+
+
+NONCE_STORE_SHARDS = 16
+# in-memory nonce store shard count (power of two)
+
+
+NONCE_BUCKET_WIDTH = 1
+# in-memory nonce store expiration generation width (in seconds)
+
+
 nonce_store = None
-store_lock = None
-next_cleanup = None
-# in-memory fallback global definitions
+# in-memory fallback nonce store
+
+
+SIGNATURE_CACHE_SIZE = 1024
+# maximum number of distinct public read responses with a cached signature
+
+
+SIGNATURE_CACHE = (
+    LRUCache(SIGNATURE_CACHE_SIZE, SIGNATURE_CACHE_WINDOW)
+    if SIGNATURE_CACHE_WINDOW is not None else None
+)
+metrics.register_cache("signature", SIGNATURE_CACHE)
+# signed public read data payloads by content digest (None if disabled)
+
+
+
+def _collect_nonces() -> list[tuple]:
+    """
+    Collect nonce tracking metrics.
+
+    :return: metric samples
+    """
+
+    if nonce_batcher is not None:
+        stats = nonce_batcher.stats()
+
+        return [
+            (
+                "zeta_nonce_batches_total", "counter", "Redis nonce pipelines sent", {},
+                stats["batches"]
+            ),
+            (
+                "zeta_nonce_batched_checks_total", "counter",
+                "Redis nonce checks sent in pipelines", {}, stats["checks"]
+            ),
+            (
+                "zeta_nonce_batch_size_max", "gauge", "Largest Redis nonce pipeline", {},
+                stats["max_batch_size"]
+            )
+        ]
+
+    if nonce_store is not None:
+        return [(
+            "zeta_nonce_store_entries", "gauge", "Tracked in-memory nonces", {},
+            len(nonce_store)
+        )]
+
+    return []
+
+
+metrics.register(_collect_nonces)
+
+
+def _check_nonces() -> None:
+    """
+    Readiness check: the nonce tracker is started (and Redis answers, if used).
+    """
+
+    if not SERVICE_STARTED:
+        raise Exception("nonce tracker not started")
+
+    if REDIS is not None:
+        REDIS.ping()
+
+
+readiness.register("nonces", _check_nonces)
+
+
+NONCE_LATENCY = metrics.Histogram(
+    "zeta_nonce_check_seconds", "Request nonce check latency", ("store",)
+)
+# nonce check latency by nonce store ("memory" or "redis")
+
+
+VERIFY_LATENCY = metrics.Histogram(
+    "zeta_verify_seconds", "Request signature verification latency", ("algorithm",)
+)
+# request signature verification latency by signature algorithm
 
 
 T = TypeVar("T")
@@ -81,6 +190,14 @@ class Auth(BaseModel, Generic[T]):
     data: Data[T] = Field(..., description="Authenticated data")
     public_key: str = Field(..., description="Public key")
     signature: str = Field(..., description="Digital signature")
+    algorithm: Algorithm = Field("rsa", description="Digital signature algorithm")
+    reply_to: str | None = Field(
+        None,
+        description=(
+            "Request nonce answered by a response with a cached signature (unsigned; "
+            "responses only)"
+        )
+    )
 
 
     @staticmethod
@@ -96,18 +213,19 @@ class Auth(BaseModel, Generic[T]):
         # set service flag
 
         if redis_url is None:
-            from threading import Lock
-            global nonce_store, store_lock, next_cleanup
+            global nonce_store
 
-            nonce_store = {}
-            store_lock = Lock()
-            next_cleanup = time.time() + STATE_CLEANUP_INTERVAL
+            nonce_store = NonceStore(
+                TIMESTAMP_ERROR + TTL_SECURITY_PAD,
+                NONCE_STORE_SHARDS,
+                NONCE_BUCKET_WIDTH
+            )
             # set up in-memory fallback for nonce key/value storage replay prevention
 
             return
 
         import redis
-        global REDIS
+        global REDIS, nonce_batcher
 
         try:
             REDIS = redis.Redis.from_url(redis_url, decode_responses=True)
@@ -117,27 +235,110 @@ class Auth(BaseModel, Generic[T]):
         except Exception as e:
             raise Exception("redis connection failed") from e
 
+        if REDIS_BATCH_WINDOW is not None:
+            nonce_batcher = RedisNonceBatcher(
+                REDIS,
+                REDIS_BATCH_WINDOW,
+                REDIS_BATCH_SIZE,
+                REDIS_BATCH_FLUSHERS,
+                REDIS_BATCH_TIMEOUT
+            )
+            # coalesce concurrent nonce checks into pipelines
+
+
+    @staticmethod
+    def stop_service() -> None:
+        """
+        Stop the authentication nonce-tracker service (flushing pending Redis nonce
+        checks).
+        """
+
+        global SERVICE_STARTED, nonce_batcher
+        SERVICE_STARTED = False
+
+        if nonce_batcher is not None:
+            nonce_batcher.stop()
+            nonce_batcher = None
+
 
     @classmethod
     def load(
         cls,
         content: T,
-        cipher: AKC = keys.RESPONSE_SIGNER,
+        cipher: Signer | None = None,
     ) -> Self:
         """
         Sign a data payload and load into an authenticated packet.
 
         :param content: content to be loaded and authenticated
-        :param cipher: asymmetric signing cipher
+        :param cipher: asymmetric signing cipher (the server response signer if None)
         :return: new valid authenticated packet with injected data payload
         """
 
+        if cipher is None:
+            cipher = keys.get_signer()
+
         data = Data.load(content)
 
         return cls(
             data=data,
             public_key=cipher.public_key,
-            signature=cipher.sign(data.model_dump())
+            signature=cipher.sign(data.model_dump()),
+            algorithm=cipher.ALGORITHM
+        )
+
+
+    @classmethod
+    def load_public(
+        cls,
+        content: T,
+        request_nonce: str,
+        cipher: Signer | None = None
+    ) -> Self:
+        """
+        Sign a public read response, reusing the signature of identical content within
+        the signature cache window (if enabled).
+
+        A reused response carries the data payload (nonce and timestamp included) that
+        was signed when the content was first served in the window, so only the content
+        digest is computed per response.  The response is tied to the request only by
+        the unsigned "reply_to" nonce echo: it proves that the server returned this
+        content within the window, not that it answered this particular request (see
+        SIGNATURE_CACHE_WINDOW in config.py).  Only use for content that is public and
+        identical for every requester.
+
+        :param content: content to be loaded and authenticated
+        :param request_nonce: nonce of the request being answered
+        :param cipher: asymmetric signing cipher (the server response signer if None)
+        :return: new valid authenticated packet with injected data payload
+        """
+
+        if cipher is None:
+            cipher = keys.get_signer()
+
+        if SIGNATURE_CACHE is None:
+            return cls.load(content, cipher)
+
+        digest = hashlib.sha256(canonicalize(content.model_dump())).digest()
+        cached = SIGNATURE_CACHE.get(digest)
+
+        if cached is None:
+            data = Data.load(content)
+            signature = cipher.sign(data.model_dump())
+            SIGNATURE_CACHE.put(digest, (data.nonce, data.timestamp, signature))
+            # sign once per content per window
+
+        else:
+            nonce, timestamp, signature = cached
+            data = Data(nonce=nonce, timestamp=timestamp, content=content)
+            # reuse the payload signed earlier in the window
+
+        return cls(
+            data=data,
+            public_key=cipher.public_key,
+            signature=signature,
+            algorithm=cipher.ALGORITHM,
+            reply_to=request_nonce
         )
 
 
@@ -151,36 +352,14 @@ class Auth(BaseModel, Generic[T]):
         return self.data.content
     
 
-    def _nonce_check_naive(self) -> None:
+    def _nonce_check_memory(self) -> None:
         """
-        Naive in-memory repeat nonce detection.
+        In-memory repeat nonce detection.
         """
 
-        global next_cleanup
-        
-        with store_lock:
-            if self.data.nonce in nonce_store:
-                raise DomainException(ErrorKind.CONFLICT, "duplicate request nonce")
-                # check for duplicate request nonce
-
-            nonce_store[self.data.nonce] = self.data.timestamp
-            # set nonce key in global storage
-
-            now = time.time()
-
-            if next_cleanup <= now:
-                to_delete = []
-
-                for key, value in nonce_store.items():
-                    if now > value + TIMESTAMP_ERROR + TTL_SECURITY_PAD:
-                        to_delete.append(key)
-                        # mark expired nonce keys for cleanup
-                        
-                for key in to_delete:
-                    del nonce_store[key]
-                    # delete expired nonce keys
-
-                next_cleanup = now + STATE_CLEANUP_INTERVAL
+        if not nonce_store.add(self.data.nonce, self.data.timestamp):
+            raise DomainException(ErrorKind.CONFLICT, "duplicate request nonce")
+            # check for duplicate request nonce
 
 
     def _nonce_check_redis(self) -> None:
@@ -191,19 +370,65 @@ class Auth(BaseModel, Generic[T]):
         key = f"replay:{self.public_key}:{self.data.nonce}"
         expiration = self.data.timestamp + TIMESTAMP_ERROR + TTL_SECURITY_PAD
 
-        was_set = REDIS.set(
-            name=key,
-            value=str(self.data.timestamp),
-            nx=True,
-            ex=int(math.ceil(expiration - time.time()))
-        )
-        # set nonce key in Redis
+        ttl = int(math.ceil(expiration - time.time()))
+
+        if nonce_batcher is not None:
+            try:
+                was_set = nonce_batcher.add(key, str(self.data.timestamp), ttl)
+                # set nonce key in Redis (pipelined with concurrent checks)
+
+            except TimeoutError:
+                raise DomainException(ErrorKind.INTERNAL, "nonce check timed out")
+                # an unconfirmed nonce is never accepted
+
+        else:
+            was_set = REDIS.set(
+                name=key,
+                value=str(self.data.timestamp),
+                nx=True,
+                ex=ttl
+            )
+            # set nonce key in Redis
 
         if not was_set:
             raise DomainException(ErrorKind.CONFLICT, "duplicate request nonce")
             # check for duplicate request nonce
 
 
+    def authenticate_public(self, request_nonce: str, window: float) -> T:
+        """
+        Authenticate a received public read response that may carry a cached signature
+        (client side; no nonce tracking, since cached payloads repeat within a window).
+
+        :param request_nonce: nonce of the request that this response answers
+        :param window: maximum accepted payload age (in seconds), the server's
+            signature cache window
+        :return: validated data packet contents
+        """
+
+        if self.reply_to is not None and self.reply_to != request_nonce:
+            raise DomainException(ErrorKind.VALIDATION, "response for different request")
+            # check the (unsigned) request binding
+
+        if not -TIMESTAMP_ERROR <= time.time() - self.data.timestamp <= (
+            window + TIMESTAMP_ERROR
+        ):
+            raise DomainException(ErrorKind.VALIDATION, "timestamp out of sync")
+            # check that the signed payload is no older than the cache window
+
+        try:
+            cipher = ALGORITHMS[self.algorithm](public_key=self.public_key)
+
+        except Exception:
+            raise DomainException(ErrorKind.VALIDATION, "invalid public key")
+
+        if not cipher.verify(self.signature, self.data.model_dump(exclude_unset=True)):
+            raise DomainException(ErrorKind.PERMISSION, "signature verification failed")
+            # verify signature
+
+        return self.data.content
+
+
     def authenticate(self) -> T:
         """
         Authenticate a received packet.
@@ -214,20 +439,34 @@ class Auth(BaseModel, Generic[T]):
         if not SERVICE_STARTED:
             raise Exception("Authentication nonce-tracker service not started")
 
-        if abs(time.time() - self.data.timestamp) > TIMESTAMP_ERROR:
+        if not abs(time.time() - self.data.timestamp) <= TIMESTAMP_ERROR:
             raise DomainException(ErrorKind.VALIDATION, "timestamp out of sync")
             # check for expired timestamp
 
         if REDIS is None:
-            self._nonce_check_naive()
+            with NONCE_LATENCY.time("memory"):
+                self._nonce_check_memory()
 
         else:
-            self._nonce_check_redis()
-
-        cipher = AKC(public_key=self.public_key)
-
-        if not cipher.verify(self.signature, self.data.model_dump(exclude_unset=True)):
-            raise DomainException(ErrorKind.PERMISSION, "signature verification failed")
-            # verify signature
+            with NONCE_LATENCY.time("redis"):
+                self._nonce_check_redis()
+
+        with VERIFY_LATENCY.time(self.algorithm):
+            try:
+                cipher = ALGORITHMS[self.algorithm](public_key=self.public_key)
+                # load a verifier for the sender's declared signature algorithm
+
+            except Exception:
+                raise DomainException(ErrorKind.VALIDATION, "invalid public key")
+
+            if not cipher.verify(
+                self.signature,
+                self.data.model_dump(exclude_unset=True)
+            ):
+                raise DomainException(
+                    ErrorKind.PERMISSION,
+                    "signature verification failed"
+                )
+                # verify signature
         
         return self.data.content
\ No newline at end of file
@@ -8,11 +8,27 @@ API endpoint models module.
 
 from .search import SearchRequest, SearchResponse
 from .create import CreateRequest, CreateResponse
-from .register import RegisterRequest, RegisterResponse
+from .register import (
+    RegisterRequest,
+    RegisterResponse,
+    BulkRegisterRequest,
+    BulkRegisterResponse
+)
 from .transfer import TransferRequest, TransferResponse
 from .redeem import RedeemRequest, RedeemResponse
-from .validate import ValidateRequest, ValidateResponse
+from .validate import (
+    ValidateRequest,
+    ValidateResponse,
+    BatchValidateRequest,
+    BatchValidateResponse
+)
 from .flag import FlagRequest, FlagResponse
 from .cancel import CancelRequest, CancelResponse
 from .delete import DeleteRequest, DeleteResponse
-from .permissions import PermissionsRequest, PermissionsResponse
\ No newline at end of file
+from .permissions import PermissionsRequest, PermissionsResponse
+from .snapshot import (
+    SnapshotRequest,
+    SnapshotResponse,
+    StampUploadRequest,
+    StampUploadResponse
+)
\ No newline at end of file
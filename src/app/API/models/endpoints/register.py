@@ -17,6 +17,11 @@ from typing import Any, Self
 
 
 
+BULK_REGISTER_LIMIT = 1024
+# maximum number of tickets issued per bulk registration request
+
+
+
 class Verification(BaseModel):
     """
     Registration verification block signed by event owner.
@@ -111,4 +116,73 @@ class RegisterResponse(BaseModel):
         ticket = Ticket.register(request.event_id, public_key, transfer_limit, metadata)
         ticket = ticket.pack()
 
-        return cls(ticket=ticket)
\ No newline at end of file
+        return cls(ticket=ticket)
+
+
+
+class BulkRegisterRequest(BaseModel):
+    """
+    /register/bulk user request.
+    """
+
+    event_id: str = Field(..., description="ID of the event to issue tickets for")
+    public_keys: list[str] = Field(
+        ...,
+        min_length=1,
+        max_length=BULK_REGISTER_LIMIT,
+        description="Public keys of the ticket holders (one ticket per key)"
+    )
+    transfer_limit: int | None = Field(
+        None,
+        ge=0,
+        le=TRANSFER_LIMIT,
+        description="Custom ticket transfer limit"
+    )
+    metadata: Any = Field(None, description="Custom ticket metadata")
+
+
+
+class BulkRegisterResponse(BaseModel):
+    """
+    /register/bulk server response.
+    """
+
+    first_ticket_number: int = Field(..., description="First issued ticket number")
+    tickets: list[str] = Field(
+        ...,
+        description="Ticket strings (in public key order, numbered consecutively)"
+    )
+
+
+    @classmethod
+    def generate(cls, request: BulkRegisterRequest, public_key: str) -> Self:
+        """
+        Generate the server response from a user request.
+
+        :param request: user request
+        :param public_key: user public key
+        :return: server response
+        """
+
+        permissions = Permissions.load(request.event_id, public_key)
+
+        if not permissions.is_authorized("authorize_registration"):
+            raise DomainException(ErrorKind.PERMISSION, "permission denied")
+            # confirm user is an authorized party
+
+        transfer_limit = request.transfer_limit
+
+        if transfer_limit is None:
+            transfer_limit = Event.load(request.event_id).transfer_limit
+
+        tickets = Ticket.register_many(
+            request.event_id,
+            request.public_keys,
+            transfer_limit,
+            request.metadata
+        )
+
+        return cls(
+            first_ticket_number=tickets[0].number + 1, # 1-indexed ticket number
+            tickets=Ticket.pack_many(tickets)
+        )
\ No newline at end of file
@@ -6,13 +6,25 @@
 
 
 
+from app.crypto import hash
+from app.crypto.canon import canonicalize
 from app.data.models.event import Event
+from app.error.errors import DomainException, ErrorKind
+from app.util import keys
 
+import base64
+import hmac
+import json
 from pydantic import BaseModel, Field
 from typing import Literal, Self
 
 
 
+CURSOR_TAG_SIZE = 16
+# search cursor HMAC tag size (in bytes)
+
+
+
 class SearchRequest(BaseModel):
     """
     /search user request.
@@ -20,7 +32,18 @@ class SearchRequest(BaseModel):
     
     text: str = Field(..., description="Search text pattern to find relevant events")
     limit: int = Field(16, ge=1, le=64, description="Maximum number of results")
-    mode: Literal["id", "text"] = Field("id", description="Search mode")
+    mode: Literal["id", "text", "fulltext"] = Field(
+        "id",
+        description=(
+            "Search mode (event ID, name substring, or ranked full-text search over "
+            "names and descriptions)"
+        )
+    )
+    cursor: str | None = Field(
+        None,
+        max_length=512,
+        description="Cursor from a previous response to fetch the next page of results"
+    )
 
 
 
@@ -30,6 +53,82 @@ class SearchResponse(BaseModel):
     """
 
     events: list[Event] = Field(..., description="List of found events")
+    cursor: str | None = Field(
+        None,
+        description="Cursor for the next page of results (omitted on the last page)"
+    )
+
+
+    @staticmethod
+    def _cursor_tag(request: SearchRequest, rank: float | None, event_id: str) -> bytes:
+        """
+        Authenticate a cursor position for a specific search.
+
+        :param request: user request
+        :param rank: relevance of the last returned event (None for name searches)
+        :param event_id: ID of the last returned event
+        :return: cursor HMAC tag
+        """
+
+        message = canonicalize({
+            "mode": request.mode,
+            "text": request.text,
+            "rank": rank,
+            "id": event_id
+        })
+
+        return hash.generate_hmac(keys.get_cursor_key(), message)[:CURSOR_TAG_SIZE]
+
+
+    @staticmethod
+    def _pack_cursor(request: SearchRequest, rank: float | None, event_id: str) -> str:
+        """
+        Generate an opaque signed cursor for the next page of a search.
+
+        :param request: user request
+        :param rank: relevance of the last returned event (None for name searches)
+        :param event_id: ID of the last returned event
+        :return: cursor string
+        """
+
+        position = json.dumps([rank, event_id], separators=(",", ":")).encode()
+        tag = SearchResponse._cursor_tag(request, rank, event_id)
+
+        return (
+            base64.urlsafe_b64encode(position).decode() + "." +
+            base64.urlsafe_b64encode(tag).decode()
+        )
+
+
+    @staticmethod
+    def _unpack_cursor(request: SearchRequest) -> tuple[float | None, str]:
+        """
+        Verify a search cursor and extract its position.
+
+        :param request: user request (with cursor)
+        :return: (rank, event ID) position of the last event on the previous page
+        """
+
+        try:
+            b64_position, b64_tag = request.cursor.split(".")
+            rank, event_id = json.loads(base64.urlsafe_b64decode(b64_position))
+            tag = base64.urlsafe_b64decode(b64_tag)
+
+            if not (
+                (rank is None or isinstance(rank, float)) and isinstance(event_id, str)
+            ):
+                raise ValueError("malformed cursor position")
+
+        except Exception:
+            raise DomainException(ErrorKind.VALIDATION, "invalid cursor")
+
+        expected = SearchResponse._cursor_tag(request, rank, event_id)
+
+        if not hmac.compare_digest(tag, expected):
+            raise DomainException(ErrorKind.VALIDATION, "invalid cursor")
+            # reject forged cursors and cursors issued for a different search
+
+        return rank, event_id
 
 
     @classmethod
@@ -42,9 +141,18 @@ class SearchResponse(BaseModel):
         """
 
         if request.mode.lower() == "id":
-            events = [Event.load(request.text)]
+            return cls(events=[Event.load(request.text)])
+
+        after = None if request.cursor is None else cls._unpack_cursor(request)
 
-        else:
-            events = Event.search(request.text, request.limit)
+        events, last = Event.search(
+            request.text,
+            request.limit,
+            ranked=request.mode == "fulltext",
+            after=after
+        )
 
-        return cls(events=events)
\ No newline at end of file
+        return cls(
+            events=events,
+            cursor=None if last is None else cls._pack_cursor(request, *last)
+        )
\ No newline at end of file
@@ -0,0 +1,270 @@
+"""
+/snapshot endpoint data packet models.
+
+:author: Max Milazzo
+"""
+
+
+
+from app.API.models.base import ErrorResponse
+from app.crypto import exchange
+from app.data.models.event import Event
+from app.data.models.permissions import Permissions
+from app.data.models.ticket import Ticket, FLAG_PUBLIC_TOGGLE_BYTE
+from app.error.errors import DomainException, ErrorKind
+
+import base64
+import time
+import zlib
+from pydantic import BaseModel, Field
+from typing import Self
+
+
+
+UPLOAD_LIMIT = 4096
+# maximum number of buffered stamps per upload request
+
+
+SNAPSHOT_COMPRESSION_LEVEL = 6
+# zlib compression level for snapshot state and flag bytes
+
+
+
+class SnapshotRequest(BaseModel):
+    """
+    /snapshot user request.
+    """
+
+    event_id: str = Field(..., description="Event ID to take a snapshot of")
+    exchange_key: str = Field(
+        ...,
+        description="Scanner X25519 public key PEM string (receives the read key)"
+    )
+
+
+
+class SnapshotResponse(BaseModel):
+    """
+    /snapshot server response.
+    """
+
+    event_id: str = Field(..., description="Event ID")
+    taken_at: float = Field(..., description="Epoch timestamp of the snapshot")
+    issued: int = Field(..., description="Number of tickets issued (and covered)")
+    state: str = Field(
+        ...,
+        description="zlib-compressed ticket state bytes (base64, one per ticket number)"
+    )
+    flags: str | None = Field(
+        ...,
+        description=(
+            "zlib-compressed ticket flag bytes (base64, one per ticket number; private "
+            "flags are zeroed unless the requester may see them; omitted if flags are "
+            "disabled)"
+        )
+    )
+    exchange_key: str = Field(
+        ...,
+        description="Server ephemeral X25519 public key PEM string"
+    )
+    read_key: str = Field(
+        ...,
+        description=(
+            "Event read key wrapped to the scanner exchange key (base64; decrypts "
+            "format 4 tickets to check them locally, but cannot produce tickets the "
+            "server accepts)"
+        )
+    )
+
+
+    @staticmethod
+    def _compress(data: bytes) -> str:
+        """
+        Compress and encode snapshot bytes.
+
+        :param data: raw snapshot bytes
+        :return: compressed base64 string
+        """
+
+        return base64.b64encode(
+            zlib.compress(data, SNAPSHOT_COMPRESSION_LEVEL)
+        ).decode("utf-8")
+
+
+    @classmethod
+    def generate(cls, request: SnapshotRequest, public_key: str) -> Self:
+        """
+        Generate the server response from a user request.
+
+        The scanner receives the event read key rather than the event key: it can
+        decrypt and check tickets, but any ticket it produced would fail the server's
+        seal check.  A leaked read key still exposes ticket contents and could be used
+        to fool other offline scanners, so buffered stamps are verified in full when
+        uploaded.
+
+        :param request: user request
+        :param public_key: user public key
+        :return: server response
+        """
+
+        permissions = Permissions.load(request.event_id, public_key)
+
+        if not (
+            permissions.is_authorized("stamp_ticket") and
+            permissions.is_authorized("see_stamped_ticket")
+        ):
+            raise DomainException(ErrorKind.PERMISSION, "permission denied")
+            # confirm user is an authorized party (a snapshot reveals stamped status and
+            # its read key can decrypt any ticket)
+
+        try:
+            exchange_key, read_key = exchange.wrap(
+                Ticket.read_key(request.event_id, Event.get_key(request.event_id)),
+                request.exchange_key,
+                request.event_id.encode("utf-8")
+            )
+
+        except DomainException:
+            raise
+
+        except Exception:
+            raise DomainException(ErrorKind.VALIDATION, "invalid exchange key")
+
+        taken_at = time.time()
+        issued, state, flags = Ticket.snapshot(request.event_id)
+
+        if flags is not None and not permissions.is_authorized("see_ticket_flag"):
+            flags = bytes(
+                flag if flag & FLAG_PUBLIC_TOGGLE_BYTE else 0 for flag in flags
+            )
+            # hide non-public flag values from requesters who may not see them
+
+        return cls(
+            event_id=request.event_id,
+            taken_at=taken_at,
+            issued=issued,
+            state=cls._compress(state),
+            flags=cls._compress(flags) if flags is not None else None,
+            exchange_key=exchange_key,
+            read_key=read_key
+        )
+
+
+
+class BufferedStamp(BaseModel):
+    """
+    Ticket stamped by a scanner while working from a snapshot.
+    """
+
+    ticket: str = Field(..., description="Stamped ticket string")
+    check_public_key: str = Field(..., description="Public key of the ticket holder")
+
+
+
+class StampUploadRequest(BaseModel):
+    """
+    /snapshot/stamps user request.
+    """
+
+    event_id: str = Field(..., description="Event ID of the stamped tickets")
+    stamps: list[BufferedStamp] = Field(
+        ...,
+        min_length=1,
+        max_length=UPLOAD_LIMIT,
+        description="Buffered stamps (in scan order)"
+    )
+
+
+
+class StampUploadResult(BaseModel):
+    """
+    /snapshot/stamps per-stamp result.
+    """
+
+    ticket_number: int | None = Field(
+        None,
+        description="Stamped ticket number (omitted if the ticket could not be read)"
+    )
+    error: ErrorResponse | None = Field(
+        None,
+        description="Stamp conflict or error (omitted if the stamp was applied)"
+    )
+
+
+
+class StampUploadResponse(BaseModel):
+    """
+    /snapshot/stamps server response.
+    """
+
+    stamped: int = Field(..., description="Number of stamps applied")
+    results: list[StampUploadResult] = Field(
+        ...,
+        description="Per-stamp results (in request order)"
+    )
+
+
+    @classmethod
+    def generate(cls, request: StampUploadRequest, public_key: str) -> Self:
+        """
+        Generate the server response from a user request.
+
+        Every readable ticket is stamped with one state update, using the same rules as
+        an online stamp: only a redeemed, current, uncanceled ticket is stamped, and
+        every other stamp is reported as a conflict (for example, a ticket already
+        stamped at another gate).
+
+        :param request: user request
+        :param public_key: user public key
+        :return: server response
+        """
+
+        permissions = Permissions.load(request.event_id, public_key)
+
+        if not permissions.is_authorized("stamp_ticket"):
+            raise DomainException(ErrorKind.PERMISSION, "permission denied")
+            # confirm user is an authorized party
+
+        event_key = Event.get_key(request.event_id)
+        results = [None] * len(request.stamps)
+        tickets = {}
+        first = {}
+        duplicates = {}
+
+        for index, stamp in enumerate(request.stamps):
+            try:
+                ticket = Ticket.decrypt(
+                    request.event_id,
+                    stamp.check_public_key,
+                    stamp.ticket,
+                    event_key
+                )
+
+            except DomainException as e:
+                results[index] = StampUploadResult(error=ErrorResponse.generate(e))
+                continue
+
+            if ticket.number in first:
+                duplicates[index] = first[ticket.number]
+                continue
+                # the same ticket scanned twice (e.g. at two gates) while offline is
+                # stamped once, and reported with the result of its first occurrence
+
+            first[ticket.number] = index
+            tickets[index] = ticket
+
+        errors = Ticket.stamp_many(list(tickets.values()))
+
+        for (index, ticket), error in zip(tickets.items(), errors):
+            results[index] = StampUploadResult(
+                ticket_number=ticket.number + 1, # 1-indexed ticket number
+                error=ErrorResponse.generate(error) if error is not None else None
+            )
+
+        for index, original in duplicates.items():
+            results[index] = results[original]
+
+        return cls(
+            stamped=sum(error is None for error in errors),
+            results=results
+        )
\ No newline at end of file
@@ -6,7 +6,8 @@
 
 
 
-from app.data.models.event import TRANSFER_LIMIT
+from app.API.models.base import ErrorResponse
+from app.data.models.event import Event, TRANSFER_LIMIT
 from app.data.models.permissions import Permissions
 from app.data.models.ticket import Ticket
 from app.error.errors import DomainException, ErrorKind
@@ -16,6 +17,11 @@ from typing import Any, Self
 
 
 
+BATCH_LIMIT = 64
+# maximum number of tickets per batch validation request
+
+
+
 class ValidateRequest(BaseModel):
     """
     /validate user request.
@@ -66,9 +72,13 @@ class ValidateResponse(BaseModel):
         :return: server response
         """
 
-        if request.stamp:
+        permissions = None
+
+        if request.stamp or request.check_public_key != public_key:
             permissions = Permissions.load(request.event_id, public_key)
+            # load requester permissions once for both checks below
 
+        if request.stamp:
             if not permissions.is_authorized("stamp_ticket"):
                 raise DomainException(ErrorKind.PERMISSION, "permission denied")
                 # confirm user is an authorized party
@@ -82,12 +92,24 @@ class ValidateResponse(BaseModel):
             redeemed, stamped = ticket.verify()
 
         if request.check_public_key != public_key:
-            permissions = Permissions.load(request.event_id, public_key)
-
             if not permissions.is_authorized("see_stamped_ticket"):
                 stamped = None
                 # remove stamped status for unauthorized requesters
 
+        return cls.from_ticket(ticket, redeemed, stamped)
+
+
+    @classmethod
+    def from_ticket(cls, ticket: Ticket, redeemed: bool, stamped: bool | None) -> Self:
+        """
+        Build the server response for a validated ticket.
+
+        :param ticket: validated ticket model
+        :param redeemed: ticket redemption status
+        :param stamped: ticket stamped status (None if hidden from the requester)
+        :return: server response
+        """
+
         return cls(
             ticket_number=ticket.number + 1, # 1-indexed ticket number
             redeemed=redeemed,
@@ -95,4 +117,176 @@ class ValidateResponse(BaseModel):
             version=ticket.version + 1, # 1-indexed version
             transfer_limit=ticket.transfer_limit,
             metadata=ticket.metadata
-        )
\ No newline at end of file
+        )
+
+
+
+class BatchValidateRequest(BaseModel):
+    """
+    /validate/batch user request.
+    """
+
+    tickets: list[ValidateRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=BATCH_LIMIT,
+        description="Tickets to validate and optionally stamp"
+    )
+
+
+
+class BatchValidateResult(BaseModel):
+    """
+    /validate/batch per-ticket result.
+    """
+
+    ticket: ValidateResponse | None = Field(
+        None,
+        description="Ticket validation result (omitted on failure)"
+    )
+    error: ErrorResponse | None = Field(
+        None,
+        description="Ticket validation error (omitted on success)"
+    )
+
+
+
+class BatchValidateResponse(BaseModel):
+    """
+    /validate/batch server response.
+    """
+
+    results: list[BatchValidateResult] = Field(
+        ...,
+        description="Per-ticket results (in request order)"
+    )
+
+
+    @staticmethod
+    def _failed(exception: DomainException) -> BatchValidateResult:
+        """
+        Build a failed per-ticket result.
+
+        :param exception: per-ticket domain error
+        :return: per-ticket result
+        """
+
+        return BatchValidateResult(error=ErrorResponse.generate(exception))
+
+
+    @classmethod
+    def _validate_event(
+        cls,
+        event_id: str,
+        items: dict[int, ValidateRequest],
+        public_key: str,
+        results: list[BatchValidateResult | None]
+    ) -> None:
+        """
+        Validate (and stamp) all requested tickets for a single event.
+
+        Permissions are checked once, tickets are decrypted with one event key, and
+        ticket state is read and stamped with one query each.
+
+        :param event_id: unique event identifier
+        :param items: requested tickets for the event by request index
+        :param public_key: user public key
+        :param results: per-ticket results to fill in (by request index)
+        """
+
+        try:
+            permissions = None
+
+            if any(
+                item.stamp or item.check_public_key != public_key
+                for item in items.values()
+            ):
+                permissions = Permissions.load(event_id, public_key)
+
+            event_key = Event.get_key(event_id)
+
+        except DomainException as e:
+            for index in items:
+                results[index] = cls._failed(e)
+
+            return
+
+        tickets = {}
+        numbers = set()
+
+        for index, item in items.items():
+            try:
+                if item.stamp and not permissions.is_authorized("stamp_ticket"):
+                    raise DomainException(ErrorKind.PERMISSION, "permission denied")
+                    # confirm user is an authorized party
+
+                ticket = Ticket.decrypt(
+                    event_id,
+                    item.check_public_key,
+                    item.ticket,
+                    event_key
+                )
+
+                if ticket.number in numbers:
+                    raise DomainException(ErrorKind.CONFLICT, "duplicate ticket in batch")
+
+            except DomainException as e:
+                results[index] = cls._failed(e)
+                continue
+
+            numbers.add(ticket.number)
+            tickets[index] = ticket
+
+        stamp_indices = [index for index in tickets if items[index].stamp]
+        check_indices = [index for index in tickets if not items[index].stamp]
+        statuses = {}
+
+        stamp_errors = Ticket.stamp_many([tickets[index] for index in stamp_indices])
+
+        for index, error in zip(stamp_indices, stamp_errors):
+            statuses[index] = (True, True) if error is None else error
+
+        check_statuses = Ticket.verify_many([tickets[index] for index in check_indices])
+
+        for index, status in zip(check_indices, check_statuses):
+            statuses[index] = status
+
+        for index, status in statuses.items():
+            if isinstance(status, DomainException):
+                results[index] = cls._failed(status)
+                continue
+
+            redeemed, stamped = status
+
+            if items[index].check_public_key != public_key:
+                if not permissions.is_authorized("see_stamped_ticket"):
+                    stamped = None
+                    # remove stamped status for unauthorized requesters
+
+            results[index] = BatchValidateResult(
+                ticket=ValidateResponse.from_ticket(tickets[index], redeemed, stamped)
+            )
+
+
+    @classmethod
+    def generate(cls, request: BatchValidateRequest, public_key: str) -> Self:
+        """
+        Generate the server response from a user request.
+
+        :param request: user request
+        :param public_key: user public key
+        :return: server response
+        """
+
+        events = {}
+
+        for index, item in enumerate(request.tickets):
+            events.setdefault(item.event_id, {})[index] = item
+            # group requested tickets by event
+
+        results = [None] * len(request.tickets)
+
+        for event_id, items in events.items():
+            cls._validate_event(event_id, items, public_key, results)
+
+        return cls(results=results)
\ No newline at end of file
@@ -6,12 +6,19 @@ Asymmetric cryptographic signature operations.
 
 
 
+from app.crypto import hash
+from app.crypto.canon import canonicalize
+from app.util import metrics
+from app.util.cache import LRUCache
+from config import SIGNATURE_ALGORITHM
+
+import abc
 import base64
-import json
 from cryptography.exceptions import InvalidSignature
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import padding, rsa
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, padding, rsa
+from typing import Literal
 
 
 
@@ -23,12 +30,37 @@ PUBLIC_EXPONENT = 2 ** 16 + 1
 # standard public exponent
 
 
+PUBLIC_KEY_CACHE_SIZE = 1024
+# maximum number of parsed public keys kept per process
+
+
+PUBLIC_KEY_CACHE = LRUCache(PUBLIC_KEY_CACHE_SIZE)
+metrics.register_cache("public_key", PUBLIC_KEY_CACHE)
+# parsed public key cache keyed by the SHA-256 digest of the key PEM
+# (only keys that have verified a signature are added, so unverified keys sent by
+# hostile callers cannot evict the working set)
+
+
+Algorithm = Literal["rsa", "ed25519", "ecdsa-p256"]
+# supported signature algorithm names
+
+
 
-class RSA:
+class Signer(abc.ABC):
     """
-    RSA cryptography signing object.
+    Base asymmetric cryptography signing object (each algorithm implements key
+    generation, signing, and verification).
     """
 
+    ALGORITHM: Algorithm
+    # signature algorithm name
+
+    KEY_TYPES: tuple[type, type]
+    # (private key type, public key type)
+
+    PRIVATE_FORMAT = serialization.PrivateFormat.PKCS8
+    # private key PEM serialization format
+
     private_key: str | None
     public_key: str
 
@@ -42,84 +74,83 @@ class RSA:
         :return: canonicalized JSON bytes
         """
 
-        return json.dumps(data, separators=(",", ":"), sort_keys=True).encode()
+        return canonicalize(data)
 
 
     def __init__(
         self,
-        key_size: int = KEY_SIZE,
         private_key: str | None = None,
-        public_key: str | None = None
+        public_key: str | None = None,
+        trusted: bool = False
     ) -> None:
         """
-        RSA signing / verification object.
+        Signing / verification object.
 
-        :param key_size: key size (in bits)
         :param private_key: private key PEM string (signer mode)
         :param public_key: public key PEM string (verifier mode or ignored if
             private_key provided)
+        :param trusted: skip private key consistency checks (only for keys read from
+            trusted local storage, such as the server key written by the setup utility)
         """
 
-        if key_size not in (1024, 2048, 4096):
-            raise Exception("RSA: invalid key length")
+        self._public_key_digest = None
+        # public key cache digest (verifier mode only)
 
         if private_key is None and public_key is None:
-            self._init_from_new_key(key_size)
+            self._init_from_key(self._generate_key())
             # signer mode: generate new signer key pair
 
         elif private_key is not None:
-            self._init_from_private_key(private_key)
+            self._init_from_key(
+                serialization.load_pem_private_key(
+                    private_key.encode("utf-8"),
+                    password=None,
+                    backend=default_backend(),
+                    unsafe_skip_rsa_key_validation=trusted
+                ),
+                private_key
+            )
             # signer mode: private key provided
+            # (RSA key validation takes about half a second for a 4096-bit key)
 
         else:
             self._init_from_public_key(public_key)
             # verifier-only mode: must have public key
 
 
-    def _init_from_new_key(self, key_size: int) -> None:
+    @abc.abstractmethod
+    def _generate_key(self):
         """
-        Generate a new private key and initialize signer fields.
+        Generate a new private key.
 
-        :param key_size: key size (in bits)
+        :return: new private key object
         """
 
-        private_key = rsa.generate_private_key(
-            public_exponent=PUBLIC_EXPONENT,
-            key_size=key_size,
-            backend=default_backend(),
-        )
-
-        private_key_bytes = private_key.private_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PrivateFormat.TraditionalOpenSSL,
-            encryption_algorithm=serialization.NoEncryption(),
-        )
 
-        self.private_key = private_key_bytes.decode("utf-8")
-        self._private_key = private_key
-
-        public_key_bytes = private_key.public_key().public_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PublicFormat.SubjectPublicKeyInfo,
-        )
-        self.public_key = public_key_bytes.decode("utf-8")
-
-
-    def _init_from_private_key(self, private_key: str) -> None:
+    def _init_from_key(self, private_key, private_key_pem: str | None = None) -> None:
         """
-        Initialize signer mode from an existing private key PEM.
+        Initialize signer fields from a private key object.
 
-        :param private_key: private key PEM string
+        :param private_key: private key object
+        :param private_key_pem: private key PEM string (serialized if not provided)
         """
 
-        self.private_key = private_key
-        self._private_key = serialization.load_pem_private_key(
-            private_key.encode("utf-8"),
-            password=None,
-            backend=default_backend(),
-        )
+        if not isinstance(private_key, self.KEY_TYPES[0]):
+            raise Exception(f"{self.ALGORITHM}: private key type mismatch")
+
+        self.private_key = private_key_pem
+        self._private_key = private_key
+        self._public_key = private_key.public_key()
+
+        if private_key_pem is None:
+            private_key_bytes = private_key.private_bytes(
+                encoding=serialization.Encoding.PEM,
+                format=self.PRIVATE_FORMAT,
+                encryption_algorithm=serialization.NoEncryption(),
+            )
+            self.private_key = private_key_bytes.decode("utf-8")
 
-        public_key_bytes = self._private_key.public_key().public_bytes(
+        public_key_bytes = self._public_key.public_bytes(
             encoding=serialization.Encoding.PEM,
             format=serialization.PublicFormat.SubjectPublicKeyInfo,
         )
@@ -135,10 +166,40 @@ class RSA:
 
         self.private_key = None
         self.public_key = public_key
-        self._public_key = serialization.load_pem_public_key(
-            public_key.encode("utf-8"),
-            backend=default_backend(),
-        )
+
+        digest = hash.generate_bytes(public_key)
+        self._public_key = PUBLIC_KEY_CACHE.get(digest)
+
+        if self._public_key is None:
+            self._public_key_digest = digest
+            self._public_key = serialization.load_pem_public_key(
+                public_key.encode("utf-8"),
+                backend=default_backend(),
+            )
+            # parse uncached public key (cached once it verifies a signature)
+
+        if not isinstance(self._public_key, self.KEY_TYPES[1]):
+            raise Exception(f"{self.ALGORITHM}: public key type mismatch")
+
+
+    @abc.abstractmethod
+    def _sign(self, message: bytes) -> bytes:
+        """
+        Sign raw message bytes.
+
+        :param message: message bytes
+        :return: raw signature bytes
+        """
+
+
+    @abc.abstractmethod
+    def _verify(self, signature: bytes, message: bytes) -> None:
+        """
+        Verify a raw signature (raising InvalidSignature if invalid).
+
+        :param signature: raw signature bytes
+        :param message: message bytes
+        """
 
 
     def sign(self, message: dict) -> str:
@@ -149,16 +210,7 @@ class RSA:
         :return: base64 digital signature string
         """
 
-        message = self._json_canon(message)
-        signature = self._private_key.sign(
-            message,
-            padding.PSS(
-                mgf=padding.MGF1(hashes.SHA256()),
-                salt_length=padding.PSS.MAX_LENGTH
-            ),
-            hashes.SHA256()
-        )
-        # sign the message using RSA and SHA-256
+        signature = self._sign(self._json_canon(message))
 
         return base64.b64encode(signature).decode("utf-8")
 
@@ -176,25 +228,227 @@ class RSA:
         signature = base64.b64decode(signature)
 
         try:
-            self._public_key.verify(
-                signature,
-                message,
-                padding.PSS(
-                    mgf=padding.MGF1(hashes.SHA256()),
-                    salt_length=padding.PSS.MAX_LENGTH
-                ),
-                hashes.SHA256()
-            )
+            self._verify(signature, message)
             # verify the signature
 
-            return True
-            # return true if valid
-
         except InvalidSignature:
             return False
-            # return true if invalid
+            # return false if invalid
+
+        if self._public_key_digest is not None:
+            PUBLIC_KEY_CACHE.put(self._public_key_digest, self._public_key)
+            self._public_key_digest = None
+            # cache newly verified public key
+
+        return True
+        # return true if valid
+
+
+
+class RSA(Signer):
+    """
+    RSA (PSS, SHA-256) cryptography signing object.
+    """
+
+    ALGORITHM = "rsa"
+    KEY_TYPES = (rsa.RSAPrivateKey, rsa.RSAPublicKey)
+    PRIVATE_FORMAT = serialization.PrivateFormat.TraditionalOpenSSL
+
+
+    def __init__(
+        self,
+        key_size: int = KEY_SIZE,
+        private_key: str | None = None,
+        public_key: str | None = None,
+        trusted: bool = False
+    ) -> None:
+        """
+        RSA signing / verification object.
+
+        :param key_size: key size (in bits)
+        :param private_key: private key PEM string (signer mode)
+        :param public_key: public key PEM string (verifier mode or ignored if
+            private_key provided)
+        :param trusted: skip private key consistency checks (trusted local keys only)
+        """
+
+        if key_size not in (1024, 2048, 4096):
+            raise Exception("RSA: invalid key length")
+
+        self.key_size = key_size
+        super().__init__(private_key, public_key, trusted)
+
+
+    def _generate_key(self) -> rsa.RSAPrivateKey:
+        """
+        Generate a new RSA private key.
+
+        :return: new private key object
+        """
+
+        return rsa.generate_private_key(
+            public_exponent=PUBLIC_EXPONENT,
+            key_size=self.key_size,
+            backend=default_backend(),
+        )
+
+
+    def _sign(self, message: bytes) -> bytes:
+        """
+        Sign raw message bytes using RSA and SHA-256.
+
+        :param message: message bytes
+        :return: raw signature bytes
+        """
+
+        return self._private_key.sign(
+            message,
+            padding.PSS(
+                mgf=padding.MGF1(hashes.SHA256()),
+                salt_length=padding.PSS.MAX_LENGTH
+            ),
+            hashes.SHA256()
+        )
+
+
+    def _verify(self, signature: bytes, message: bytes) -> None:
+        """
+        Verify a raw RSA signature.
+
+        :param signature: raw signature bytes
+        :param message: message bytes
+        """
+
+        self._public_key.verify(
+            signature,
+            message,
+            padding.PSS(
+                mgf=padding.MGF1(hashes.SHA256()),
+                salt_length=padding.PSS.MAX_LENGTH
+            ),
+            hashes.SHA256()
+        )
+
+
+
+class Ed25519(Signer):
+    """
+    Ed25519 cryptography signing object.
+    """
+
+    ALGORITHM = "ed25519"
+    KEY_TYPES = (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)
+
+
+    def _generate_key(self) -> ed25519.Ed25519PrivateKey:
+        """
+        Generate a new Ed25519 private key.
+
+        :return: new private key object
+        """
+
+        return ed25519.Ed25519PrivateKey.generate()
+
+
+    def _sign(self, message: bytes) -> bytes:
+        """
+        Sign raw message bytes using Ed25519.
+
+        :param message: message bytes
+        :return: raw signature bytes
+        """
+
+        return self._private_key.sign(message)
+
+
+    def _verify(self, signature: bytes, message: bytes) -> None:
+        """
+        Verify a raw Ed25519 signature.
+
+        :param signature: raw signature bytes
+        :param message: message bytes
+        """
+
+        self._public_key.verify(signature, message)
+
+
+
+class ECDSA(Signer):
+    """
+    ECDSA (P-256, SHA-256) cryptography signing object.
+    """
+
+    ALGORITHM = "ecdsa-p256"
+    KEY_TYPES = (ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey)
+
+
+    def _generate_key(self) -> ec.EllipticCurvePrivateKey:
+        """
+        Generate a new P-256 private key.
+
+        :return: new private key object
+        """
+
+        return ec.generate_private_key(ec.SECP256R1())
+
+
+    def _init_from_key(self, private_key, private_key_pem: str | None = None) -> None:
+        """
+        Initialize signer fields from a private key object.
+
+        :param private_key: private key object
+        :param private_key_pem: private key PEM string (serialized if not provided)
+        """
+
+        super()._init_from_key(private_key, private_key_pem)
+
+        if not isinstance(self._public_key.curve, ec.SECP256R1):
+            raise Exception("ECDSA: unsupported curve")
+
+
+    def _init_from_public_key(self, public_key: str) -> None:
+        """
+        Initialize verifier-only mode from a public key PEM.
+
+        :param public_key: public key PEM string
+        """
+
+        super()._init_from_public_key(public_key)
+
+        if not isinstance(self._public_key.curve, ec.SECP256R1):
+            raise Exception("ECDSA: unsupported curve")
+
+
+    def _sign(self, message: bytes) -> bytes:
+        """
+        Sign raw message bytes using ECDSA and SHA-256.
+
+        :param message: message bytes
+        :return: raw (DER) signature bytes
+        """
+
+        return self._private_key.sign(message, ec.ECDSA(hashes.SHA256()))
+
+
+    def _verify(self, signature: bytes, message: bytes) -> None:
+        """
+        Verify a raw ECDSA signature.
+
+        :param signature: raw (DER) signature bytes
+        :param message: message bytes
+        """
+
+        self._public_key.verify(signature, message, ec.ECDSA(hashes.SHA256()))
+
+
 
+ALGORITHMS: dict[str, type[Signer]] = {
+    RSA.ALGORITHM: RSA,
+    Ed25519.ALGORITHM: Ed25519,
+    ECDSA.ALGORITHM: ECDSA
+}
+# signing object classes by algorithm name
 
 
-AKC = RSA
+AKC = ALGORITHMS[SIGNATURE_ALGORITHM]
 # standard asymmetric key signature object (multi-use)
\ No newline at end of file
@@ -0,0 +1,60 @@
+"""
+Canonical JSON serialization for signing and verification.
+
+:author: Max Milazzo
+"""
+
+
+
+import json
+from json import encoder
+
+
+
+def _default(value: object) -> None:
+    """
+    Reject values with no JSON representation.
+
+    :param value: unserializable value
+    """
+
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+if encoder.c_make_encoder is not None:
+    _encode = encoder.c_make_encoder(
+        None, # no circular reference tracking (signed data is always a tree)
+        _default,
+        encoder.encode_basestring_ascii,
+        None, # no indentation
+        ":",
+        ",",
+        True, # sort keys
+        False, # do not skip non-string keys
+        True # allow NaN / Infinity
+    )
+    # reusable C encoder with the exact settings of the canonical form
+
+else:
+    _encode = json.JSONEncoder(
+        separators=(",", ":"),
+        sort_keys=True,
+        check_circular=False
+    ).iterencode
+    # pure Python fallback (identical output, second argument is unused "one shot" flag)
+
+
+
+def canonicalize(data: dict) -> bytes:
+    """
+    Generate canonicalized JSON bytes from dictionary.
+
+    The output is byte-identical to json.dumps(data, separators=(",", ":"),
+    sort_keys=True) (the original canonical form that existing clients sign), without
+    building a new encoder or tracking circular references on every call.
+
+    :param data: data to convert
+    :return: canonicalized JSON bytes
+    """
+
+    return "".join(_encode(data, 0)).encode()
\ No newline at end of file
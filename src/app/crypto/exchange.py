@@ -0,0 +1,123 @@
+"""
+Key agreement operations (X25519) for wrapping secret keys to a recipient.
+
+:author: Max Milazzo
+"""
+
+
+
+from app.crypto.symmetric import AEAD
+
+import base64
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import x25519
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+
+
+WRAP_INFO = b"zeta:key-wrap:"
+# HKDF info prefix for key wrapping keys (followed by the wrapping context)
+
+
+WRAP_KEY_SIZE = 32
+# derived key wrapping key size (in bytes)
+
+
+
+def _public_pem(public_key: x25519.X25519PublicKey) -> str:
+    """
+    Serialize an X25519 public key.
+
+    :param public_key: X25519 public key
+    :return: public key PEM string
+    """
+
+    return public_key.public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode("utf-8")
+
+
+def _derive(shared_secret: bytes, context: bytes) -> bytes:
+    """
+    Derive a key wrapping key from an X25519 shared secret.
+
+    :param shared_secret: X25519 shared secret
+    :param context: wrapping context (binds the wrapped key to its purpose)
+    :return: key wrapping key
+    """
+
+    return HKDF(
+        algorithm=hashes.SHA256(),
+        length=WRAP_KEY_SIZE,
+        salt=None,
+        info=WRAP_INFO + context
+    ).derive(shared_secret)
+
+
+def generate() -> tuple[str, str]:
+    """
+    Generate a new X25519 keypair (e.g. for a scanner requesting a wrapped key).
+
+    :return: private key PEM string, public key PEM string
+    """
+
+    private_key = x25519.X25519PrivateKey.generate()
+
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption()
+    ).decode("utf-8")
+
+    return private_pem, _public_pem(private_key.public_key())
+
+
+def wrap(key: bytes, recipient_public_key: str, context: bytes) -> tuple[str, str]:
+    """
+    Encrypt a secret key so that only the holder of an X25519 private key can recover
+    it (ephemeral-static X25519, HKDF-SHA-256, and AES-GCM).
+
+    :param key: secret key to wrap
+    :param recipient_public_key: recipient X25519 public key PEM string
+    :param context: wrapping context (also authenticated as associated data)
+    :return: ephemeral public key PEM string, wrapped key base64 string
+    """
+
+    recipient = serialization.load_pem_public_key(recipient_public_key.encode("utf-8"))
+
+    if not isinstance(recipient, x25519.X25519PublicKey):
+        raise ValueError("key exchange public key is not an X25519 key")
+
+    ephemeral = x25519.X25519PrivateKey.generate()
+    wrapping_key = _derive(ephemeral.exchange(recipient), context)
+    wrapped = AEAD(key=wrapping_key).encrypt_bytes(key, context)
+
+    return _public_pem(ephemeral.public_key()), base64.b64encode(wrapped).decode("utf-8")
+
+
+def unwrap(
+    wrapped: str,
+    ephemeral_public_key: str,
+    private_key: str,
+    context: bytes
+) -> bytes:
+    """
+    Recover a wrapped secret key.
+
+    :param wrapped: wrapped key base64 string
+    :param ephemeral_public_key: sender ephemeral public key PEM string
+    :param private_key: recipient X25519 private key PEM string
+    :param context: wrapping context used when the key was wrapped
+    :return: secret key
+    """
+
+    recipient = serialization.load_pem_private_key(
+        private_key.encode("utf-8"),
+        password=None
+    )
+    ephemeral = serialization.load_pem_public_key(ephemeral_public_key.encode("utf-8"))
+
+    wrapping_key = _derive(recipient.exchange(ephemeral), context)
+
+    return AEAD(key=wrapping_key).decrypt_bytes(base64.b64decode(wrapped), context)
\ No newline at end of file
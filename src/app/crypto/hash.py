@@ -8,6 +8,7 @@ Cryptographic hash operations.
 
 import base64
 import hashlib
+import hmac
 
 
 
@@ -34,4 +35,16 @@ def generate_string(input: str) -> str:
 
     digest = generate_bytes(input)
 
-    return base64.b64encode(digest).decode()
\ No newline at end of file
+    return base64.b64encode(digest).decode()
+
+
+def generate_hmac(key: bytes, input: bytes) -> bytes:
+    """
+    Authenticates a given byte sequence using HMAC-SHA-256 and returns the raw tag bytes.
+
+    :param key: secret HMAC key
+    :param input: input bytes
+    :return: HMAC-SHA-256 tag (raw bytes)
+    """
+
+    return hmac.new(key, input, hashlib.sha256).digest()
\ No newline at end of file
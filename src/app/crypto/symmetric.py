@@ -9,7 +9,7 @@ Symmetric cryptographic operations.
 import base64
 import secrets
 from cryptography.hazmat.primitives import padding
-from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers import Cipher, aead, algorithms, modes
 
 
 
@@ -25,6 +25,10 @@ BYTE_SIZE = 8
 # assumed byte size (in bits)
 
 
+NONCE_SIZE = 12
+# AEAD nonce size (in bytes)
+
+
 
 class AES:
     """
@@ -93,16 +97,14 @@ class AES:
         # initialize cipher
 
 
-    def encrypt(self, plaintext: str) -> str:
+    def encrypt_bytes(self, plaintext: bytes) -> bytes:
         """
-        Perform AES encryption.
+        Perform AES encryption on raw bytes.
 
-        :param plaintext: plaintext string to be encrypted
-        :return: encrypted base64 string
+        :param plaintext: plaintext bytes to be encrypted
+        :return: ciphertext bytes
         """
 
-        plaintext = plaintext.encode("utf-8")
-
         padder = padding.PKCS7(BLOCK_SIZE).padder()
         padded_plaintext = padder.update(plaintext) + padder.finalize()
         # add padding to plaintext
@@ -111,19 +113,17 @@ class AES:
         ciphertext = encryptor.update(padded_plaintext) + encryptor.finalize()
         # encrypt data
 
-        return base64.b64encode(ciphertext).decode("utf-8")
+        return ciphertext
 
 
-    def decrypt(self, ciphertext: str) -> str:
+    def decrypt_bytes(self, ciphertext: bytes) -> bytes:
         """
-        Perform AES decryption.
+        Perform AES decryption on raw bytes.
 
-        :param ciphertext: base64 ciphertext string to decrypt
-        :return: decrypted data string
+        :param ciphertext: ciphertext bytes to decrypt
+        :return: decrypted plaintext bytes
         """
 
-        ciphertext = base64.b64decode(ciphertext)
-
         unpadder = padding.PKCS7(BLOCK_SIZE).unpadder()
         # initialize "unnpadder" to remove padding from decrypted plaintext
 
@@ -134,9 +134,107 @@ class AES:
         )
         # decrypt data
 
+        return plaintext
+
+
+    def encrypt(self, plaintext: str) -> str:
+        """
+        Perform AES encryption.
+
+        :param plaintext: plaintext string to be encrypted
+        :return: encrypted base64 string
+        """
+
+        ciphertext = self.encrypt_bytes(plaintext.encode("utf-8"))
+
+        return base64.b64encode(ciphertext).decode("utf-8")
+
+
+    def decrypt(self, ciphertext: str) -> str:
+        """
+        Perform AES decryption.
+
+        :param ciphertext: base64 ciphertext string to decrypt
+        :return: decrypted data string
+        """
+
+        plaintext = self.decrypt_bytes(base64.b64decode(ciphertext))
+
         return plaintext.decode("utf-8")
 
 
 
+class AESGCM:
+    """
+    AES (GCM) authenticated encryption object.
+
+    Ciphertexts carry a 16-byte authentication tag over the ciphertext and optional
+    associated data, so tampered or forged data is rejected by decryption itself.
+    Every encryption draws a fresh random nonce, so one object may be reused.
+    """
+
+    key: bytes
+
+
+    def __init__(self, key_size: int = KEY_SIZE, key: bytes | None = None) -> None:
+        """
+        AES-GCM encryption object initialization.
+
+        :param key_size: key size (in bits)
+        :param key: encryption key to use (generated if not present)
+        """
+
+        if key_size != 128 and key_size != 192 and key_size != 256:
+            raise Exception("AES: invalid key length")
+            # raise exception if invalid key size is passed
+
+        if key is None:
+            self.key = AES.key(key_size)
+            # generate key if none passed
+
+        else:
+            self.key = key
+            # set passed key
+
+        self.cipher = aead.AESGCM(self.key)
+        # initialize cipher
+
+
+    def encrypt_bytes(
+        self,
+        plaintext: bytes,
+        associated_data: bytes | None = None
+    ) -> bytes:
+        """
+        Perform AES-GCM encryption on raw bytes.
+
+        :param plaintext: plaintext bytes to be encrypted
+        :param associated_data: data authenticated (but not encrypted) with the plaintext
+        :return: nonce followed by the ciphertext and authentication tag
+        """
+
+        nonce = secrets.token_bytes(NONCE_SIZE)
+
+        return nonce + self.cipher.encrypt(nonce, plaintext, associated_data)
+
+
+    def decrypt_bytes(self, data: bytes, associated_data: bytes | None = None) -> bytes:
+        """
+        Perform AES-GCM decryption on raw bytes (raises an exception if the data or
+        associated data was altered).
+
+        :param data: nonce followed by the ciphertext and authentication tag
+        :param associated_data: data authenticated with the plaintext on encryption
+        :return: decrypted plaintext bytes
+        """
+
+        return self.cipher.decrypt(data[:NONCE_SIZE], data[NONCE_SIZE:], associated_data)
+
+
+
 SKC = AES
-# standard symmetric key encryption object (single-use)
\ No newline at end of file
+# standard symmetric key encryption object (single-use)
+
+
+AEAD = AESGCM
+# standard authenticated symmetric key encryption object (multi-use)
\ No newline at end of file
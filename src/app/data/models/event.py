@@ -10,6 +10,11 @@ from app.crypto import hash
 from app.crypto.symmetric import SKC
 from app.data.storage import event_store
 from app.error.errors import DomainException, ErrorKind
+from app.util import broadcast, metrics
+from app.util.cache import LRUCache
+from config import (
+    EVENT_CACHE_SIZE, EVENT_CACHE_TTL, EVENT_KEY_CACHE_SIZE, EVENT_KEY_CACHE_TTL
+)
 
 import time
 import uuid
@@ -27,6 +32,19 @@ TRANSFER_LIMIT = (1 << 6) - 1
 # (transfer version data stored in low 6 bits)
 
 
+KEY_CACHE = LRUCache(EVENT_KEY_CACHE_SIZE, EVENT_KEY_CACHE_TTL)
+broadcast.subscribe(KEY_CACHE.invalidate)
+metrics.register_cache("event_key", KEY_CACHE)
+# event ticket key cache (invalidated when an event is deleted or purged)
+
+
+EVENT_CACHE = LRUCache(EVENT_CACHE_SIZE, EVENT_CACHE_TTL)
+broadcast.subscribe(EVENT_CACHE.invalidate)
+metrics.register_cache("event", EVENT_CACHE)
+# public event model cache (invalidated when an event is deleted or purged, or when
+# this process issues its tickets)
+
+
 
 class Event(BaseModel):
     """
@@ -76,11 +94,19 @@ class Event(BaseModel):
         :return: event key
         """
 
+        key = KEY_CACHE.get(event_id)
+
+        if key is not None:
+            return key
+            # event keys never change for the lifetime of an event
+
         key = event_store.load_event_key(event_id)
 
         if key is None:
             raise DomainException(ErrorKind.NOT_FOUND, "event not found")
         
+        KEY_CACHE.put(event_id, key)
+
         return key
     
 
@@ -95,37 +121,91 @@ class Event(BaseModel):
         if not event_store.delete(event_id):
             raise DomainException(ErrorKind.NOT_FOUND, "event not found")
 
+        broadcast.publish(event_id)
+        # invalidate cached event data
+
 
     @classmethod
     def load(cls, event_id: str) -> Self:
         """
-        Load an event.
+        Load an event (through the event cache).
+
+        Cached models are shared between requests and must not be modified.
 
         :param event_id: unique event identifier
         :return: event model
         """
+
+        event = EVENT_CACHE.get(event_id)
+
+        if event is not None:
+            return event
+            # cache hit: no query and no model construction
         
-        event = event_store.load_event(event_id)
+        row = event_store.load_event(event_id)
 
-        if event is None:
+        if row is None:
             raise DomainException(ErrorKind.NOT_FOUND, "event not found")
 
-        return cls(**event)
+        event = cls(**row)
+        EVENT_CACHE.put(event_id, event)
+
+        return event
+
+
+    @staticmethod
+    def issued_changed(event_id: str) -> None:
+        """
+        Drop this process's cached copy of an event after issuing its tickets (other
+        processes pick up the new issued count when their entry expires).
+
+        :param event_id: unique event identifier
+        """
+
+        EVENT_CACHE.invalidate(event_id)
 
 
     @classmethod
-    def search(cls, text: str, limit: int) -> list[Self]:
+    def search(
+        cls,
+        text: str,
+        limit: int,
+        ranked: bool = False,
+        after: tuple[float | None, str] | None = None
+    ) -> tuple[list[Self], tuple[float | None, str] | None]:
         """
         Search for an event.
 
-        :param text: text search pattern
+        :param text: text search pattern (or full-text query if ranked)
         :param limit: query fetch limit
-        :return: list of matching events
+        :param ranked: if True, run a full-text search over names and descriptions
+            ordered by relevance instead of a name substring match
+        :param after: (rank, event ID) position of the last event on the previous page
+            (rank is None for name searches)
+        :return: list of matching events, (rank, event ID) position of the last event if
+            more results follow (otherwise None)
         """
 
-        rows = event_store.search(text, limit)
-        
-        return [cls(**row) for row in rows]
+        if ranked:
+            rows = event_store.search_ranked(text, limit + 1, after)
+
+        else:
+            rows = event_store.search(
+                text,
+                limit + 1,
+                None if after is None else after[1]
+            )
+
+        ranks = [row.pop("rank", None) for row in rows]
+        # fetch one extra row to detect whether another page follows
+
+        if len(rows) <= limit:
+            return [cls(**row) for row in rows], None
+
+        return (
+            [cls(**row) for row in rows[:limit]],
+            (ranks[limit - 1], rows[limit - 1]["id"])
+        )
 
 
     def create(self, owner_public_key: str) -> None:
@@ -139,4 +219,7 @@ class Event(BaseModel):
             self.model_dump(),
             SKC.key(),
             hash.generate_bytes(owner_public_key)
-        )
\ No newline at end of file
+        )
+
+        broadcast.publish(self.id)
+        # invalidate any cached data left over from a deleted event with the same ID
\ No newline at end of file
@@ -9,12 +9,30 @@ Permissions data model.
 from app.crypto import hash
 from app.data.storage import permissions_store
 from app.error.errors import DomainException, ErrorKind
+from app.util import broadcast, metrics
+from app.util.cache import LRUCache
+from config import PERMISSIONS_CACHE_SIZE, PERMISSIONS_CACHE_TTL
 
 from pydantic import BaseModel, Field
 from typing import Self
 
 
 
+CACHE = (
+    LRUCache(PERMISSIONS_CACHE_SIZE, PERMISSIONS_CACHE_TTL)
+    if PERMISSIONS_CACHE_TTL is not None else None
+)
+metrics.register_cache("permissions", CACHE)
+# (event ID, public key hash) access cache (None if disabled)
+
+if CACHE is not None:
+    broadcast.subscribe(
+        lambda event_id: CACHE.invalidate_where(lambda key: key[0] == event_id)
+    )
+    # drop cached access for an event whose permissions changed or that was deleted
+
+
+
 class Permissions(BaseModel):
     """
     Endpoint event permission options.
@@ -46,6 +64,38 @@ class Permissions(BaseModel):
     )
 
 
+    @staticmethod
+    def _load_access(event_id: str, public_key_hash: bytes) -> dict:
+        """
+        Load the event owner's public key hash and the stored permissions of a public
+        key (through the access cache).
+
+        :param event_id: unique event identifier
+        :param public_key_hash: SHA-256 hash of the PEM-encoded public key
+        :return: access dictionary (see permissions_store.load_access)
+        """
+
+        if CACHE is None:
+            access = None
+
+        else:
+            generation = CACHE.generation
+            access = CACHE.get((event_id, public_key_hash))
+            # read the generation first so that an update invalidating the cache while
+            # access is loaded keeps the (possibly stale) result out of the cache
+
+        if access is None:
+            access = permissions_store.load_access(event_id, public_key_hash)
+
+            if access is None:
+                raise DomainException(ErrorKind.NOT_FOUND, "event not found")
+
+            if CACHE is not None:
+                CACHE.put((event_id, public_key_hash), access, generation)
+
+        return access
+
+
     @staticmethod
     def is_owner(event_id: str, check_public_key: str) -> bool:
         """
@@ -56,12 +106,10 @@ class Permissions(BaseModel):
         :return: event ownership status of checked public key
         """
 
-        public_key_hash = permissions_store.load_owner_public_key_hash(event_id)
+        public_key_hash = hash.generate_bytes(check_public_key)
+        access = Permissions._load_access(event_id, public_key_hash)
 
-        if public_key_hash is None:
-            raise DomainException(ErrorKind.NOT_FOUND, "event not found")
-        
-        return hash.generate_bytes(check_public_key) == public_key_hash
+        return access["owner_public_key_hash"] == public_key_hash
 
 
     @classmethod
@@ -74,7 +122,10 @@ class Permissions(BaseModel):
         :return: event permissions
         """
 
-        if Permissions.is_owner(event_id, target_public_key):
+        public_key_hash = hash.generate_bytes(target_public_key)
+        access = Permissions._load_access(event_id, public_key_hash)
+
+        if access["owner_public_key_hash"] == public_key_hash:
             return cls(
                 cancel_ticket=True,
                 see_ticket_flag=True,
@@ -84,14 +135,12 @@ class Permissions(BaseModel):
                 stamp_ticket=True
             )
             # enable all permissions
-        
-        permissions = permissions_store.load_permissions(event_id, target_public_key)
 
-        if permissions is None:
+        if access["permissions"] is None:
             return cls()
             # disable all permissions
 
-        return cls(**permissions)
+        return cls(**access["permissions"])
 
 
     def is_authorized(self, permission: str) -> bool:
@@ -118,10 +167,13 @@ class Permissions(BaseModel):
 
         if all(not getattr(self, name) for name in Permissions.model_fields):
             permissions_store.remove_permissions(event_id, target_public_key)
-            return
 
-        permissions_store.update_permissions(
-            event_id,
-            target_public_key,
-            self.model_dump()
-        )
\ No newline at end of file
+        else:
+            permissions_store.update_permissions(
+                event_id,
+                target_public_key,
+                self.model_dump()
+            )
+
+        broadcast.publish(event_id)
+        # invalidate cached access for the event in every process
\ No newline at end of file
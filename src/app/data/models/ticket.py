@@ -8,12 +8,19 @@ Ticket data model.
 
 from .event import Event, TRANSFER_LIMIT
 from app.crypto import hash
-from app.crypto.symmetric import SKC
+from app.crypto.symmetric import AEAD, BLOCK_SIZE, BYTE_SIZE, SKC
 from app.data.storage import ticket_store
 from app.error.errors import DomainException, ErrorKind
+from app.util import executor
+from config import TICKET_FORMAT
 
 import base64
+import hashlib
+import hmac
 import json
+import struct
+import uuid
+import zlib
 from pydantic import BaseModel
 from typing import Any, Self
 
@@ -36,6 +43,66 @@ FLAG_PUBLIC_TOGGLE_BYTE = 1 << 7
 # (0b00000000 => private, 0b10000000 => public)
 
 
+PACK_CHUNK_SIZE = 256
+# number of tickets packed per worker process task
+# (smaller batches are packed in-process)
+
+
+V2_PREFIX = "2."
+V3_PREFIX = "3."
+V4_PREFIX = "4."
+# format 2 (binary, AES-CBC), format 3 (binary, AES-GCM), and format 4 (binary, AES-GCM
+# under the event read key, sealed with the event key) ticket string prefixes
+# (format 1 ticket strings are standard base64 and never contain a ".")
+
+
+READ_KEY_INFO = b"zeta:ticket-read:"
+# format 4 event read key derivation prefix (followed by the event ID)
+
+
+SEAL_INFO = b"zeta:ticket-seal:"
+# format 4 seal prefix (followed by the encrypted ticket body)
+
+
+SEAL_SIZE = 16
+# format 4 truncated HMAC-SHA-256 seal size (in bytes)
+
+
+BINARY_HEADER = struct.Struct(">IBBB")
+# binary format fixed header: ticket number, version, transfer limit, metadata flags
+
+
+EVENT_TAG_SIZE = 16
+# format 2 event identifier size (in bytes): the event UUID itself, or a truncated
+# SHA-256 hash of event IDs that are not canonical UUID strings
+# (format 3 tickets authenticate the event ID as associated data instead)
+
+
+KEY_HASH_SIZE = 16
+# binary format truncated public key hash size (in bytes)
+
+
+DIGEST_SIZE = 16
+# format 2 truncated integrity hash size (in bytes)
+
+
+IV_SIZE = BLOCK_SIZE // BYTE_SIZE
+# ticket encryption IV size (in bytes)
+
+
+METADATA_PRESENT = 1
+METADATA_COMPRESSED = 2
+# binary format metadata flags
+
+
+METADATA_COMPRESSION_MIN = 48
+# minimum serialized metadata size (in bytes) worth trying to compress
+
+
+METADATA_ENCODER = json.JSONEncoder(separators=(",", ":"))
+# compact binary format metadata serializer (reused across calls)
+
+
 
 class Ticket(BaseModel):
     """
@@ -134,17 +201,14 @@ class Ticket(BaseModel):
 
 
     @staticmethod
-    def _validate(event_id: str, number: int, version: int) -> None:
+    def _check_state(byte: int | None, version: int) -> None:
         """
-        Validate that the requester's ticket.
+        Check that a ticket state byte is valid for the requester's ticket.
 
-        :param event_id: unique event identifier
-        :param number: ticket issue number
+        :param byte: ticket state data byte (None if not found)
         :param version: requester's ticket version
         """
 
-        byte = ticket_store.load_state_byte(event_id, number)
-
         if byte is None:
             raise DomainException(ErrorKind.NOT_FOUND, "event not found")
         
@@ -159,6 +223,38 @@ class Ticket(BaseModel):
             # (a ticket version is valid if the low 6 bits match the expected version)
 
 
+    @staticmethod
+    def _transition(
+        event_id: str,
+        number: int,
+        version: int,
+        expected: int,
+        data: int
+    ) -> int | None:
+        """
+        Replace a ticket's state byte if it currently equals an expected value,
+        validating the requester's ticket against the prior byte in the same statement.
+
+        :param event_id: unique event identifier
+        :param number: ticket issue number
+        :param version: requester's ticket version
+        :param expected: required current state data byte
+        :param data: new state data byte
+        :return: None if the transition was applied, otherwise the (valid) prior state
+            data byte that prevented it
+        """
+
+        result = ticket_store.transition_state(event_id, number, expected, data)
+        prior = result[0] if result else None
+
+        if prior == expected:
+            return None
+
+        Ticket._check_state(prior, version)
+
+        return prior
+
+
     @classmethod
     def register(
         cls,
@@ -181,6 +277,8 @@ class Ticket(BaseModel):
         if number is None:
             raise DomainException(ErrorKind.CONFLICT, "unable to issue ticket")
 
+        Event.issued_changed(event_id)
+
         return cls(
             event_id=event_id,
             public_key=public_key,
@@ -192,6 +290,47 @@ class Ticket(BaseModel):
         )
 
 
+    @classmethod
+    def register_many(
+        cls,
+        event_id: str,
+        public_keys: list[str],
+        transfer_limit: int,
+        metadata: Any
+    ) -> list[Self]:
+        """
+        Register several users for an event using one contiguous range of ticket numbers.
+
+        :param event_id: unique event identifier
+        :param public_keys: ticket holders' public keys
+        :param transfer_limit: ticket transfer limit
+        :param metadata: optional metadata to embed in every ticket
+        :return: ticket models (in public key order)
+        """
+
+        first = ticket_store.issue(event_id, len(public_keys))
+
+        if first is None:
+            raise DomainException(ErrorKind.CONFLICT, "unable to issue tickets")
+
+        Event.issued_changed(event_id)
+
+        event_key = Event.get_key(event_id)
+
+        return [
+            cls(
+                event_id=event_id,
+                public_key=public_key,
+                number=first + offset,
+                version=0,
+                transfer_limit=transfer_limit,
+                metadata=metadata,
+                event_key=event_key
+            )
+            for offset, public_key in enumerate(public_keys)
+        ]
+
+
     @classmethod
     def reissue(
         cls,
@@ -214,12 +353,19 @@ class Ticket(BaseModel):
         """
 
         if version == transfer_limit:
+            Ticket._check_state(ticket_store.load_state_byte(event_id, number), version)
+            # report a missing, canceled, or superseded ticket ahead of the limit (as
+            # the transition below would)
+
             raise DomainException(ErrorKind.CONFLICT, "ticket transfer limit reached")
             # tickets with version 0b00111111 can no longer be transferred
             # (version data is maxed out)
-        
-        if not ticket_store.reissue(event_id, number, version):
+
+        prior = Ticket._transition(event_id, number, version, version, version + 1)
+
+        if prior is not None:
             raise DomainException(ErrorKind.CONFLICT, "ticket transfer failed")
+            # only unredeemed tickets at the requester's version can be transferred
 
         return cls(
             event_id=event_id,
@@ -232,33 +378,328 @@ class Ticket(BaseModel):
         )
 
 
+    @staticmethod
+    def _event_tag(event_id: str) -> bytes:
+        """
+        Get the fixed-size event identifier stored in format 2 tickets.
+
+        :param event_id: unique event identifier
+        :return: event UUID bytes (or truncated hash of a non-UUID event ID)
+        """
+
+        try:
+            event_uuid = uuid.UUID(event_id)
+
+            if str(event_uuid) == event_id:
+                return event_uuid.bytes
+
+        except ValueError:
+            pass
+
+        return hash.generate_bytes(event_id)[:EVENT_TAG_SIZE]
+
+
+    @staticmethod
+    def _decode_v1(ticket: str, event_key: bytes) -> dict:
+        """
+        Decrypt and verify a format 1 (JSON) ticket string.
+
+        :param ticket: encrypted ticket string
+        :param event_key: event ticket encryption key
+        :return: ticket data ("event_id" and "public_key_hash" as strings)
+        """
+
+        b64_iv, ticket = ticket.split("-")
+        cipher = SKC(key=event_key, iv=base64.b64decode(b64_iv))
+
+        decrypted_ticket_raw = cipher.decrypt(ticket)
+        decrypted_ticket = json.loads(decrypted_ticket_raw)
+        ticket_data = decrypted_ticket["ticket"]
+        ticket_string_raw = json.dumps(ticket_data)
+
+        if hash.generate_string(ticket_string_raw) != decrypted_ticket["hash"]:
+            raise DomainException(ErrorKind.PERMISSION, "ticket verification failed")
+            # check that the decrypted ticket's stored hash value is correct
+            # (error message purposefully kept vague for security)
+
+        return ticket_data
+
+
+    @staticmethod
+    def _b64encode(raw: bytes) -> str:
+        """
+        Encode binary ticket data as unpadded URL-safe base64 (tickets are often
+        embedded in links and QR codes).
+
+        :param raw: binary ticket data
+        :return: encoded ticket data
+        """
+
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+    @staticmethod
+    def _b64decode(encoded: str) -> bytes:
+        """
+        Decode unpadded URL-safe base64 ticket data.
+
+        :param encoded: encoded ticket data
+        :return: binary ticket data
+        """
+
+        return base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+
+
+    @staticmethod
+    def _decode_binary(body: bytes, event_tag_size: int) -> dict:
+        """
+        Parse a verified binary ticket body.
+
+        :param body: decrypted and verified ticket body
+        :param event_tag_size: size of the stored event identifier (0 if not stored)
+        :return: ticket data ("event_id" and "public_key_hash" as fixed-size bytes)
+        """
+
+        number, version, transfer_limit, flags = BINARY_HEADER.unpack_from(body)
+        offset = BINARY_HEADER.size
+
+        event_tag = body[offset:offset + event_tag_size]
+        offset += event_tag_size
+
+        public_key_hash = body[offset:offset + KEY_HASH_SIZE]
+        offset += KEY_HASH_SIZE
+
+        metadata = None
+
+        if flags & METADATA_PRESENT:
+            metadata_raw = body[offset:]
+
+            if flags & METADATA_COMPRESSED:
+                metadata_raw = zlib.decompress(metadata_raw, -zlib.MAX_WBITS)
+
+            metadata = json.loads(metadata_raw)
+
+        return {
+            "event_id": event_tag,
+            "public_key_hash": public_key_hash,
+            "number": number,
+            "version": version,
+            "transfer_limit": transfer_limit,
+            "metadata": metadata
+        }
+
+
+    @staticmethod
+    def _decode_v2(ticket: str, event_key: bytes) -> dict:
+        """
+        Decrypt and verify a format 2 (binary, AES-CBC) ticket string.
+
+        :param ticket: encrypted ticket string
+        :param event_key: event ticket encryption key
+        :return: ticket data ("event_id" and "public_key_hash" as fixed-size bytes)
+        """
+
+        raw = Ticket._b64decode(ticket[len(V2_PREFIX):])
+
+        cipher = SKC(key=event_key, iv=raw[:IV_SIZE])
+        plaintext = cipher.decrypt_bytes(raw[IV_SIZE:])
+        body, digest = plaintext[:-DIGEST_SIZE], plaintext[-DIGEST_SIZE:]
+
+        if not hmac.compare_digest(hashlib.sha256(body).digest()[:DIGEST_SIZE], digest):
+            raise DomainException(ErrorKind.PERMISSION, "ticket verification failed")
+            # check that the decrypted ticket's stored hash value is correct
+            # (error message purposefully kept vague for security)
+
+        return Ticket._decode_binary(body, EVENT_TAG_SIZE)
+
+
+    @staticmethod
+    def _decode_v3(ticket: str, event_id: str, event_key: bytes) -> dict:
+        """
+        Decrypt and verify a format 3 (binary, AES-GCM) ticket string.
+
+        Forged or altered tickets, and tickets for another event, fail authentication
+        during decryption, before any of their content is parsed.
+
+        :param ticket: encrypted ticket string
+        :param event_id: unique event identifier (authenticated as associated data)
+        :param event_key: event ticket encryption key
+        :return: ticket data ("event_id" empty and "public_key_hash" as fixed-size bytes)
+        """
+
+        body = AEAD(key=event_key).decrypt_bytes(
+            Ticket._b64decode(ticket[len(V3_PREFIX):]),
+            event_id.encode("utf-8")
+        )
+
+        return Ticket._decode_binary(body, 0)
+
+
+    @staticmethod
+    def read_key(event_id: str, event_key: bytes) -> bytes:
+        """
+        Derive the read key of an event.
+
+        The read key decrypts format 4 tickets (e.g. on an offline scanner) but cannot
+        produce tickets the server accepts, as every format 4 ticket is also sealed
+        with the event key itself.
+
+        :param event_id: unique event identifier
+        :param event_key: event ticket encryption key
+        :return: event read key
+        """
+
+        return hash.generate_hmac(event_key, READ_KEY_INFO + event_id.encode("utf-8"))
+
+
+    @staticmethod
+    def _seal(data: bytes, event_key: bytes) -> bytes:
+        """
+        Compute the seal of a format 4 encrypted ticket body.
+
+        :param data: encrypted ticket body (nonce, ciphertext, and authentication tag)
+        :param event_key: event ticket encryption key
+        :return: truncated HMAC-SHA-256 seal
+        """
+
+        return hash.generate_hmac(event_key, SEAL_INFO + data)[:SEAL_SIZE]
+
+
+    @staticmethod
+    def _open_v4(raw: bytes, event_id: str, read_key: bytes) -> dict:
+        """
+        Decrypt a format 4 (binary, AES-GCM under the event read key) ticket without
+        checking its seal.
+
+        :param raw: decoded ticket bytes (encrypted ticket body followed by its seal)
+        :param event_id: unique event identifier (authenticated as associated data)
+        :param read_key: event read key
+        :return: ticket data ("event_id" empty and "public_key_hash" as fixed-size bytes)
+        """
+
+        body = AEAD(key=read_key).decrypt_bytes(
+            raw[:-SEAL_SIZE],
+            event_id.encode("utf-8")
+        )
+
+        return Ticket._decode_binary(body, 0)
+
+
+    @staticmethod
+    def _decode_v4(ticket: str, event_id: str, event_key: bytes) -> dict:
+        """
+        Verify and decrypt a format 4 (binary, AES-GCM under the event read key, sealed
+        with the event key) ticket string.
+
+        Tickets encrypted by a read key holder (rather than the server) carry no valid
+        seal and are rejected before decryption.
+
+        :param ticket: encrypted ticket string
+        :param event_id: unique event identifier (authenticated as associated data)
+        :param event_key: event ticket encryption key
+        :return: ticket data ("event_id" empty and "public_key_hash" as fixed-size bytes)
+        """
+
+        raw = Ticket._b64decode(ticket[len(V4_PREFIX):])
+
+        if not hmac.compare_digest(
+            raw[-SEAL_SIZE:],
+            Ticket._seal(raw[:-SEAL_SIZE], event_key)
+        ):
+            raise DomainException(ErrorKind.PERMISSION, "ticket verification failed")
+
+        return Ticket._open_v4(raw, event_id, Ticket.read_key(event_id, event_key))
+
+
+    @staticmethod
+    def scan(event_id: str, public_key: str, ticket: str, read_key: bytes) -> dict:
+        """
+        Decrypt and check a format 4 ticket string with an event read key (e.g. on an
+        offline scanner working from an event snapshot).
+
+        The ticket seal cannot be checked without the event key, so a read key holder
+        could produce tickets that pass this check: buffered stamps are verified again
+        in full when uploaded.
+
+        :param event_id: unique event identifier
+        :param public_key: ticket holder's public key
+        :param ticket: encrypted ticket string
+        :param read_key: event read key
+        :return: ticket data ("number", "version", "transfer_limit", and "metadata")
+        """
+
+        if not ticket.startswith(V4_PREFIX):
+            raise DomainException(
+                ErrorKind.VALIDATION,
+                "ticket format cannot be checked offline"
+            )
+
+        try:
+            ticket_data = Ticket._open_v4(
+                Ticket._b64decode(ticket[len(V4_PREFIX):]),
+                event_id,
+                read_key
+            )
+
+        except DomainException:
+            raise
+
+        except Exception:
+            raise DomainException(ErrorKind.PERMISSION, "ticket verification failed")
+
+        public_key_hash = hash.generate_bytes(public_key)[:KEY_HASH_SIZE]
+
+        if ticket_data["public_key_hash"] != public_key_hash:
+            raise DomainException(ErrorKind.VALIDATION, "ticket for different user")
+
+        return {
+            key: ticket_data[key]
+            for key in ("number", "version", "transfer_limit", "metadata")
+        }
+
+
     @classmethod
-    def load(cls, event_id: str, public_key: str, ticket: str) -> Self:
+    def decrypt(
+        cls,
+        event_id: str,
+        public_key: str,
+        ticket: str,
+        event_key: bytes
+    ) -> Self:
         """
-        Decrypt and load a requester's encrypted ticket string as a ticket data model.
+        Decrypt a requester's encrypted ticket string without checking its stored state.
 
         :param event_id: unique event identifier
         :param public_key: requester's public key
         :param ticket: requester's encrypted ticket string
+        :param event_key: event ticket encryption key
         :return: ticket model
         """
 
         try:
-            event_key = Event.get_key(event_id)
+            if ticket.startswith(V4_PREFIX):
+                ticket_data = cls._decode_v4(ticket, event_id, event_key)
+                public_key_hash = hash.generate_bytes(public_key)[:KEY_HASH_SIZE]
+                event_tag = b""
+                # event ID is bound as associated data (as in format 3)
+
+            elif ticket.startswith(V3_PREFIX):
+                ticket_data = cls._decode_v3(ticket, event_id, event_key)
+                public_key_hash = hash.generate_bytes(public_key)[:KEY_HASH_SIZE]
+                event_tag = b""
+                # no event identifier is stored: the event ID is bound as associated
+                # data instead (checked by decryption)
+
+            elif ticket.startswith(V2_PREFIX):
+                ticket_data = cls._decode_v2(ticket, event_key)
+                public_key_hash = hash.generate_bytes(public_key)[:KEY_HASH_SIZE]
+                event_tag = cls._event_tag(event_id)
+
+            else:
+                ticket_data = cls._decode_v1(ticket, event_key)
+                public_key_hash = hash.generate_string(public_key)
+                event_tag = event_id
 
-            b64_iv, ticket = ticket.split("-")
-            cipher = SKC(key=event_key, iv=base64.b64decode(b64_iv))
-        
-            decrypted_ticket_raw = cipher.decrypt(ticket)
-            decrypted_ticket = json.loads(decrypted_ticket_raw)
-            ticket_data = decrypted_ticket["ticket"]
-            ticket_string_raw = json.dumps(ticket_data)
-            
-            if hash.generate_string(ticket_string_raw) != decrypted_ticket["hash"]:
-                raise DomainException(ErrorKind.PERMISSION, "ticket verification failed")
-                # check that the decrypted ticket's stored hash value is correct
-                # (error message purposefully kept vague for security)
-        
         except DomainException:
             raise
 
@@ -267,21 +708,15 @@ class Ticket(BaseModel):
             # handle general decryption failure
             # (error message purposefully kept vague for security)
 
-        if ticket_data["public_key_hash"] != hash.generate_string(public_key):
+        if ticket_data["public_key_hash"] != public_key_hash:
             raise DomainException(ErrorKind.VALIDATION, "ticket for different user")
             # ensure ticket public key matches key of client making request
 
-        if ticket_data["event_id"] != event_id:
+        if ticket_data["event_id"] != event_tag:
             raise DomainException(ErrorKind.VALIDATION, "ticket for different event")
             # ensure ticket event ID matches the event ID passed by client
             # (this error should not trigger unless the original server ticket issuance
             # response was tampered with or compromised)
-
-        cls._validate(
-            event_id,
-            ticket_data["number"],
-            ticket_data["version"]
-        )
         
         return cls(
             event_id=event_id,
@@ -294,34 +729,155 @@ class Ticket(BaseModel):
         )
 
 
+    @classmethod
+    def load(cls, event_id: str, public_key: str, ticket: str) -> Self:
+        """
+        Decrypt and load a requester's encrypted ticket string as a ticket data model.
+
+        The stored ticket state is not read here: it is validated by the state operation
+        performed on the ticket (verify, redeem, stamp, or reissue) in the same query.
+
+        :param event_id: unique event identifier
+        :param public_key: requester's public key
+        :param ticket: requester's encrypted ticket string
+        :return: ticket model
+        """
+
+        return cls.decrypt(event_id, public_key, ticket, Event.get_key(event_id))
+
+
+    @classmethod
+    def verify_many(
+        cls,
+        tickets: list[Self]
+    ) -> list[tuple[bool, bool] | DomainException]:
+        """
+        Validate several decrypted tickets for one event and verify their redemption and
+        stamped status using a single state query.
+
+        :param tickets: decrypted ticket models (all for the same event)
+        :return: per-ticket redemption status, stamped status or validation error
+        """
+
+        if not tickets:
+            return []
+
+        state = ticket_store.load_state_bytes(
+            tickets[0].event_id,
+            [ticket.number for ticket in tickets]
+        )
+        results = []
+
+        for ticket in tickets:
+            byte = state.get(ticket.number)
+
+            try:
+                cls._check_state(byte, ticket.version)
+
+            except DomainException as e:
+                results.append(e)
+                continue
+
+            results.append((byte >= REDEEMED_BYTE, byte >= STAMPED_BYTE))
+
+        return results
+
+
+    @classmethod
+    def stamp_many(cls, tickets: list[Self]) -> list[DomainException | None]:
+        """
+        Stamp several decrypted tickets for one event using a single state update
+        (applied in ticket number order, whatever the order of the tickets).
+
+        :param tickets: decrypted ticket models (all for the same event, unique numbers)
+        :return: per-ticket stamping error or None if stamped
+        """
+
+        if not tickets:
+            return []
+
+        prior = ticket_store.stamp_many(
+            tickets[0].event_id,
+            sorted((ticket.number, ticket.version) for ticket in tickets),
+            REDEEMED_BYTE,
+            STAMPED_BYTE
+        )
+        results = []
+
+        for ticket in tickets:
+            byte = prior.get(ticket.number)
+
+            try:
+                cls._check_state(byte, ticket.version)
+
+                if byte < REDEEMED_BYTE:
+                    raise DomainException(
+                        ErrorKind.CONFLICT,
+                        "ticket has not been redeemed"
+                    )
+
+                if byte >= STAMPED_BYTE:
+                    raise DomainException(ErrorKind.CONFLICT, "ticket is already stamped")
+
+            except DomainException as e:
+                results.append(e)
+                continue
+
+            results.append(None)
+
+        return results
+
+
+    @staticmethod
+    def snapshot(event_id: str) -> tuple[int, bytes, bytes | None]:
+        """
+        Load the state and flag bytes of every issued ticket of an event (indexed by
+        0-index ticket number).
+
+        :param event_id: unique event identifier
+        :return: issued ticket count, state bytes, flag bytes (None if flags are
+            disabled)
+        """
+
+        snapshot = ticket_store.load_snapshot(event_id)
+
+        if snapshot is None:
+            raise DomainException(ErrorKind.NOT_FOUND, "event not found")
+
+        issued = snapshot["issued"]
+        state = bytes(snapshot["state_bytes"])[:issued]
+        flags = snapshot["flag_bytes"]
+
+        if flags is not None:
+            flags = bytes(flags)[:issued]
+
+        return issued, state, flags
+
+
     def redeem(self) -> None:
         """
         Redeem the current ticket.
         """
 
-        if not ticket_store.advance_state(
+        if self._transition(
             self.event_id,
             self.number,
-            self.version | REDEEMED_BYTE,
-            REDEEMED_BYTE
-        ):
+            self.version,
+            self.version,
+            self.version | REDEEMED_BYTE
+        ) is not None:
             raise DomainException(ErrorKind.CONFLICT, "ticket redemption failed")
         
 
     def verify(self) -> tuple[bool, bool]:
         """
-        Verify redemption and stamped status of the current ticket.
+        Validate the current ticket and verify its redemption and stamped status.
 
         :return: redemption status, stamped status
         """
 
         byte = ticket_store.load_state_byte(self.event_id, self.number)
-
-        if byte is None:
-            raise DomainException(ErrorKind.NOT_FOUND, "event not found")
-        
-        if byte >= CANCELED_BYTE:
-            raise DomainException(ErrorKind.NOT_FOUND, "ticket canceled")
+        self._check_state(byte, self.version)
         
         return byte >= REDEEMED_BYTE, byte >= STAMPED_BYTE
 
@@ -331,26 +887,26 @@ class Ticket(BaseModel):
         Stamp the current ticket.
         """
 
-        redeemed, stamped = self.verify()
+        prior = self._transition(
+            self.event_id,
+            self.number,
+            self.version,
+            self.version | REDEEMED_BYTE,
+            self.version | STAMPED_BYTE
+        )
+
+        if prior is None:
+            return
 
-        if not redeemed:
+        if prior < REDEEMED_BYTE:
             raise DomainException(ErrorKind.CONFLICT, "ticket has not been redeemed")
                 
-        if stamped:
-            raise DomainException(ErrorKind.CONFLICT, "ticket is already stamped")
+        raise DomainException(ErrorKind.CONFLICT, "ticket is already stamped")
 
-        if not ticket_store.advance_state(
-            self.event_id,
-            self.number,
-            self.version | STAMPED_BYTE,
-            STAMPED_BYTE
-        ):
-            raise DomainException(ErrorKind.CONFLICT, "ticket stamping failed")
 
-
-    def pack(self) -> str:
+    def _pack_v1(self) -> str:
         """
-        Convert the current ticket model to an encrypted ticket string.
+        Convert the current ticket model to a format 1 (JSON) encrypted ticket string.
 
         :return: encrypted ticket string
         """
@@ -380,4 +936,146 @@ class Ticket(BaseModel):
             "-" + encrypted_string
         )
 
-        return ticket_string
\ No newline at end of file
+        return ticket_string
+
+
+    def _encode_binary(self, event_tag: bytes) -> bytes:
+        """
+        Serialize the current ticket model in the binary ticket layout.
+
+        :param event_tag: stored event identifier (empty if not stored)
+        :return: fixed header, event identifier, truncated public key hash, and
+            (optionally compressed) JSON metadata
+        """
+
+        flags = 0
+        metadata = b""
+
+        if self.metadata is not None:
+            flags |= METADATA_PRESENT
+            metadata = METADATA_ENCODER.encode(self.metadata).encode("utf-8")
+
+            if len(metadata) >= METADATA_COMPRESSION_MIN:
+                compressed = zlib.compress(metadata, 9, -zlib.MAX_WBITS)
+
+                if len(compressed) < len(metadata):
+                    flags |= METADATA_COMPRESSED
+                    metadata = compressed
+                    # only keep compressed metadata when it is actually smaller
+                    # (raw deflate stream without the zlib header and checksum)
+
+        return (
+            BINARY_HEADER.pack(self.number, self.version, self.transfer_limit, flags) +
+            event_tag +
+            hash.generate_bytes(self.public_key)[:KEY_HASH_SIZE] +
+            metadata
+        )
+
+
+    def _pack_v2(self) -> str:
+        """
+        Convert the current ticket model to a format 2 (binary, AES-CBC) encrypted
+        ticket string.
+
+        :return: encrypted ticket string
+        """
+
+        body = self._encode_binary(self._event_tag(self.event_id))
+        digest = hashlib.sha256(body).digest()[:DIGEST_SIZE]
+
+        cipher = SKC(key=self.event_key)
+        ciphertext = cipher.encrypt_bytes(body + digest)
+
+        return V2_PREFIX + self._b64encode(cipher.iv + ciphertext)
+
+
+    def _pack_v3(self) -> str:
+        """
+        Convert the current ticket model to a format 3 (binary, AES-GCM) encrypted
+        ticket string.
+
+        :return: encrypted ticket string
+        """
+
+        data = AEAD(key=self.event_key).encrypt_bytes(
+            self._encode_binary(b""),
+            self.event_id.encode("utf-8")
+        )
+        # the authentication tag replaces the embedded hash, and binding the event ID
+        # as associated data replaces the stored event identifier
+
+        return V3_PREFIX + self._b64encode(data)
+
+
+    def _pack_v4(self) -> str:
+        """
+        Convert the current ticket model to a format 4 (binary, AES-GCM under the event
+        read key, sealed with the event key) encrypted ticket string.
+
+        :return: encrypted ticket string
+        """
+
+        data = AEAD(key=self.read_key(self.event_id, self.event_key)).encrypt_bytes(
+            self._encode_binary(b""),
+            self.event_id.encode("utf-8")
+        )
+
+        return V4_PREFIX + self._b64encode(data + self._seal(data, self.event_key))
+
+
+    def pack(self, ticket_format: int = TICKET_FORMAT) -> str:
+        """
+        Convert the current ticket model to an encrypted ticket string.
+
+        :param ticket_format: ticket string format (1 for JSON, 2 for binary, 3 for
+            authenticated binary, 4 for sealed authenticated binary)
+        :return: encrypted ticket string
+        """
+
+        if ticket_format == 1:
+            return self._pack_v1()
+
+        if ticket_format == 2:
+            return self._pack_v2()
+
+        if ticket_format == 3:
+            return self._pack_v3()
+
+        return self._pack_v4()
+
+
+    @staticmethod
+    def pack_many(tickets: list["Ticket"]) -> list[str]:
+        """
+        Convert several ticket models to encrypted ticket strings, spreading the work
+        across worker processes.
+
+        :param tickets: ticket models
+        :return: encrypted ticket strings (in ticket order)
+        """
+
+        if len(tickets) <= PACK_CHUNK_SIZE:
+            return _pack_chunk(tickets)
+
+        chunks = [
+            tickets[i:i + PACK_CHUNK_SIZE]
+            for i in range(0, len(tickets), PACK_CHUNK_SIZE)
+        ]
+
+        return [
+            ticket
+            for chunk in executor.map_parallel(_pack_chunk, chunks)
+            for ticket in chunk
+        ]
+
+
+
+def _pack_chunk(tickets: list[Ticket]) -> list[str]:
+    """
+    Pack a chunk of tickets (worker process task).
+
+    :param tickets: ticket models
+    :return: encrypted ticket strings
+    """
+
+    return [ticket.pack() for ticket in tickets]
\ No newline at end of file
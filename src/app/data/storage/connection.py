@@ -6,11 +6,17 @@ Database connection.
 
 
 
-from config import DATABASE_CREDS
+from app.util import metrics, readiness
+from config import (
+    DATABASE_CREDS, DATABASE_POOL_MAX_SIZE, DATABASE_POOL_MIN_SIZE,
+    DATABASE_POOL_TIMEOUT, DATABASE_PREPARE_THRESHOLD, DATABASE_READ_CREDS,
+    EXECUTION_MODE, READINESS_TIMEOUT, WORKER_THREADS
+)
 
 from psycopg import conninfo
 from psycopg.rows import dict_row
 from psycopg_pool import ConnectionPool
+from typing import Callable
 
 
 
@@ -18,37 +24,140 @@ pool = None
 # database connection pool
 
 
+read_pool = None
+# read replica connection pool (None when reads use the primary pool)
 
-def start_pool() -> None:
+
+POOL_COUNTERS = {
+    "requests_num": ("requests_total", "Connection requests", 1),
+    "requests_queued": ("requests_queued_total", "Connection requests that waited", 1),
+    "requests_wait_ms": (
+        "requests_wait_seconds_total", "Time spent waiting for a connection", 1e-3
+    ),
+    "requests_errors": (
+        "requests_errors_total", "Connection requests that timed out or failed", 1
+    ),
+    "usage_ms": ("usage_seconds_total", "Time connections spent checked out", 1e-3),
+    "returns_bad": ("returns_bad_total", "Connections returned in a bad state", 1),
+    "connections_num": ("connections_total", "Connection attempts", 1),
+    "connections_errors": ("connections_errors_total", "Failed connection attempts", 1),
+    "connections_lost": ("connections_lost_total", "Connections found broken", 1)
+}
+# psycopg_pool counter statistic -> (metric name suffix, description, unit scale)
+# (counters are only present in the pool statistics once non-zero)
+
+
+POOL_GAUGES = {
+    "pool_size": ("size", "Open and pending connections"),
+    "pool_available": ("available", "Idle connections"),
+    "pool_max": ("max_size", "Maximum connections"),
+    "requests_waiting": ("requests_waiting", "Requests waiting for a connection")
+}
+# psycopg_pool gauge statistic -> (metric name suffix, description)
+
+
+STORAGE_LATENCY = metrics.Histogram(
+    "zeta_storage_seconds", "Storage call latency (including pool checkout)", ("call",)
+)
+# storage call latency by store function
+
+
+
+def timed(func: Callable) -> Callable:
+    """
+    Decorator timing a storage function into the storage latency histogram.
+
+    :param func: storage function
+    :return: instrumented storage function
+    """
+
+    store = func.__module__.rsplit(".", 1)[-1]
+
+    return metrics.timed(STORAGE_LATENCY, f"{store}.{func.__name__}")(func)
+
+
+def _pool_bounds() -> tuple[int, int]:
+    """
+    Get the configured (or automatic) connection pool size bounds.
+
+    :return: minimum and maximum pool sizes
     """
-    Initialize a database connection pool
+
+    max_size = DATABASE_POOL_MAX_SIZE
+
+    if max_size is None:
+        max_size = WORKER_THREADS if EXECUTION_MODE == "threaded" else 1
+        # every flow holds at most one connection at a time
+
+    min_size = max_size if DATABASE_POOL_MIN_SIZE is None else DATABASE_POOL_MIN_SIZE
+
+    return min(min_size, max_size), max_size
+
+
+def _open_pool(creds: dict, name: str) -> ConnectionPool:
+    """
+    Open a connection pool and wait for its minimum connections (pre-warm).
+
+    :param creds: database connection credentials
+    :param name: pool name
+    :return: filled database connection pool
     """
 
-    global pool
+    min_size, max_size = _pool_bounds()
 
-    pool = ConnectionPool(
-        conninfo=conninfo.make_conninfo(**DATABASE_CREDS),
-        min_size=1,
-        max_size=5,
-        timeout=10,
+    new_pool = ConnectionPool(
+        conninfo=conninfo.make_conninfo(**creds),
+        min_size=min_size,
+        max_size=max_size,
+        timeout=DATABASE_POOL_TIMEOUT,
+        name=name,
         kwargs={
-            "row_factory": dict_row
+            "row_factory": dict_row,
+            "prepare_threshold": DATABASE_PREPARE_THRESHOLD
         }
     )
+    # prepared statements live as long as their pooled connection, so every storage
+    # statement is parsed and planned once per connection rather than once per call
+
+    try:
+        new_pool.wait(timeout=DATABASE_POOL_TIMEOUT)
+        # establish the minimum connections now rather than on the first requests
+
+    except Exception:
+        new_pool.close()
+        raise
+
+    return new_pool
+
+
+def start_pool() -> None:
+    """
+    Initialize the database connection pools.
+    """
+
+    global pool, read_pool
+
+    pool = _open_pool(DATABASE_CREDS, "zeta-write")
+
+    if DATABASE_READ_CREDS is not None:
+        read_pool = _open_pool(DATABASE_READ_CREDS, "zeta-read")
 
 
 def stop_pool() -> None:
     """
-    Close a database connection pool.
+    Close the database connection pools.
     """
 
-    global pool
+    global pool, read_pool
 
     if pool is None:
         raise Exception("database connection pool not started")
 
     pool.close()
 
+    if read_pool is not None:
+        read_pool.close()
+
 
 def get_pool() -> ConnectionPool:
     """
@@ -60,4 +169,71 @@ def get_pool() -> ConnectionPool:
     if pool is None:
         raise Exception("database connection pool not started")
 
-    return pool
\ No newline at end of file
+    return pool
+
+
+def get_read_pool() -> ConnectionPool:
+    """
+    Get the connection pool for read-only queries that tolerate replica lag.
+
+    :return: read replica connection pool (or the primary pool if not configured)
+    """
+
+    if read_pool is not None:
+        return read_pool
+
+    return get_pool()
+
+
+def _collect() -> list[tuple]:
+    """
+    Collect connection pool metrics.
+
+    :return: metric samples
+    """
+
+    samples = []
+
+    for role, target in (("write", pool), ("read", read_pool)):
+        if target is None:
+            continue
+
+        stats = target.get_stats()
+        labels = {"pool": role}
+
+        for key, (suffix, description) in POOL_GAUGES.items():
+            samples.append((
+                f"zeta_db_pool_{suffix}", "gauge", description, labels,
+                stats.get(key, 0)
+            ))
+
+        for key, (suffix, description, scale) in POOL_COUNTERS.items():
+            samples.append((
+                f"zeta_db_pool_{suffix}", "counter", description, labels,
+                stats.get(key, 0) * scale
+            ))
+
+    return samples
+
+
+metrics.register(_collect)
+
+
+def _check() -> None:
+    """
+    Readiness check: every connection pool hands out a working connection.
+    """
+
+    for role, target in (("write", get_pool()), ("read", read_pool)):
+        if target is None:
+            continue
+
+        try:
+            with target.connection(timeout=READINESS_TIMEOUT) as conn:
+                conn.execute("SELECT 1", prepare=False)
+
+        except Exception as e:
+            raise Exception(f"{role} pool: {e}") from e
+
+
+readiness.register("database", _check)
\ No newline at end of file
@@ -7,9 +7,38 @@ Event model database integrations.
 
 
 from . import connection as db
+from .ticket_store import STATE_PAGE_SIZE
 
 
 
+PUBLIC_COLUMNS = """
+    id,
+    name,
+    description,
+    tickets,
+    issued,
+    start,
+    finish,
+    restricted,
+    transfer_limit,
+    enable_flags
+"""
+# public event columns returned by event lookups and searches
+
+
+SEARCH_CONFIG = "english"
+# full-text search configuration (must match the index created by the setup utility)
+
+
+SEARCH_DOCUMENT = (
+    f"to_tsvector('{SEARCH_CONFIG}', name || ' ' || coalesce(description, ''))"
+)
+# full-text search document expression (stored in the generated "search_document"
+# column so that ranking does not re-parse every matching event)
+
+
+
+@db.timed
 def load_event(event_id: str) -> dict | None:
     """
     Load event data from the database.
@@ -22,12 +51,16 @@ def load_event(event_id: str) -> dict | None:
 
     with pool.connection() as conn:
         with conn.cursor() as cur:
-            cur.execute("SELECT * FROM events WHERE id = %s;", (event_id,))
+            cur.execute(
+                f"SELECT {PUBLIC_COLUMNS} FROM events WHERE id = %s;",
+                (event_id,)
+            )
             row = cur.fetchone()
 
     return dict(row) if row else None
 
 
+@db.timed
 def load_event_key(event_id: str) -> bytes | None:
     """
     Load event ticket granting key from the database.
@@ -49,29 +82,96 @@ def load_event_key(event_id: str) -> bytes | None:
     return bytes(row["event_key"]) if row else None
 
 
-def search(text: str, limit: int) -> list[dict]:
+@db.timed
+def search(text: str, limit: int, after: str | None = None) -> list[dict]:
     """
-    Search for an event in the database and load its data
+    Search for events whose name contains a text pattern (served by the trigram index)
+    and load their data, ordered by event ID (runs on the read replica if configured).
 
     :param text: text search pattern
     :param limit: query fetch limit
+    :param after: event ID of the last event on the previous page (keyset pagination)
     :return: list of data dictionaries for matching events
     """
 
-    pool = db.get_pool()
+    pool = db.get_read_pool()
     pattern = f"%{text}%"
+    keyset = "" if after is None else "AND id > %(after)s"
 
     with pool.connection() as conn:
         with conn.cursor() as cur:
             cur.execute(
-                "SELECT * FROM events WHERE name ILIKE %s LIMIT %s;",
-                (pattern, limit)
+                f"""
+                SELECT {PUBLIC_COLUMNS}
+                FROM events
+                WHERE name ILIKE %(pattern)s
+                    {keyset}
+                ORDER BY id
+                LIMIT %(limit)s;
+                """,
+                {"pattern": pattern, "after": after, "limit": limit},
+                prepare=False
             )
+            # planned per call (the best plan depends on the search pattern)
             rows = cur.fetchall()
 
     return list(rows)
 
 
+@db.timed
+def search_ranked(
+    text: str,
+    limit: int,
+    after: tuple[float, str] | None = None
+) -> list[dict]:
+    """
+    Full-text search over event names and descriptions, ordered by relevance (served by
+    the full-text index; runs on the read replica if configured).
+
+    :param text: search query (web search syntax: words, "phrases", or, -exclusions)
+    :param limit: query fetch limit
+    :param after: (rank, event ID) of the last event on the previous page (keyset
+        pagination)
+    :return: list of data dictionaries for matching events (most relevant first, with
+        their relevance under "rank")
+    """
+
+    pool = db.get_read_pool()
+    keyset = "" if after is None else (
+        "WHERE rank < %(rank)s::REAL OR (rank = %(rank)s::REAL AND id > %(after)s)"
+    )
+    # resume strictly after the previous page's last (rank, ID) position
+
+    with pool.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                f"""
+                SELECT {PUBLIC_COLUMNS}, rank
+                FROM (
+                    SELECT {PUBLIC_COLUMNS}, ts_rank(search_document, query) AS rank
+                    FROM events,
+                        websearch_to_tsquery('{SEARCH_CONFIG}', %(text)s) AS query
+                    WHERE search_document @@ query
+                ) matches
+                {keyset}
+                ORDER BY rank DESC, id
+                LIMIT %(limit)s;
+                """,
+                {
+                    "text": text,
+                    "rank": after[0] if after else None,
+                    "after": after[1] if after else None,
+                    "limit": limit
+                },
+                prepare=False
+            )
+            # planned per call (the best plan depends on the search query)
+            rows = cur.fetchall()
+
+    return list(rows)
+
+
+@db.timed
 def create(event: dict, event_key: bytes, owner_public_key_hash: bytes) -> None:
     """
     Create an event.
@@ -82,9 +182,20 @@ def create(event: dict, event_key: bytes, owner_public_key_hash: bytes) -> None:
     """
 
     pool = db.get_pool()
+    tickets = int(event["tickets"])
+
+    pages = []
 
-    state_bytes = b"\x00" * int(event["tickets"])
-    flag_bytes = b"\x00" * int(event["tickets"]) if event["enable_flags"] else None
+    for page, first in enumerate(range(0, tickets, STATE_PAGE_SIZE)):
+        page_bytes = b"\x00" * min(STATE_PAGE_SIZE, tickets - first)
+
+        pages.append({
+            "event_id": event["id"],
+            "page": page,
+            "state_bytes": page_bytes,
+            "flag_bytes": page_bytes if event["enable_flags"] else None
+        })
+        # zeroed state (and optional flag) bytes for each page of tickets
 
     with pool.connection() as conn:
         with conn.cursor() as cur:
@@ -124,29 +235,43 @@ def create(event: dict, event_key: bytes, owner_public_key_hash: bytes) -> None:
                 INSERT INTO event_data (
                     event_id,
                     event_key,
-                    owner_public_key_hash,
-                    state_bytes,
-                    flag_bytes
+                    owner_public_key_hash
                 )
                 VALUES (
                     %(event_id)s,
                     %(event_key)s,
-                    %(owner_public_key_hash)s,
-                    %(state_bytes)s,
-                    %(flag_bytes)s
+                    %(owner_public_key_hash)s
                 );
                 """,
                 {
                     "event_id": event["id"],
                     "event_key": event_key,
-                    "owner_public_key_hash": owner_public_key_hash,
-                    "state_bytes": state_bytes,
-                    "flag_bytes": flag_bytes
+                    "owner_public_key_hash": owner_public_key_hash
                 }
             )
             # create non-public event data row
 
+            cur.executemany(
+                """
+                INSERT INTO event_state_pages (
+                    event_id,
+                    page,
+                    state_bytes,
+                    flag_bytes
+                )
+                VALUES (
+                    %(event_id)s,
+                    %(page)s,
+                    %(state_bytes)s,
+                    %(flag_bytes)s
+                );
+                """,
+                pages
+            )
+            # create ticket state page rows
+
 
+@db.timed
 def delete(event_id: str) -> bool:
     """
     Delete an event.
@@ -161,6 +286,6 @@ def delete(event_id: str) -> bool:
         with conn.cursor() as cur:
             cur.execute("DELETE FROM events WHERE id = %s;", (event_id,))
             # delete event row
-            # (event data row cascade deletes)
+            # (event data and state page rows cascade delete)
 
             return cur.rowcount > 0
\ No newline at end of file
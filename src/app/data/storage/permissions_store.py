@@ -11,61 +11,56 @@ from app.crypto import hash
 
 
 
-def load_owner_public_key_hash(event_id: str) -> bytes | None:
+@db.timed
+def load_access(event_id: str, public_key_hash: bytes) -> dict | None:
     """
-    Load the event owner's public key hash from the database.
+    Load the event owner's public key hash together with the stored permissions of a
+    given public key hash (one query).
 
     :param event_id: unique event identifier
-    :return: the event owner's public key hash or None if not found
+    :param public_key_hash: SHA-256 hash of the PEM-encoded public key
+    :return: dict with "owner_public_key_hash" and "permissions" (dict of permission
+        fields or None if no row exists), or None if the event is not found
     """
 
     pool = db.get_pool()
 
-    with pool.connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute(
-                "SELECT owner_public_key_hash FROM event_data WHERE event_id = %s;",
-                (event_id,)
-            )
-            row = cur.fetchone()
-
-    return bytes(row["owner_public_key_hash"]) if row else None
-
-
-def load_permissions(event_id: str, public_key: str) -> dict | None:
-    """
-    Load stored permissions for a given event and public key.
-
-    :param event_id: unique event identifier
-    :param public_key: PEM-encoded public key
-    :return: dict of permission fields or None if no row exists
-    """
-
-    pool = db.get_pool()
-    public_key_hash = hash.generate_bytes(public_key)
-
     with pool.connection() as conn:
         with conn.cursor() as cur:
             cur.execute(
                 """
                 SELECT
-                    cancel_ticket,
-                    see_ticket_flag,
-                    update_ticket_flag,
-                    authorize_registration,
-                    see_stamped_ticket,
-                    stamp_ticket
-                FROM event_permissions
-                WHERE event_id = %s
-                    AND public_key_hash = %s;
+                    d.owner_public_key_hash,
+                    p.public_key_hash IS NOT NULL AS delegated,
+                    p.cancel_ticket,
+                    p.see_ticket_flag,
+                    p.update_ticket_flag,
+                    p.authorize_registration,
+                    p.see_stamped_ticket,
+                    p.stamp_ticket
+                FROM event_data d
+                LEFT JOIN event_permissions p
+                    ON p.event_id = d.event_id
+                    AND p.public_key_hash = %(public_key_hash)s
+                WHERE d.event_id = %(event_id)s;
                 """,
-                (event_id, public_key_hash)
+                {"event_id": event_id, "public_key_hash": public_key_hash}
             )
             row = cur.fetchone()
 
-    return dict(row) if row else None
+    if row is None:
+        return None
+
+    owner_public_key_hash = bytes(row.pop("owner_public_key_hash"))
+    delegated = row.pop("delegated")
+
+    return {
+        "owner_public_key_hash": owner_public_key_hash,
+        "permissions": row if delegated else None
+    }
 
 
+@db.timed
 def update_permissions(event_id: str, public_key: str, permissions: dict) -> None:
     """
     Insert or update permissions for a given event and public key.
@@ -119,6 +114,7 @@ def update_permissions(event_id: str, public_key: str, permissions: dict) -> Non
             )
 
 
+@db.timed
 def remove_permissions(event_id: str, public_key: str) -> None:
     """
     Remove permissions for a given event and public key.
@@ -10,12 +10,33 @@ from . import connection as db
 
 
 
-def issue(event_id: str) -> int | None:
+STATE_PAGE_SIZE = 1024
+# number of tickets per state page row
+# (per-ticket state and flag bytes are spread over fixed-size pages so that updates
+# rewrite one small row instead of the whole event's state)
+
+
+
+def locate(ticket_number: int) -> tuple[int, int]:
+    """
+    Locate a ticket's state byte within the paged state storage.
+
+    :param ticket_number: 0-index ticket number
+    :return: state page number, byte offset within the page
+    """
+
+    return divmod(ticket_number, STATE_PAGE_SIZE)
+
+
+@db.timed
+def issue(event_id: str, count: int = 1) -> int | None:
     """
-    Update the database to issue a new event ticket with a unique ticket number.
+    Update the database to issue new event tickets with unique ticket numbers.
 
     :param event_id: unique event identifier
-    :return: the issued ticket number (0-index) or None if a ticket cannot be issued
+    :param count: number of tickets to issue (as one contiguous range)
+    :return: the first issued ticket number (0-index) or None if the tickets cannot be
+        issued
     """
 
     pool = db.get_pool()
@@ -25,45 +46,78 @@ def issue(event_id: str) -> int | None:
             cur.execute(
                 """
                 UPDATE events
-                SET issued = issued + 1
+                SET issued = issued + %s
                 WHERE id = %s
-                    AND issued < tickets
+                    AND issued + %s <= tickets
                 RETURNING issued;
                 """,
-                (event_id,)
+                (count, event_id, count)
             )
             row = cur.fetchone()
     
-    return int(row["issued"]) - 1 if row else None
+    return int(row["issued"]) - count if row else None
 
 
-def reissue(event_id: str, ticket_number: int, version: int) -> bool:
+@db.timed
+def transition_state(
+    event_id: str,
+    ticket_number: int,
+    expected: int,
+    data: int
+) -> tuple[int, int] | None:
     """
-    Update the database to reflect a ticket reissue (version number increase).
+    Atomically replace a ticket's state byte if it currently equals an expected value
+    (one statement).
 
     :param event_id: unique event identifier
     :param ticket_number: 0-index ticket number
-    :param version: current version (0-index, before update)
-    :return: reissue success status
+    :param expected: required current state data byte
+    :param data: new state data byte
+    :return: prior state data byte, current state data byte (equal to data only if the
+        transition was applied), or None if not found
     """
 
     pool = db.get_pool()
+    page, offset = locate(ticket_number)
 
     with pool.connection() as conn:
         with conn.cursor() as cur:
             cur.execute(
                 """
-                UPDATE event_data
-                SET state_bytes = set_byte(state_bytes, %s, %s)
-                WHERE event_id = %s
-                    AND get_byte(state_bytes, %s) = %s
+                WITH locked AS (
+                    SELECT get_byte(state_bytes, %(offset)s) AS prior
+                    FROM event_state_pages
+                    WHERE event_id = %(event_id)s
+                        AND page = %(page)s
+                    FOR UPDATE
+                ),
+                updated AS (
+                    UPDATE event_state_pages
+                    SET state_bytes = set_byte(state_bytes, %(offset)s, %(data)s)
+                    WHERE event_id = %(event_id)s
+                        AND page = %(page)s
+                        AND (SELECT prior FROM locked) = %(expected)s
+                    RETURNING get_byte(state_bytes, %(offset)s) AS current
+                )
+                SELECT
+                    l.prior,
+                    COALESCE((SELECT current FROM updated), l.prior) AS current
+                FROM locked l;
                 """,
-                (ticket_number, version + 1, event_id, ticket_number, version)
+                {
+                    "event_id": event_id,
+                    "page": page,
+                    "offset": offset,
+                    "expected": expected,
+                    "data": data
+                }
             )
+            row = cur.fetchone()
 
-            return cur.rowcount == 1
+    return (int(row["prior"]), int(row["current"])) if row else None
 
 
+@db.timed
 def advance_state(event_id: str, ticket_number: int, data: int, threshold: int) -> bool:
     """
     Set an integer state (representing redeemed, stamped, or canceled) on ticket data.
@@ -76,14 +130,16 @@ def advance_state(event_id: str, ticket_number: int, data: int, threshold: int)
     """
 
     pool = db.get_pool()
+    page, offset = locate(ticket_number)
 
     with pool.connection() as conn:
         with conn.cursor() as cur:
             cur.execute(
                 """
-                UPDATE event_data
+                UPDATE event_state_pages
                 SET state_bytes = set_byte(state_bytes, %s, %s)
                 WHERE event_id = %s
+                    AND page = %s
                     AND get_byte(state_bytes, %s) < %s
                     AND %s < (
                         SELECT issued
@@ -92,10 +148,11 @@ def advance_state(event_id: str, ticket_number: int, data: int, threshold: int)
                     );
                 """,
                 (
-                    ticket_number,
+                    offset,
                     data,
                     event_id,
-                    ticket_number,
+                    page,
+                    offset,
                     threshold,
                     ticket_number,
                     event_id
@@ -105,6 +162,7 @@ def advance_state(event_id: str, ticket_number: int, data: int, threshold: int)
             return cur.rowcount == 1
 
 
+@db.timed
 def load_state_byte(event_id: str, ticket_number: int) -> int | None:
     """
     Load a ticket's state data byte from the database.
@@ -115,22 +173,199 @@ def load_state_byte(event_id: str, ticket_number: int) -> int | None:
     """
 
     pool = db.get_pool()
+    page, offset = locate(ticket_number)
 
     with pool.connection() as conn:
         with conn.cursor() as cur:
             cur.execute(
                 """
                 SELECT get_byte(state_bytes, %s) AS state_byte
-                FROM event_data
-                WHERE event_id = %s;
+                FROM event_state_pages
+                WHERE event_id = %s
+                    AND page = %s;
                 """,
-                (ticket_number, event_id)
+                (offset, event_id, page)
             )
             row = cur.fetchone()
 
     return int(row["state_byte"]) if row else None
 
 
+@db.timed
+def load_state_bytes(event_id: str, ticket_numbers: list[int]) -> dict[int, int]:
+    """
+    Load several tickets' state data bytes from the database in one query.
+
+    :param event_id: unique event identifier
+    :param ticket_numbers: 0-index ticket numbers
+    :return: ticket state data bytes by ticket number (missing if not found)
+    """
+
+    pool = db.get_pool()
+
+    with pool.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT
+                    r.number,
+                    get_byte(p.state_bytes, mod(r.number, %(size)s)) AS state_byte
+                FROM unnest(%(numbers)s::INTEGER[]) AS r(number)
+                JOIN event_state_pages p
+                    ON p.event_id = %(event_id)s
+                    AND p.page = r.number / %(size)s;
+                """,
+                {
+                    "event_id": event_id,
+                    "numbers": ticket_numbers,
+                    "size": STATE_PAGE_SIZE
+                }
+            )
+            rows = cur.fetchall()
+
+    return {int(row["number"]): int(row["state_byte"]) for row in rows}
+
+
+@db.timed
+def load_snapshot(event_id: str) -> dict | None:
+    """
+    Load the state and flag bytes of every issued ticket of an event in one query.
+
+    :param event_id: unique event identifier
+    :return: snapshot dictionary with "issued" (issued ticket count), "state_bytes",
+        and "flag_bytes" (None if flags are disabled), whose bytes cover at least the
+        issued tickets in ticket number order, or None if not found
+    """
+
+    pool = db.get_pool()
+    # read from the primary (a snapshot must not miss recent cancelations or stamps)
+
+    with pool.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT
+                    e.issued,
+                    string_agg(p.state_bytes, ''::BYTEA ORDER BY p.page) AS state_bytes,
+                    string_agg(p.flag_bytes, ''::BYTEA ORDER BY p.page) AS flag_bytes
+                FROM events e
+                JOIN event_state_pages p
+                    ON p.event_id = e.id
+                    AND p.page <= e.issued / %(size)s
+                WHERE e.id = %(event_id)s
+                GROUP BY e.issued;
+                """,
+                {"event_id": event_id, "size": STATE_PAGE_SIZE}
+            )
+            row = cur.fetchone()
+
+    return row
+
+
+@db.timed
+def stamp_many(
+    event_id: str,
+    tickets: list[tuple[int, int]],
+    redeemed: int,
+    stamped: int
+) -> dict[int, int]:
+    """
+    Stamp several redeemed tickets in a single statement.
+
+    A ticket is stamped only if its current byte is exactly (version | redeemed), in
+    which case it becomes (version | stamped); all other tickets are left unchanged.
+
+    The state pages involved are locked in ascending page order before the update, so
+    that concurrent batches spanning the same pages (in any ticket order) wait for each
+    other rather than deadlock.
+
+    :param event_id: unique event identifier
+    :param tickets: (0-index ticket number, current version) pairs with unique numbers
+    :param redeemed: redeemed state bit
+    :param stamped: stamped state bit
+    :return: prior ticket state data bytes by ticket number (missing if not found)
+    """
+
+    pool = db.get_pool()
+
+    with pool.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT page
+                FROM event_state_pages
+                WHERE event_id = %s
+                    AND page = ANY(%s)
+                ORDER BY page
+                FOR UPDATE;
+                """,
+                (
+                    event_id,
+                    sorted({number // STATE_PAGE_SIZE for number, _ in tickets})
+                )
+            )
+            # take every page lock up front in a deterministic order (held until the
+            # transaction commits)
+
+            cur.execute(
+                """
+                WITH requested AS (
+                    SELECT
+                        r.number,
+                        r.version,
+                        r.number / %(size)s AS page,
+                        mod(r.number, %(size)s) AS byte_offset
+                    FROM unnest(
+                        %(numbers)s::INTEGER[],
+                        %(versions)s::INTEGER[]
+                    ) AS r(number, version)
+                ),
+                locked AS (
+                    SELECT
+                        r.number,
+                        r.version,
+                        r.page,
+                        r.byte_offset,
+                        get_byte(p.state_bytes, r.byte_offset) AS prior
+                    FROM requested r
+                    JOIN event_state_pages p
+                        ON p.event_id = %(event_id)s
+                        AND p.page = r.page
+                    FOR UPDATE OF p
+                ),
+                updated AS (
+                    UPDATE event_state_pages p
+                    SET state_bytes = set_bytes(p.state_bytes, s.offsets, s.bytes)
+                    FROM (
+                        SELECT
+                            page,
+                            array_agg(byte_offset) AS offsets,
+                            array_agg(version | %(stamped)s) AS bytes
+                        FROM locked
+                        WHERE prior = (version | %(redeemed)s)
+                        GROUP BY page
+                    ) s
+                    WHERE p.event_id = %(event_id)s
+                        AND p.page = s.page
+                )
+                SELECT number, prior
+                FROM locked;
+                """,
+                {
+                    "event_id": event_id,
+                    "numbers": [number for number, _ in tickets],
+                    "versions": [version for _, version in tickets],
+                    "size": STATE_PAGE_SIZE,
+                    "redeemed": redeemed,
+                    "stamped": stamped
+                }
+            )
+            rows = cur.fetchall()
+
+    return {int(row["number"]): int(row["prior"]) for row in rows}
+
+
+@db.timed
 def set_flag(event_id: str, ticket_number: int, mask: int, value: int) -> int | None:
     """
     Atomically update the flag byte using: (old_byte & mask) | value.
@@ -143,28 +378,31 @@ def set_flag(event_id: str, ticket_number: int, mask: int, value: int) -> int |
     """
 
     pool = db.get_pool()
+    page, offset = locate(ticket_number)
 
     with pool.connection() as conn:
         with conn.cursor() as cur:
             cur.execute(
                 """
-                UPDATE event_data
+                UPDATE event_state_pages
                 SET flag_bytes = set_byte(
                     flag_bytes,
                     %s,
                     (get_byte(flag_bytes, %s) & %s) | %s
                 )
                 WHERE event_id = %s
+                    AND page = %s
                     AND flag_bytes IS NOT NULL
                 RETURNING get_byte(flag_bytes, %s) as flag_byte;
                 """,
-                (ticket_number, ticket_number, mask, value, event_id, ticket_number)
+                (offset, offset, mask, value, event_id, page, offset)
             )
             row = cur.fetchone()
     
     return int(row["flag_byte"]) if row else None
 
 
+@db.timed
 def get_flag(event_id: str, ticket_number: int) -> int | None:
     """
     Get a ticket's flag value.
@@ -175,17 +413,19 @@ def get_flag(event_id: str, ticket_number: int) -> int | None:
     """
 
     pool = db.get_pool()
+    page, offset = locate(ticket_number)
 
     with pool.connection() as conn:
         with conn.cursor() as cur:
             cur.execute(
                 """
                 SELECT get_byte(flag_bytes, %s) AS flag_byte
-                FROM event_data
+                FROM event_state_pages
                 WHERE event_id = %s
+                    AND page = %s
                     AND flag_bytes IS NOT NULL;
                 """,
-                (ticket_number, event_id)
+                (offset, event_id, page)
             )
             row = cur.fetchone()
 
@@ -0,0 +1,123 @@
+"""
+Cross-process cache invalidation broadcasts.
+
+:author: Max Milazzo
+"""
+
+
+
+from . import readiness
+
+from typing import Callable
+
+
+
+CHANNEL = "zeta:invalidate"
+# Redis pub/sub channel carrying invalidated event IDs
+
+
+REDIS = None
+# Redis client (None when running in single-process memory mode)
+
+
+listener = None
+# Redis pub/sub listener thread
+
+
+handlers = []
+# local invalidation handlers (called with an event ID)
+
+
+
+def subscribe(handler: Callable[[str], None]) -> None:
+    """
+    Register a local handler to run whenever an event is invalidated.
+
+    :param handler: invalidation handler receiving the event ID
+    """
+
+    handlers.append(handler)
+
+
+def _dispatch(event_id: str) -> None:
+    """
+    Run all local invalidation handlers for an event.
+
+    :param event_id: unique event identifier
+    """
+
+    for handler in handlers:
+        handler(event_id)
+
+
+def start_service(redis_url: str | None, listen: bool = True) -> None:
+    """
+    Start the invalidation broadcast service.
+
+    :param redis_url: Redis connection URL string or None for local-only invalidation
+    :param listen: if True, also apply invalidations published by other processes
+    """
+
+    global REDIS, listener
+
+    if redis_url is None:
+        return
+
+    import redis
+
+    try:
+        REDIS = redis.Redis.from_url(redis_url, decode_responses=True)
+        REDIS.ping()
+
+    except Exception as e:
+        raise Exception("redis connection failed") from e
+
+    if listen:
+        pubsub = REDIS.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{CHANNEL: lambda message: _dispatch(message["data"])})
+        listener = pubsub.run_in_thread(sleep_time=1, daemon=True)
+        # apply invalidations from other server processes and the setup utility
+
+
+def stop_service() -> None:
+    """
+    Stop the invalidation listener thread.
+    """
+
+    global listener
+
+    if listener is not None:
+        listener.stop()
+        listener = None
+
+
+def publish(event_id: str) -> None:
+    """
+    Invalidate cached data for an event in this process and (with Redis) in every
+    other subscribed process.
+
+    :param event_id: unique event identifier
+    """
+
+    _dispatch(event_id)
+
+    if REDIS is not None:
+        REDIS.publish(CHANNEL, event_id)
+
+
+def _check() -> None:
+    """
+    Readiness check: the invalidation listener is running and Redis answers (when
+    running with Redis).
+    """
+
+    if REDIS is None:
+        return
+
+    if listener is None or not listener.is_alive():
+        raise Exception("invalidation listener not running")
+
+    REDIS.ping()
+
+
+readiness.register("broadcast", _check)
\ No newline at end of file
@@ -0,0 +1,149 @@
+"""
+In-process caching utilities.
+
+:author: Max Milazzo
+"""
+
+
+
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Hashable
+
+
+
+class LRUCache:
+    """
+    Thread-safe bounded least-recently-used cache with optional entry expiration and
+    hit/miss counters.
+    """
+
+    def __init__(self, max_size: int, ttl: float | None = None) -> None:
+        """
+        LRU cache initialization.
+
+        :param max_size: maximum number of cached entries (oldest entries are evicted)
+        :param ttl: entry time-to-live (in seconds) or None to keep entries until evicted
+        """
+
+        if max_size < 1:
+            raise Exception("LRUCache: invalid maximum size")
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.generation = 0
+
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+
+    def get(self, key: Hashable) -> Any | None:
+        """
+        Look up a cached value.
+
+        :param key: cache key
+        :return: cached value or None if not present
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires = entry
+
+            if expires is not None and expires <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+                # drop expired entry
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+            return value
+
+
+    def put(self, key: Hashable, value: Any, generation: int | None = None) -> None:
+        """
+        Insert or refresh a cached value.
+
+        :param key: cache key
+        :param value: value to cache (must not be None)
+        :param generation: cache generation read before the value was loaded (the value
+            is dropped if any invalidation happened since), or None to always insert
+        """
+
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+                # the value may have been loaded before an invalidation it would undo
+
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+                # evict least recently used entries
+
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Remove a cached value if present.
+
+        :param key: cache key
+        """
+
+        with self._lock:
+            self._entries.pop(key, None)
+            self.generation += 1
+
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        """
+        Remove every cached value whose key matches a predicate (scans the cache).
+
+        :param predicate: key filter returning True for keys to remove
+        """
+
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                del self._entries[key]
+
+            self.generation += 1
+
+
+    def clear(self) -> None:
+        """
+        Remove all cached values.
+        """
+
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+
+
+    def stats(self) -> dict:
+        """
+        Get cache usage counters.
+
+        :return: cache statistics dictionary
+        """
+
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
\ No newline at end of file
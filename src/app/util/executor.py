@@ -0,0 +1,136 @@
+"""
+Bounded request and CPU-bound work executors.
+
+:author: Max Milazzo
+"""
+
+
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Iterable, TypeVar
+
+
+
+executor = None
+# bounded worker thread pool (None when running flows inline)
+
+
+process_pool = None
+# CPU-bound worker process pool (None when running CPU-bound work in-process)
+
+
+server_processes = 1
+# number of server processes sharing the machine's cores, each starting its own process
+# pool (set by the pre-fork launcher)
+
+
+T = TypeVar("T")
+U = TypeVar("U")
+
+
+
+def start_executor(workers: int | None) -> None:
+    """
+    Initialize the bounded worker thread pool.
+
+    :param workers: maximum number of worker threads or None to run flows inline
+    """
+
+    global executor
+
+    if workers is None:
+        executor = None
+        return
+
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="zeta")
+
+
+def stop_executor() -> None:
+    """
+    Shut down the worker thread pool (waiting for in-flight work to finish).
+    """
+
+    global executor
+
+    if executor is not None:
+        executor.shutdown(wait=True)
+        executor = None
+
+
+async def run(func: Callable[..., T], *args) -> T:
+    """
+    Run a blocking function without stalling the event loop.
+
+    The function runs on the worker thread pool if one is started, or directly on the
+    event loop otherwise.  Database I/O (psycopg) and OpenSSL signature operations both
+    release the GIL, so worker threads overlap while the event loop keeps serving.
+
+    :param func: blocking function to run
+    :param args: positional function arguments
+    :return: function return value
+    """
+
+    if executor is None:
+        return func(*args)
+
+    loop = asyncio.get_running_loop()
+
+    return await loop.run_in_executor(executor, func, *args)
+
+
+def start_process_pool(processes: int | None) -> None:
+    """
+    Initialize the CPU-bound worker process pool.
+
+    :param processes: number of worker processes (None for an even share of the cores
+        among server processes, 0 to disable)
+    """
+
+    global process_pool
+
+    if processes == 0:
+        process_pool = None
+        return
+
+    if processes is None:
+        processes = max(1, (os.cpu_count() or 1) // server_processes)
+        # every server process starts its own pool, so one pool per core in each would
+        # oversubscribe the machine
+
+    process_pool = ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=multiprocessing.get_context("spawn")
+    )
+    # spawn (rather than fork) workers since the server process runs threads
+
+
+def stop_process_pool() -> None:
+    """
+    Shut down the worker process pool.
+    """
+
+    global process_pool
+
+    if process_pool is not None:
+        process_pool.shutdown(wait=True)
+        process_pool = None
+
+
+def map_parallel(func: Callable[[T], U], items: Iterable[T]) -> list[U]:
+    """
+    Map a picklable top-level function over items across worker processes.
+
+    Runs in-process if the process pool is not started.
+
+    :param func: function to apply
+    :param items: function arguments
+    :return: function results (in argument order)
+    """
+
+    if process_pool is None:
+        return [func(item) for item in items]
+
+    return list(process_pool.map(func, items))
\ No newline at end of file
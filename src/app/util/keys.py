@@ -1,14 +1,20 @@
 """
 Key management module.
 
+The server key is loaded (or generated) on first use or by an explicit call to load()
+from the application lifespan, never at import time.
+
 :author: Max Milazzo
 """
 
 
 
-from app.crypto.asymmetric import AKC
+from app.crypto import hash
+from app.crypto.asymmetric import AKC, Signer
+from app.util import readiness
 
 import os
+from threading import Lock
 
 
 
@@ -17,6 +23,23 @@ PUB_KEY_FILE = os.path.join("data", "pub.key")
 # key file locations
 
 
+PRIVATE_KEY = None
+# server private key PEM string (None until loaded)
+
+
+RESPONSE_SIGNER = None
+# single signer instance for server responses (None until loaded)
+
+
+CURSOR_KEY = None
+# search cursor HMAC key (derived from the server key so that every replica sharing
+# the key accepts the same cursors)
+
+
+_lock = Lock()
+# serializes the first key load
+
+
 
 def setup() -> str:
     """
@@ -35,13 +58,69 @@ def setup() -> str:
     return cipher.private_key
 
 
-if os.path.exists(PRIV_KEY_FILE):
-    with open(PRIV_KEY_FILE, "r", encoding="utf-8") as f:
-        PRIVATE_KEY = f.read()
+def load() -> None:
+    """
+    Load the server key from disk (or generate it if missing) and derive the response
+    signer and cursor key.  Subsequent calls do nothing.
+    """
+
+    global PRIVATE_KEY, RESPONSE_SIGNER, CURSOR_KEY
+
+    if RESPONSE_SIGNER is not None:
+        return
+
+    with _lock:
+        if RESPONSE_SIGNER is not None:
+            return
+
+        if os.path.exists(PRIV_KEY_FILE):
+            with open(PRIV_KEY_FILE, "r", encoding="utf-8") as f:
+                private_key = f.read()
+
+        else:
+            private_key = setup()
+
+        CURSOR_KEY = hash.generate_bytes("zeta:search-cursor:" + private_key)
+        PRIVATE_KEY = private_key
+
+        RESPONSE_SIGNER = AKC(private_key=private_key, trusted=True)
+        # the key file is written by this module, so the slow private key consistency
+        # checks are skipped (set last: a non-None signer marks the keys as loaded)
+
+
+def get_signer() -> Signer:
+    """
+    Get the server response signer (loading the server key if needed).
+
+    :return: server response signer
+    """
+
+    if RESPONSE_SIGNER is None:
+        load()
+
+    return RESPONSE_SIGNER
+
+
+def get_cursor_key() -> bytes:
+    """
+    Get the search cursor HMAC key (loading the server key if needed).
+
+    :return: search cursor HMAC key
+    """
+
+    if CURSOR_KEY is None:
+        load()
+
+    return CURSOR_KEY
+
+
+def _check() -> None:
+    """
+    Readiness check: the server key is loaded.
+    """
 
-else:
-    PRIVATE_KEY = setup()
+    if RESPONSE_SIGNER is None:
+        raise Exception("server key not loaded")
 
 
-RESPONSE_SIGNER = AKC(private_key=PRIVATE_KEY)
-# single signer instance for server responses
\ No newline at end of file
+readiness.register("keys", _check)
\ No newline at end of file
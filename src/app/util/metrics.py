@@ -0,0 +1,327 @@
+"""
+Prometheus text-format metrics.
+
+:author: Max Milazzo
+"""
+
+
+
+from .cache import LRUCache
+from config import METRICS_ENDPOINT
+
+import bisect
+import functools
+import time
+from threading import Lock
+from typing import Callable
+
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Prometheus text exposition format content type
+
+
+collectors = []
+# registered metric collectors (called on every scrape)
+
+
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0
+)
+# latency histogram bucket upper bounds (in seconds)
+
+
+
+class _Timer:
+    """
+    Context manager recording its elapsed time into a histogram.
+    """
+
+    __slots__ = ("histogram", "label_values", "start")
+
+
+    def __init__(self, histogram: "Histogram", label_values: tuple) -> None:
+        """
+        Timer initialization.
+
+        :param histogram: histogram receiving the observation
+        :param label_values: histogram label values
+        """
+
+        self.histogram = histogram
+        self.label_values = label_values
+
+
+    def __enter__(self) -> "_Timer":
+        """
+        Start timing.
+
+        :return: this timer
+        """
+
+        self.start = time.perf_counter()
+        return self
+
+
+    def __exit__(self, *_) -> None:
+        """
+        Record the elapsed time (including when the block raises).
+        """
+
+        self.histogram.observe(time.perf_counter() - self.start, *self.label_values)
+
+
+
+class _NullTimer:
+    """
+    No-op timer used while metrics are disabled.
+    """
+
+    def __enter__(self) -> "_NullTimer":
+        """
+        Do nothing.
+
+        :return: this timer
+        """
+
+        return self
+
+
+    def __exit__(self, *_) -> None:
+        """
+        Do nothing.
+        """
+
+
+NULL_TIMER = _NullTimer()
+# shared no-op timer
+
+
+
+class Histogram:
+    """
+    Thread-safe fixed-bucket histogram (one series per combination of label values).
+
+    Observations only bump a bucket counter and a sum under a short lock; cumulative
+    bucket counts are computed when metrics are scraped.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labels: tuple[str, ...],
+        buckets: tuple[float, ...] = LATENCY_BUCKETS
+    ) -> None:
+        """
+        Histogram initialization (registers the histogram for scraping).
+
+        :param name: metric name
+        :param description: metric help text
+        :param labels: label names
+        :param buckets: ascending bucket upper bounds (an infinite bucket is implied)
+        """
+
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self.buckets = buckets
+
+        self._series = {}
+        # label values -> per-bucket counts (infinite bucket last) followed by the sum
+
+        self._lock = Lock()
+
+        register(self.collect)
+
+
+    def observe(self, value: float, *label_values: str) -> None:
+        """
+        Record an observation.
+
+        :param value: observed value
+        :param label_values: label values (in label name order)
+        """
+
+        index = bisect.bisect_left(self.buckets, value)
+
+        with self._lock:
+            series = self._series.get(label_values)
+
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 1)
+                series.append(0.0)
+
+            series[index] += 1
+            series[-1] += value
+
+
+    def time(self, *label_values: str) -> _Timer | _NullTimer:
+        """
+        Time a block of code into the histogram.
+
+        :param label_values: label values (in label name order)
+        :return: timing context manager
+        """
+
+        if not METRICS_ENDPOINT:
+            return NULL_TIMER
+
+        return _Timer(self, label_values)
+
+
+    def collect(self) -> list[tuple]:
+        """
+        Collect histogram samples.
+
+        :return: metric samples
+        """
+
+        with self._lock:
+            snapshot = [(key, list(series)) for key, series in self._series.items()]
+
+        samples = []
+        bounds = [repr(bound) for bound in self.buckets] + ["+Inf"]
+
+        for label_values, series in snapshot:
+            labels = dict(zip(self.labels, label_values))
+            count = 0
+
+            for bound, bucket in zip(bounds, series):
+                count += bucket
+                samples.append((
+                    self.name, "histogram", self.description, labels | {"le": bound},
+                    count, "_bucket"
+                ))
+
+            samples.append((
+                self.name, "histogram", self.description, labels, series[-1], "_sum"
+            ))
+            samples.append((
+                self.name, "histogram", self.description, labels, count, "_count"
+            ))
+
+        return samples
+
+
+
+def register(collector: Callable[[], list[tuple]]) -> None:
+    """
+    Register a metric collector.
+
+    :param collector: function returning (name, type, help, labels, value) samples,
+        where type is "gauge", "counter", or "histogram" and labels is a dictionary
+        (histogram samples carry a sixth "_bucket", "_sum", or "_count" name suffix)
+    """
+
+    collectors.append(collector)
+
+
+def register_cache(name: str, cache: LRUCache | None) -> None:
+    """
+    Register the usage counters of an in-process cache.
+
+    :param name: cache name label
+    :param cache: cache to report (None for a disabled cache)
+    """
+
+    if cache is None:
+        return
+
+    def collect() -> list[tuple]:
+        stats = cache.stats()
+        labels = {"cache": name}
+
+        return [
+            ("zeta_cache_entries", "gauge", "Cached entries", labels, stats["size"]),
+            (
+                "zeta_cache_capacity", "gauge", "Maximum cached entries", labels,
+                stats["max_size"]
+            ),
+            ("zeta_cache_hits_total", "counter", "Cache hits", labels, stats["hits"]),
+            (
+                "zeta_cache_misses_total", "counter", "Cache misses", labels,
+                stats["misses"]
+            ),
+            (
+                "zeta_cache_evictions_total", "counter", "Cache evictions", labels,
+                stats["evictions"]
+            )
+        ]
+
+    register(collect)
+
+
+def timed(histogram: Histogram, *label_values: str) -> Callable:
+    """
+    Decorator timing every call of a function into a histogram (the function is
+    returned unchanged while metrics are disabled).
+
+    :param histogram: histogram receiving the observations
+    :param label_values: label values (in label name order)
+    :return: function decorator
+    """
+
+    def decorator(func: Callable) -> Callable:
+        if not METRICS_ENDPOINT:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+
+            try:
+                return func(*args, **kwargs)
+
+            finally:
+                histogram.observe(time.perf_counter() - start, *label_values)
+
+        return wrapper
+
+    return decorator
+
+
+def _escape(value: str) -> str:
+    """
+    Escape a label value.
+
+    :param value: raw label value
+    :return: escaped label value
+    """
+
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def render() -> str:
+    """
+    Collect every registered metric and render it in the Prometheus text format.
+
+    :return: metrics exposition text
+    """
+
+    families = {}
+    # metric name -> (type, help, sample lines)
+
+    for collector in collectors:
+        for name, kind, description, labels, value, *suffix in collector():
+            family = families.setdefault(name, (kind, description, []))
+            sample = name + suffix[0] if suffix else name
+
+            if labels:
+                label_text = ",".join(
+                    f"{key}=\"{_escape(str(label))}\"" for key, label in labels.items()
+                )
+                family[2].append(f"{sample}{{{label_text}}} {value}")
+
+            else:
+                family[2].append(f"{sample} {value}")
+
+    lines = []
+
+    for name, (kind, description, samples) in families.items():
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.extend(samples)
+
+    return "\n".join(lines) + "\n"
\ No newline at end of file
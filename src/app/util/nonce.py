@@ -0,0 +1,367 @@
+"""
+Request nonce replay tracking.
+
+:author: Max Milazzo
+"""
+
+
+
+from . import metrics
+
+import math
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+# Redis nonce pipeline size histogram bucket upper bounds (in checks)
+
+
+BATCH_SIZE = metrics.Histogram(
+    "zeta_nonce_batch_size", "Redis nonce checks per pipeline", (), BATCH_SIZE_BUCKETS
+)
+# Redis nonce pipeline size distribution
+
+
+
+class _Shard:
+    """
+    Single nonce store shard.
+    """
+
+    def __init__(self, first_bucket: int) -> None:
+        """
+        Shard initialization.
+
+        :param first_bucket: oldest live expiration bucket index
+        """
+
+        self.entries = {}
+        # nonce -> expiration epoch timestamp
+
+        self.generations = {}
+        # expiration bucket index -> nonces expiring within that bucket
+
+        self.oldest = first_bucket
+        # oldest expiration bucket not yet dropped
+
+
+
+class NonceStore:
+    """
+    Sharded in-memory nonce store with time-bucketed expiration.
+
+    Nonces are spread over shards by hash and grouped into generations by expiration
+    time.  Each check drops the generations of its own shard that have fully expired,
+    so cleanup work is spread evenly across requests instead of pausing every request
+    for a full scan.
+
+    The store takes no locks: membership checks rely on dict.setdefault being atomic
+    and generations are only dropped once they end before every expiration time that
+    can still be inserted (nonce timestamps are bounded by the timestamp check in
+    authentication).
+
+    Atomicity comes from the GIL: each dict and list operation of a shard runs as a
+    single step with respect to other threads.  Free-threaded builds (PEP 703, no GIL)
+    do not guarantee this for the combined check-and-insert, so the store is only safe
+    to share between threads on a standard build (a lock per shard would be needed
+    otherwise).
+    """
+
+    def __init__(
+        self,
+        retention: float,
+        shards: int = 16,
+        bucket_width: float = 1.0
+    ) -> None:
+        """
+        Nonce store initialization.
+
+        :param retention: time (in seconds) after its timestamp that a nonce must be
+            remembered
+        :param shards: number of shards (power of two)
+        :param bucket_width: width of each expiration generation (in seconds)
+        """
+
+        if shards < 1 or shards & (shards - 1):
+            raise Exception("NonceStore: shard count must be a power of two")
+
+        if bucket_width <= 0:
+            raise Exception("NonceStore: invalid bucket width")
+
+        self.retention = retention
+        self.bucket_width = bucket_width
+
+        first_bucket = self._bucket(time.time())
+        self._mask = shards - 1
+        self._shards = [_Shard(first_bucket) for _ in range(shards)]
+
+
+    def _bucket(self, expires: float) -> int:
+        """
+        Get the expiration generation index for an expiration time.
+
+        :param expires: expiration epoch timestamp
+        :return: generation (bucket) index
+        """
+
+        return math.floor(expires / self.bucket_width)
+
+
+    def _expire(self, shard: _Shard, now: float) -> None:
+        """
+        Drop every fully expired generation of a shard.
+
+        :param shard: nonce store shard
+        :param now: current epoch timestamp
+        """
+
+        cutoff = self._bucket(now) - 1
+        # keep one extra generation as a grace period for in-flight insertions
+
+        while shard.oldest < cutoff:
+            bucket = shard.oldest
+            shard.oldest = bucket + 1
+
+            for nonce in shard.generations.pop(bucket, ()):
+                shard.entries.pop(nonce, None)
+                # drop expired generation
+
+
+    def add(self, nonce: str, timestamp: float) -> bool:
+        """
+        Record a nonce if it has not been seen within its retention window.
+
+        :param nonce: request nonce
+        :param timestamp: request epoch timestamp
+        :return: True if the nonce is new and False if it is a repeat
+        """
+
+        shard = self._shards[hash(nonce) & self._mask]
+        now = time.time()
+        expires = timestamp + self.retention
+
+        if shard.entries.setdefault(nonce, expires) is not expires:
+            return False
+            # nonce already recorded (atomic check-and-insert under the GIL: exactly one
+            # concurrent caller inserts its own expiration object)
+
+        bucket = max(self._bucket(expires), shard.oldest)
+        shard.generations.setdefault(bucket, []).append(nonce)
+        # add nonce to its expiration generation
+
+        self._expire(shard, now)
+
+        return True
+
+
+    def __len__(self) -> int:
+        """
+        Get the number of currently tracked nonces.
+
+        :return: tracked nonce count
+        """
+
+        return sum(len(shard.entries) for shard in self._shards)
+
+
+
+class RedisNonceBatcher:
+    """
+    Coalesces concurrent Redis nonce checks into pipelines.
+
+    Callers block on their own result while flusher threads gather every check queued
+    within a short window (or until a batch fills) and send them to Redis as one
+    non-transactional pipeline of SET NX EX commands, so that concurrent requests share
+    a single round trip instead of each paying the full Redis latency.
+    """
+
+    def __init__(
+        self,
+        client,
+        window: float,
+        max_batch: int = 256,
+        flushers: int = 2,
+        timeout: float | None = None
+    ) -> None:
+        """
+        Batcher initialization (starts the flusher threads).
+
+        :param client: Redis client (pipelines draw connections from its pool)
+        :param window: time (in seconds) to keep collecting checks after the first one
+            of a batch arrives
+        :param max_batch: maximum number of checks per pipeline
+        :param flushers: number of flusher threads (concurrent pipelines)
+        :param timeout: maximum time (in seconds) to wait for a check result, or None
+            to wait indefinitely
+        """
+
+        if max_batch < 1 or flushers < 1:
+            raise Exception("RedisNonceBatcher: invalid batch size or flusher count")
+
+        self.client = client
+        self.window = window
+        self.max_batch = max_batch
+        self.timeout = timeout
+
+        self.batches = 0
+        self.checks = 0
+        self.largest = 0
+        self._stats_lock = threading.Lock()
+
+        self._queue = queue.SimpleQueue()
+        self._threads = [
+            threading.Thread(target=self._run, name="zeta-nonce", daemon=True)
+            for _ in range(flushers)
+        ]
+
+        for thread in self._threads:
+            thread.start()
+
+
+    def _collect(self, first: tuple) -> list[tuple]:
+        """
+        Gather the checks queued within the batch window.
+
+        :param first: first queued check of the batch
+        :return: batch of queued checks (a None entry signals shutdown)
+        """
+
+        batch = [first]
+        deadline = time.perf_counter() + self.window
+
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+
+            try:
+                if remaining > 0:
+                    item = self._queue.get(timeout=remaining)
+
+                else:
+                    item = self._queue.get_nowait()
+                    # window closed: take only what is already queued
+
+            except queue.Empty:
+                break
+
+            batch.append(item)
+
+            if item is None:
+                break
+
+        return batch
+
+
+    def _flush(self, batch: list[tuple]) -> None:
+        """
+        Send a batch of checks as one pipeline and resolve their results.
+
+        :param batch: queued (key, value, ttl, future) checks
+        """
+
+        try:
+            pipeline = self.client.pipeline(transaction=False)
+
+            for key, value, ttl, _ in batch:
+                pipeline.set(name=key, value=value, nx=True, ex=ttl)
+
+            results = pipeline.execute(raise_on_error=False)
+
+            if len(results) != len(batch):
+                raise Exception("RedisNonceBatcher: pipeline result count mismatch")
+
+        except Exception as e:
+            for *_, future in batch:
+                future.set_exception(e)
+
+            return
+            # any failure building or sending the pipeline fails every check in the
+            # batch (no caller is left waiting on an unresolved check)
+
+        for (*_, future), result in zip(batch, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+
+            else:
+                future.set_result(bool(result))
+
+        BATCH_SIZE.observe(len(batch))
+
+        with self._stats_lock:
+            self.batches += 1
+            self.checks += len(batch)
+            self.largest = max(self.largest, len(batch))
+
+
+    def _run(self) -> None:
+        """
+        Flusher thread loop.
+        """
+
+        while True:
+            item = self._queue.get()
+
+            if item is None:
+                return
+
+            batch = self._collect(item)
+            stop = batch[-1] is None
+
+            if stop:
+                batch.pop()
+
+            if batch:
+                self._flush(batch)
+
+            if stop:
+                return
+
+
+    def add(self, key: str, value: str, ttl: int) -> bool:
+        """
+        Atomically set a nonce key if it does not exist (batched with concurrent
+        checks).
+
+        :param key: Redis nonce key
+        :param value: key value
+        :param ttl: key time-to-live (in seconds)
+        :return: True if the nonce is new and False if it is a repeat
+        :raises TimeoutError: if no result arrives within the batcher timeout (the
+            nonce may or may not have been recorded)
+        """
+
+        future = Future()
+        self._queue.put((key, value, ttl, future))
+
+        return future.result(self.timeout)
+
+
+    def stop(self) -> None:
+        """
+        Flush queued checks and stop the flusher threads.
+        """
+
+        for _ in self._threads:
+            self._queue.put(None)
+
+        for thread in self._threads:
+            thread.join()
+
+
+    def stats(self) -> dict:
+        """
+        Get pipeline batch size counters.
+
+        :return: batching statistics dictionary
+        """
+
+        with self._stats_lock:
+            return {
+                "batches": self.batches,
+                "checks": self.checks,
+                "mean_batch_size": self.checks / self.batches if self.batches else 0.0,
+                "max_batch_size": self.largest
+            }
\ No newline at end of file
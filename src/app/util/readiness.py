@@ -0,0 +1,94 @@
+"""
+Dependency readiness checks and startup timings.
+
+:author: Max Milazzo
+"""
+
+
+
+from config import READINESS_TIMEOUT
+
+import asyncio
+import time
+from typing import Callable
+
+
+
+checks = {}
+# registered dependency checks (dependency name -> check raising when unavailable)
+
+
+startup = {}
+# dependency name -> initialization time (in seconds) of the current process
+
+
+
+def register(name: str, check: Callable[[], None]) -> None:
+    """
+    Register a dependency readiness check.
+
+    :param name: dependency name
+    :param check: blocking function raising an exception if the dependency is not
+        ready to serve requests
+    """
+
+    checks[name] = check
+
+
+def start(name: str, func: Callable, *args) -> None:
+    """
+    Initialize a dependency and record how long the initialization took.
+
+    :param name: dependency name
+    :param func: blocking initialization function
+    :param args: initialization function arguments
+    """
+
+    begin = time.perf_counter()
+    func(*args)
+    startup[name] = time.perf_counter() - begin
+
+
+async def _run(check: Callable[[], None]) -> str | None:
+    """
+    Run a single dependency check off the event loop.
+
+    :param check: dependency check
+    :return: None if the dependency is ready, otherwise an error description
+    """
+
+    try:
+        await asyncio.wait_for(asyncio.to_thread(check), READINESS_TIMEOUT)
+        return None
+
+    except asyncio.TimeoutError:
+        return f"no response within {READINESS_TIMEOUT}s"
+
+    except Exception as e:
+        return str(e) or type(e).__name__
+
+
+async def run_checks() -> tuple[bool, dict]:
+    """
+    Run every registered dependency check concurrently.
+
+    :return: overall readiness and per-dependency report
+    """
+
+    names = list(checks)
+    errors = await asyncio.gather(*(_run(checks[name]) for name in names))
+
+    report = {}
+
+    for name, error in zip(names, errors):
+        entry = {"status": "ok" if error is None else "unavailable"}
+
+        if error is not None:
+            entry["error"] = error
+
+        if name in startup:
+            entry["startup_ms"] = round(startup[name] * 1000, 1)
+
+        report[name] = entry
+
+    return all(error is None for error in errors), report
\ No newline at end of file
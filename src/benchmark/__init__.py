@@ -0,0 +1,5 @@
+"""
+Performance benchmarks module.
+
+:author: Max Milazzo
+"""
\ No newline at end of file
@@ -0,0 +1,114 @@
+"""
+Canonical JSON benchmark.
+
+Compares canonicalizer throughput against the legacy json.dumps canonical form (byte
+compatibility with the legacy form is covered by the unit tests, see
+"tests/test_canon.py"):
+
+    python -m benchmark.canon --seconds 2
+
+:author: Max Milazzo
+"""
+
+
+
+from app.crypto.canon import canonicalize
+
+import argparse
+import json
+import time
+import uuid
+
+
+
+SMALL_MESSAGE = {
+    "nonce": str(uuid.uuid4()),
+    "timestamp": time.time(),
+    "content": {
+        "ticket_number": 1,
+        "redeemed": True,
+        "stamped": True,
+        "version": 1,
+        "transfer_limit": 63,
+        "metadata": {"seat": "A12", "tier": "general"}
+    }
+}
+# representative signed response payload
+
+
+LARGE_MESSAGE = {
+    "nonce": str(uuid.uuid4()),
+    "timestamp": time.time(),
+    "content": {
+        "event_id": uuid.uuid4().hex,
+        "metadata": {
+            f"attendee_{i:05d}": {
+                "seat": f"S{i % 40}-{i}",
+                "price": i * 1.25,
+                "tags": ["general", "early", "Zürich ✓"],
+                "checked": i % 2 == 0,
+                "notes": None
+            }
+            for i in range(5000)
+        }
+    }
+}
+# large custom metadata payload
+
+
+
+def legacy(data: dict) -> bytes:
+    """
+    Legacy canonical form.
+
+    :param data: data to convert
+    :return: canonicalized JSON bytes
+    """
+
+    return json.dumps(data, separators=(",", ":"), sort_keys=True).encode()
+
+
+def rate(func, data: dict, seconds: float) -> float:
+    """
+    Measure how many times a canonicalizer runs per second.
+
+    :param func: canonicalizer function
+    :param data: payload to canonicalize
+    :param seconds: minimum measurement duration (in seconds)
+    :return: operations per second
+    """
+
+    count = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+
+    while time.perf_counter() < deadline:
+        func(data)
+        count += 1
+
+    return count / (time.perf_counter() - start)
+
+
+def main() -> None:
+    """
+    Benchmark entry point.
+    """
+
+    parser = argparse.ArgumentParser(description="ZETA canonical JSON benchmark")
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    print(f"{'payload':<10}{'bytes':>10}{'legacy/s':>12}{'canon/s':>12}{'speedup':>10}")
+
+    for name, data in (("small", SMALL_MESSAGE), ("large", LARGE_MESSAGE)):
+        legacy_rate = rate(legacy, data, args.seconds)
+        canon_rate = rate(canonicalize, data, args.seconds)
+
+        print(
+            f"{name:<10}{len(canonicalize(data)):>10}{legacy_rate:>12.0f}"
+            f"{canon_rate:>12.0f}{canon_rate / legacy_rate:>9.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
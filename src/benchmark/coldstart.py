@@ -0,0 +1,204 @@
+"""
+Cold start benchmark.
+
+Measures, in fresh interpreter processes, how long importing the server application
+takes ("python -X importtime", with the slowest modules) and how long it then takes to
+load the server key, and checks the total against a cold start budget:
+
+    python -m benchmark.coldstart --runs 5 --compare data/benchmarks/coldstart-old.json
+
+Connecting to Redis and PostgreSQL is not included (see the "startup_ms" figures of the
+"/ready" probe for those).  The script exits with a non-zero status when the median cold
+start exceeds the budget, and results are saved as JSON alongside the load test results.
+
+:author: Max Milazzo
+"""
+
+
+
+from benchmark import load
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# server source directory (benchmark subprocesses run from here)
+
+
+BUDGET = 1.0
+# cold start budget (in seconds) for importing the application and loading the key
+
+
+TOP_MODULES = 10
+# number of slowest modules reported
+
+
+TIMING_SCRIPT = """
+import json, time
+start = time.perf_counter()
+import server
+imported = time.perf_counter()
+from app.util import keys
+keys.load()
+loaded = time.perf_counter()
+print(json.dumps({"import": imported - start, "keys": loaded - imported}))
+"""
+# wall clock timing of a cold import followed by the server key load
+
+
+
+def import_profile() -> tuple[float, dict]:
+    """
+    Profile a cold import of the server application.
+
+    :return: total import time and per-module self import times (in seconds)
+    """
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import server"],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    total = 0.0
+    modules = {}
+
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+
+        own, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(own) / 1e6
+
+        if name.strip() == "server":
+            total = int(cumulative) / 1e6
+
+    return total, modules
+
+
+def wall_timing() -> dict:
+    """
+    Time a cold import and server key load without import profiling overhead.
+
+    :return: import and key load times (in seconds)
+    """
+
+    result = subprocess.run(
+        [sys.executable, "-c", TIMING_SCRIPT],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    """
+    Benchmark entry point.
+    """
+
+    parser = argparse.ArgumentParser(description="ZETA cold start benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=BUDGET)
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--compare", default=None)
+    args = parser.parse_args()
+
+    wall_timing()
+    # first run warms the file system cache and writes bytecode caches (and generates
+    # the server key if none exists yet)
+
+    profiles = [import_profile() for _ in range(args.runs)]
+    timings = [wall_timing() for _ in range(args.runs)]
+
+    modules = {}
+
+    for _, profile in profiles:
+        for name, seconds in profile.items():
+            modules.setdefault(name, []).append(seconds)
+
+    slowest = sorted(
+        ((name, statistics.median(values)) for name, values in modules.items()),
+        key=lambda item: item[1],
+        reverse=True
+    )[:TOP_MODULES]
+
+    summary = {
+        "import_profiled_ms": statistics.median(total for total, _ in profiles) * 1000,
+        "import_ms": statistics.median(timing["import"] for timing in timings) * 1000,
+        "keys_ms": statistics.median(timing["keys"] for timing in timings) * 1000
+    }
+    summary["cold_start_ms"] = summary["import_ms"] + summary["keys_ms"]
+
+    baseline = None
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["summary"]
+
+    header = f"{'measure':<22}{'ms':>10}"
+
+    if baseline:
+        header += f"{'baseline':>10}{'change':>9}"
+
+    print(header)
+
+    for key, value in summary.items():
+        line = f"{key:<22}{value:>10.1f}"
+
+        if baseline and baseline.get(key):
+            line += f"{baseline[key]:>10.1f}{value / baseline[key] - 1:>9.1%}"
+
+        print(line)
+
+    print("\nslowest modules (self import time):")
+
+    for name, seconds in slowest:
+        print(f"  {name:<50}{seconds * 1000:>8.1f} ms")
+
+    within = summary["cold_start_ms"] <= args.budget * 1000
+    print(
+        f"\ncold start {summary['cold_start_ms']:.1f} ms "
+        f"{'within' if within else 'OVER'} budget of {args.budget * 1000:.0f} ms"
+    )
+
+    output = args.output or os.path.join(
+        load.RESULTS_DIR,
+        time.strftime("coldstart-%Y%m%d-%H%M%S.json")
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "timestamp": time.time(),
+                "python": sys.version,
+                "budget_ms": args.budget * 1000,
+                "summary": summary,
+                "slowest_modules_ms": {
+                    name: seconds * 1000 for name, seconds in slowest
+                }
+            },
+            f,
+            indent=2
+        )
+
+    print(f"results saved to {output}")
+
+    if not within:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
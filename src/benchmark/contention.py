@@ -0,0 +1,246 @@
+"""
+Ticket state write contention benchmark.
+
+Runs N concurrent stampers against a single event directly through the storage layer
+(requires the configured PostgreSQL database):
+
+    python -m benchmark.contention --stampers 16 --tickets 8192 --layout spread
+    python -m benchmark.contention --stampers 16 --tickets 8192 --layout packed
+    python -m benchmark.contention --stampers 16 --tickets 8192 --layout single
+
+"spread" hands each stamper tickets on its own state page, while "packed" interleaves
+every stamper over the same pages (the worst case for the paged layout).  "single" is
+the baseline: the old layout, with the whole event state in one row (a scratch table
+shaped like the old "event_data" state column, updated with the old statement).
+
+:author: Max Milazzo
+"""
+
+
+
+from app.crypto import hash
+from app.crypto.symmetric import SKC
+from app.data.models.event import Event
+from app.data.models.ticket import REDEEMED_BYTE, STAMPED_BYTE
+from app.data.storage import connection, event_store, ticket_store
+from config import DATABASE_CREDS
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+from psycopg import conninfo
+from psycopg.rows import dict_row
+from psycopg_pool import ConnectionPool
+
+
+
+BASELINE_TABLE = "benchmark_state_rows"
+# scratch table holding the single-row baseline state (created and dropped per run)
+
+
+
+def assign(tickets: int, stampers: int, layout: str) -> list[list[int]]:
+    """
+    Split ticket numbers between stampers.
+
+    :param tickets: number of event tickets
+    :param stampers: number of concurrent stampers
+    :param layout: "spread" (page-aligned blocks), "packed" (interleaved), or
+        "single" (interleaved over the single-row baseline)
+    :return: ticket numbers for each stamper
+    """
+
+    if layout in ("packed", "single"):
+        return [list(range(i, tickets, stampers)) for i in range(stampers)]
+
+    per_stamper = tickets // stampers
+    per_stamper -= per_stamper % ticket_store.STATE_PAGE_SIZE
+
+    if per_stamper == 0:
+        raise Exception("not enough tickets for one state page per stamper")
+
+    return [
+        list(range(i * per_stamper, (i + 1) * per_stamper))
+        for i in range(stampers)
+    ]
+
+
+def create_baseline(event_id: str, tickets: int) -> None:
+    """
+    Create the single-row baseline state of an event.
+
+    :param event_id: unique event identifier
+    :param tickets: number of event tickets
+    """
+
+    with connection.pool.connection() as conn:
+        conn.execute(
+            f"""
+            CREATE TABLE {BASELINE_TABLE} (
+                event_id TEXT PRIMARY KEY,
+                state_bytes BYTEA NOT NULL,
+                FOREIGN KEY (event_id)
+                    REFERENCES events (id)
+                    ON DELETE CASCADE
+            );
+            """
+        )
+        # default column storage, as the old state column had
+
+        conn.execute(
+            f"""
+            INSERT INTO {BASELINE_TABLE} (event_id, state_bytes)
+            VALUES (%s, decode(repeat('00', %s), 'hex'));
+            """,
+            (event_id, tickets)
+        )
+
+
+def drop_baseline() -> None:
+    """
+    Drop the single-row baseline state table.
+    """
+
+    with connection.pool.connection() as conn:
+        conn.execute(f"DROP TABLE IF EXISTS {BASELINE_TABLE};")
+
+
+def advance_baseline(event_id: str, number: int, data: int, threshold: int) -> bool:
+    """
+    Set a ticket state byte in the single-row baseline (the statement used before state
+    was paged).
+
+    :param event_id: unique event identifier
+    :param number: 0-index ticket number
+    :param data: new data byte with state update applied
+    :param threshold: threshold value (current byte must be less than this to update)
+    :return: state update success status
+    """
+
+    with connection.pool.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                f"""
+                UPDATE {BASELINE_TABLE}
+                SET state_bytes = set_byte(state_bytes, %s, %s)
+                WHERE event_id = %s
+                    AND get_byte(state_bytes, %s) < %s
+                    AND %s < (
+                        SELECT issued
+                        FROM events
+                        WHERE id = %s
+                    );
+                """,
+                (number, data, event_id, number, threshold, number, event_id)
+            )
+
+            return cur.rowcount == 1
+
+
+def stamp_all(
+    advance: Callable[[str, int, int, int], bool],
+    event_id: str,
+    numbers: list[int]
+) -> list[float]:
+    """
+    Redeem and stamp a list of tickets, timing each state update.
+
+    :param advance: state update function (see ticket_store.advance_state)
+    :param event_id: unique event identifier
+    :param numbers: 0-index ticket numbers
+    :return: per-update latencies (in seconds)
+    """
+
+    latencies = []
+
+    for number in numbers:
+        for state_byte in (REDEEMED_BYTE, STAMPED_BYTE):
+            start = time.perf_counter()
+
+            if not advance(event_id, number, state_byte, state_byte):
+                raise Exception(f"state update failed for ticket {number}")
+
+            latencies.append(time.perf_counter() - start)
+
+    return latencies
+
+
+def main() -> None:
+    """
+    Benchmark entry point.
+    """
+
+    parser = argparse.ArgumentParser(description="ZETA state contention benchmark")
+    parser.add_argument("--stampers", type=int, default=16)
+    parser.add_argument("--tickets", type=int, default=8192)
+    parser.add_argument(
+        "--layout",
+        choices=("spread", "packed", "single"),
+        default="spread"
+    )
+    args = parser.parse_args()
+
+    connection.pool = ConnectionPool(
+        conninfo=conninfo.make_conninfo(**DATABASE_CREDS),
+        min_size=args.stampers,
+        max_size=args.stampers,
+        kwargs={"row_factory": dict_row}
+    )
+    # one connection per stamper so that pool waits do not mask row contention
+
+    event = Event(
+        name="Contention Benchmark",
+        description="State contention benchmark target",
+        tickets=args.tickets
+    )
+    event_store.create(event.model_dump(), SKC.key(), hash.generate_bytes("benchmark"))
+
+    with connection.pool.connection() as conn:
+        conn.execute("UPDATE events SET issued = tickets WHERE id = %s;", (event.id,))
+        # mark every ticket as issued
+
+    assignments = assign(args.tickets, args.stampers, args.layout)
+    advance = ticket_store.advance_state
+
+    try:
+        if args.layout == "single":
+            create_baseline(event.id, args.tickets)
+            advance = advance_baseline
+
+        start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=args.stampers) as pool:
+            results = list(
+                pool.map(
+                    lambda numbers: stamp_all(advance, event.id, numbers),
+                    assignments
+                )
+            )
+
+        elapsed = time.perf_counter() - start
+
+    finally:
+        if args.layout == "single":
+            drop_baseline()
+
+        event_store.delete(event.id)
+        connection.stop_pool()
+
+    latencies = sorted(latency for result in results for latency in result)
+
+    if args.layout == "single":
+        print(f"layout:      single (one {args.tickets}-byte state row, baseline)")
+
+    else:
+        print(f"layout:      {args.layout} (page size {ticket_store.STATE_PAGE_SIZE})")
+
+    print(f"stampers:    {args.stampers}")
+    print(f"updates:     {len(latencies)}")
+    print(f"throughput:  {len(latencies) / elapsed:.1f} updates/s")
+    print(f"p50:         {latencies[len(latencies) // 2] * 1000:.2f} ms")
+    print(f"p99:         {latencies[int(len(latencies) * 0.99)] * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,150 @@
+"""
+Request latency under concurrency benchmark.
+
+Run against a live server once per execution mode (see "EXECUTION_MODE" in config.py)
+to compare tail latency before and after moving blocking work off the event loop, naming
+the mode the server was started with (results are labeled with it, since this client
+cannot see the server's configuration):
+
+    python -m benchmark.latency --mode threaded --requests 1000 --concurrency 32
+
+Every request is signed just before it is sent, so that no request timestamp falls
+outside the server's timestamp allowance however long the run takes.  Signing is not
+included in the measured latency, but it is included in the run time (and throughput).
+
+:author: Max Milazzo
+"""
+
+
+
+from app.API.models.base import Auth
+from app.API.models.endpoints import *
+from app.crypto.asymmetric import AKC
+from app.data.models.event import Event
+
+import argparse
+import requests
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+
+SERVER_URL = "http://localhost:8000"
+# server URL
+
+
+CLIENT_KEY_SIZE = 2048
+# benchmark client key size (in bits)
+# (smaller than the server key so that client-side signing does not dominate the run)
+
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile of a sample set.
+
+    :param samples: sorted latency samples
+    :param fraction: percentile fraction (0-1)
+    :return: percentile value
+    """
+
+    index = min(len(samples) - 1, max(0, int(round(fraction * len(samples))) - 1))
+
+    return samples[index]
+
+
+def create_event(client: AKC) -> str:
+    """
+    Create the event used as the search target.
+
+    :param client: client signing cipher
+    :return: new event ID
+    """
+
+    req = Auth[CreateRequest].load(
+        CreateRequest(
+            event=Event(
+                name="Benchmark Event",
+                description="Latency benchmark target"
+            )
+        ),
+        client
+    )
+    res = requests.post(SERVER_URL + "/create", json=req.model_dump())
+    res.raise_for_status()
+
+    return res.json()["data"]["content"]["event_id"]
+
+
+def timed_post(
+    session: requests.Session,
+    client: AKC,
+    event_id: str
+) -> tuple[float, int]:
+    """
+    Sign and send one search request and time it (excluding signing).
+
+    :param session: HTTP session
+    :param client: client signing cipher
+    :param event_id: searched event ID
+    :return: latency (in seconds), HTTP status code
+    """
+
+    body = Auth[SearchRequest].load(
+        SearchRequest(text=event_id, mode="id"),
+        client
+    ).model_dump()
+    # sign when sent (a request signed up front could be stale by the time it is sent)
+
+    start = time.perf_counter()
+    res = session.post(SERVER_URL + "/search", json=body)
+
+    return time.perf_counter() - start, res.status_code
+
+
+def main() -> None:
+    """
+    Benchmark entry point.
+    """
+
+    parser = argparse.ArgumentParser(description="ZETA latency benchmark")
+    parser.add_argument("--mode", required=True, choices=("threaded", "inline"))
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    client = AKC(key_size=CLIENT_KEY_SIZE)
+    event_id = create_event(client)
+
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=args.concurrency)
+    session.mount("http://", adapter)
+
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(
+            pool.map(
+                lambda _: timed_post(session, client, event_id),
+                range(args.requests)
+            )
+        )
+
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for latency, _ in results)
+    errors = sum(1 for _, status in results if status != 200)
+
+    print(f"mode:        {args.mode}")
+    print(f"requests:    {args.requests} @ concurrency {args.concurrency}")
+    print(f"throughput:  {args.requests / elapsed:.1f} req/s")
+    print(f"errors:      {errors}")
+    print(f"mean:        {statistics.mean(latencies) * 1000:.2f} ms")
+
+    for label, fraction in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99)):
+        print(f"{label}:         {percentile(latencies, fraction) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
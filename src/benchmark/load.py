@@ -0,0 +1,604 @@
+"""
+Concurrent load test.
+
+Drives a running ZETA server (with its PostgreSQL database and Redis) with a weighted mix
+of create / register / transfer / redeem / validate / search requests from many
+concurrent clients, then reports per-operation throughput, latency percentiles, and error
+rates and saves them as JSON so that runs can be compared:
+
+    python -m benchmark.load --url http://localhost:8000 --concurrency 64 --seconds 60 \
+        --mix register=30,transfer=10,redeem=20,validate=35,search=4,create=1 \
+        --compare data/benchmarks/load-baseline.json
+
+Client keys are generated before the run and every request is signed when it is sent
+(fresh nonce and timestamp), as real clients do.  Responses are not verified, so that
+client-side signature checks do not limit the offered load; a single client process is
+still bound by its own request signing, so run several instances to saturate a large
+deployment.
+
+:author: Max Milazzo
+"""
+
+
+
+from app.API.models.base import Auth
+from app.API.models.endpoints import *
+from app.API.models.endpoints.transfer import Transfer
+from app.crypto.asymmetric import ALGORITHMS
+from app.data.models.event import TICKET_LIMIT, Event
+
+import argparse
+import asyncio
+import httpx
+import json
+import os
+import random
+import time
+
+
+
+DEFAULT_MIX = "register=30,transfer=10,redeem=20,validate=35,search=4,create=1"
+# default operation weights
+
+
+RESULTS_DIR = os.path.join("data", "benchmarks")
+# default results directory
+
+
+
+class Tickets:
+    """
+    Tickets issued during the run, available to later operations.
+    """
+
+    def __init__(self) -> None:
+        """
+        Ticket pool initialization.
+        """
+
+        self.held = []
+        # (event ID, holder index, ticket) tickets that can be transferred or redeemed
+
+        self.redeemed = []
+        # (event ID, holder index, ticket) redeemed tickets (validation only)
+
+
+    @staticmethod
+    def take(tickets: list) -> tuple | None:
+        """
+        Remove a random ticket from a list.
+
+        :param tickets: ticket list
+        :return: removed ticket or None if the list is empty
+        """
+
+        if not tickets:
+            return None
+
+        index = random.randrange(len(tickets))
+        tickets[index], tickets[-1] = tickets[-1], tickets[index]
+
+        return tickets.pop()
+
+
+
+class Recorder:
+    """
+    Per-operation latency and status recorder.
+    """
+
+    def __init__(self, record_after: float) -> None:
+        """
+        Recorder initialization.
+
+        :param record_after: perf_counter time before which results are discarded
+            (warm-up)
+        """
+
+        self.record_after = record_after
+        self.latencies = {}
+        self.statuses = {}
+
+
+    def record(self, operation: str, start: float, status: int | str) -> None:
+        """
+        Record a completed request.
+
+        :param operation: operation name
+        :param start: request perf_counter start time
+        :param status: HTTP status code or transport error name
+        """
+
+        if start < self.record_after:
+            return
+
+        self.latencies.setdefault(operation, []).append(time.perf_counter() - start)
+        statuses = self.statuses.setdefault(operation, {})
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+
+
+class Run:
+    """
+    Load test state shared by every client task.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        users: list,
+        recorder: Recorder
+    ) -> None:
+        """
+        Load test state initialization.
+
+        :param client: HTTP client
+        :param users: client signing keys
+        :param recorder: result recorder
+        """
+
+        self.client = client
+        self.users = users
+        self.recorder = recorder
+        self.tickets = Tickets()
+        self.events = []
+        self.name = f"Load test {random.getrandbits(32):08x}"
+
+
+    async def create_event(self) -> str | None:
+        """
+        Create an event owned by a random user.
+
+        :return: new event ID or None if creation failed
+        """
+
+        content = await post(
+            self.client, self.recorder, "create", "/create",
+            Auth[CreateRequest].load(
+                CreateRequest(
+                    event=Event(
+                        name=self.name,
+                        description="Load test event",
+                        tickets=TICKET_LIMIT,
+                        restricted=False,
+                        transfer_limit=63,
+                        enable_flags=False
+                    )
+                ),
+                random.choice(self.users)
+            )
+        )
+
+        return content["event_id"] if content is not None else None
+
+
+
+def percentile(values: list[float], q: float) -> float:
+    """
+    Get a percentile of sorted values.
+
+    :param values: sorted values
+    :param q: percentile (0 to 1)
+    :return: percentile value
+    """
+
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def parse_mix(text: str) -> dict[str, int]:
+    """
+    Parse an operation mix.
+
+    :param text: comma-separated operation=weight pairs
+    :return: operation weights
+    """
+
+    mix = {}
+
+    for item in text.split(","):
+        operation, weight = item.split("=")
+        mix[operation.strip()] = int(weight)
+
+    unknown = set(mix) - set(OPERATIONS)
+
+    if unknown:
+        raise Exception(f"unknown operations: {', '.join(sorted(unknown))}")
+
+    return mix
+
+
+async def post(
+    client: httpx.AsyncClient,
+    recorder: Recorder,
+    operation: str,
+    path: str,
+    packet: Auth
+) -> dict | None:
+    """
+    Send a signed request and record its outcome.
+
+    :param client: HTTP client
+    :param recorder: result recorder
+    :param operation: operation name
+    :param path: endpoint path
+    :param packet: signed request packet
+    :return: response content if successful, otherwise None
+    """
+
+    body = packet.model_dump()
+    start = time.perf_counter()
+
+    try:
+        response = await client.post(path, json=body)
+
+    except httpx.HTTPError as e:
+        recorder.record(operation, start, type(e).__name__)
+        return None
+
+    recorder.record(operation, start, response.status_code)
+
+    if response.status_code != 200:
+        return None
+
+    return response.json()["data"]["content"]
+
+
+async def create(run: Run) -> None:
+    """
+    Create an event.
+
+    :param run: load test state
+    """
+
+    event_id = await run.create_event()
+
+    if event_id is not None:
+        run.events.append(event_id)
+
+
+async def register(run: Run) -> None:
+    """
+    Register a random user for a random event.
+
+    :param run: load test state
+    """
+
+    event_id = random.choice(run.events)
+    holder = random.randrange(len(run.users))
+
+    content = await post(
+        run.client, run.recorder, "register", "/register",
+        Auth[RegisterRequest].load(RegisterRequest(event_id=event_id), run.users[holder])
+    )
+
+    if content is not None:
+        run.tickets.held.append((event_id, holder, content["ticket"]))
+
+
+async def transfer(run: Run) -> None:
+    """
+    Transfer a held ticket to another user (registers instead if none is held).
+
+    :param run: load test state
+    """
+
+    held = Tickets.take(run.tickets.held)
+
+    if held is None:
+        return await register(run)
+
+    event_id, holder, ticket = held
+    recipient = random.randrange(len(run.users))
+
+    content = await post(
+        run.client, run.recorder, "transfer", "/transfer",
+        Auth[TransferRequest].load(
+            TransferRequest(
+                event_id=event_id,
+                transfer=Auth[Transfer].load(
+                    Transfer(
+                        ticket=ticket,
+                        transfer_public_key=run.users[recipient].public_key
+                    ),
+                    run.users[holder]
+                )
+            ),
+            run.users[recipient]
+        )
+    )
+
+    if content is not None:
+        run.tickets.held.append((event_id, recipient, content["ticket"]))
+
+
+async def redeem(run: Run) -> None:
+    """
+    Redeem a held ticket (registers instead if none is held).
+
+    :param run: load test state
+    """
+
+    held = Tickets.take(run.tickets.held)
+
+    if held is None:
+        return await register(run)
+
+    event_id, holder, ticket = held
+
+    content = await post(
+        run.client, run.recorder, "redeem", "/redeem",
+        Auth[RedeemRequest].load(
+            RedeemRequest(event_id=event_id, ticket=ticket),
+            run.users[holder]
+        )
+    )
+
+    if content is not None:
+        run.tickets.redeemed.append(held)
+
+
+async def validate(run: Run) -> None:
+    """
+    Validate a random held or redeemed ticket (registers instead if none exist).
+
+    :param run: load test state
+    """
+
+    total = len(run.tickets.held) + len(run.tickets.redeemed)
+
+    if total == 0:
+        return await register(run)
+
+    index = random.randrange(total)
+    event_id, holder, ticket = (
+        run.tickets.held[index] if index < len(run.tickets.held)
+        else run.tickets.redeemed[index - len(run.tickets.held)]
+    )
+
+    await post(
+        run.client, run.recorder, "validate", "/validate",
+        Auth[ValidateRequest].load(
+            ValidateRequest(
+                event_id=event_id,
+                ticket=ticket,
+                check_public_key=run.users[holder].public_key
+            ),
+            random.choice(run.users)
+        )
+    )
+
+
+async def search(run: Run) -> None:
+    """
+    Search for events by name.
+
+    :param run: load test state
+    """
+
+    await post(
+        run.client, run.recorder, "search", "/search",
+        Auth[SearchRequest].load(
+            SearchRequest(text=run.name, mode="text"),
+            random.choice(run.users)
+        )
+    )
+
+
+OPERATIONS = {
+    "create": create,
+    "register": register,
+    "transfer": transfer,
+    "redeem": redeem,
+    "validate": validate,
+    "search": search
+}
+# operation name -> operation coroutine
+
+
+
+async def client_task(run: Run, operations: list, weights: list, deadline: float) -> None:
+    """
+    Run weighted random operations until the deadline.
+
+    :param run: load test state
+    :param operations: operation coroutines
+    :param weights: operation weights
+    :param deadline: perf_counter deadline
+    """
+
+    while time.perf_counter() < deadline:
+        await random.choices(operations, weights)[0](run)
+
+
+async def drive(args: argparse.Namespace, users: list) -> tuple[Recorder, float]:
+    """
+    Set up events and run the load test.
+
+    :param args: command line arguments
+    :param users: client signing keys
+    :return: result recorder, measured duration (in seconds)
+    """
+
+    mix = parse_mix(args.mix)
+    limits = httpx.Limits(
+        max_connections=args.concurrency,
+        max_keepalive_connections=args.concurrency
+    )
+
+    async with httpx.AsyncClient(
+        base_url=args.url,
+        limits=limits,
+        timeout=args.timeout
+    ) as client:
+        run = Run(client, users, Recorder(float("inf")))
+
+        for _ in range(args.events):
+            event_id = await run.create_event()
+
+            if event_id is None:
+                raise Exception("load test event creation failed")
+
+            run.events.append(event_id)
+            # events with the maximum ticket count for registrations
+
+        start = time.perf_counter()
+        run.recorder.record_after = start + args.warmup
+        deadline = start + args.warmup + args.seconds
+
+        await asyncio.gather(*(
+            client_task(
+                run,
+                [OPERATIONS[operation] for operation in mix],
+                list(mix.values()),
+                deadline
+            )
+            for _ in range(args.concurrency)
+        ))
+
+        return run.recorder, time.perf_counter() - run.recorder.record_after
+
+
+def summarize(recorder: Recorder, duration: float) -> dict:
+    """
+    Summarize recorded results.
+
+    :param recorder: result recorder
+    :param duration: measured duration (in seconds)
+    :return: per-operation and overall results
+    """
+
+    results = {}
+    everything = []
+
+    for operation in sorted(recorder.latencies):
+        latencies = sorted(recorder.latencies[operation])
+        statuses = recorder.statuses[operation]
+        errors = sum(count for status, count in statuses.items() if status != "200")
+        everything.extend(latencies)
+
+        results[operation] = {
+            "requests": len(latencies),
+            "throughput": len(latencies) / duration,
+            "error_rate": errors / len(latencies),
+            "p50_ms": percentile(latencies, 0.50) * 1e3,
+            "p95_ms": percentile(latencies, 0.95) * 1e3,
+            "p99_ms": percentile(latencies, 0.99) * 1e3,
+            "max_ms": latencies[-1] * 1e3,
+            "statuses": statuses
+        }
+
+    everything.sort()
+    errors = sum(
+        count for statuses in recorder.statuses.values()
+        for status, count in statuses.items() if status != "200"
+    )
+
+    if everything:
+        results["total"] = {
+            "requests": len(everything),
+            "throughput": len(everything) / duration,
+            "error_rate": errors / len(everything),
+            "p50_ms": percentile(everything, 0.50) * 1e3,
+            "p95_ms": percentile(everything, 0.95) * 1e3,
+            "p99_ms": percentile(everything, 0.99) * 1e3,
+            "max_ms": everything[-1] * 1e3
+        }
+
+    return results
+
+
+def report(results: dict, baseline: dict | None) -> None:
+    """
+    Print a results table (with changes against a baseline run, if given).
+
+    :param results: per-operation results
+    :param baseline: per-operation results of a previous run or None
+    """
+
+    print(
+        f"{'operation':<10}{'requests':>10}{'req/s':>10}{'errors':>9}{'p50 ms':>9}"
+        f"{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+        + (f"{'req/s vs base':>15}{'p99 vs base':>13}" if baseline else "")
+    )
+
+    for operation, result in results.items():
+        line = (
+            f"{operation:<10}{result['requests']:>10}{result['throughput']:>10.1f}"
+            f"{result['error_rate']:>9.2%}{result['p50_ms']:>9.1f}"
+            f"{result['p95_ms']:>9.1f}{result['p99_ms']:>9.1f}{result['max_ms']:>9.1f}"
+        )
+
+        if baseline and operation in baseline:
+            before = baseline[operation]
+            line += (
+                f"{result['throughput'] / before['throughput'] - 1:>+15.1%}"
+                f"{result['p99_ms'] / before['p99_ms'] - 1:>+13.1%}"
+            )
+
+        print(line)
+
+
+def main() -> None:
+    """
+    Load test entry point.
+    """
+
+    parser = argparse.ArgumentParser(description="ZETA concurrent load test")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--warmup", type=float, default=5.0)
+    parser.add_argument("--users", type=int, default=256)
+    parser.add_argument("--events", type=int, default=4)
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument("--algorithm", default="ed25519", choices=sorted(ALGORITHMS))
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--compare", default=None)
+    args = parser.parse_args()
+
+    parse_mix(args.mix)
+    # fail on a malformed mix before generating keys
+
+    start = time.perf_counter()
+    users = [ALGORITHMS[args.algorithm]() for _ in range(args.users)]
+    print(f"generated {args.users} {args.algorithm} client keys in "
+          f"{time.perf_counter() - start:.1f}s")
+
+    recorder, duration = asyncio.run(drive(args, users))
+    results = summarize(recorder, duration)
+
+    baseline = None
+
+    if args.compare is not None:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    report(results, baseline)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR,
+        time.strftime("load-%Y%m%d-%H%M%S.json")
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "timestamp": time.time(),
+                "config": {
+                    key: value for key, value in vars(args).items()
+                    if key not in ("output", "compare")
+                },
+                "duration": duration,
+                "results": results
+            },
+            f,
+            indent=2
+        )
+
+    print(f"results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
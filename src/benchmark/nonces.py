@@ -0,0 +1,246 @@
+"""
+In-memory nonce store multithreaded stress test.
+
+Hammers the nonce store from many threads for longer than the nonce retention window,
+checking that every replayed nonce is accepted exactly once and that expired
+generations are dropped, and reports per-check tail latency against the previous
+global-lock store (full expiration scan every cleanup interval):
+
+    python -m benchmark.nonces --threads 16 --seconds 30
+
+:author: Max Milazzo
+"""
+
+
+
+from app.API.models.base.auth import (
+    NONCE_BUCKET_WIDTH, NONCE_STORE_SHARDS, TIMESTAMP_ERROR, TTL_SECURITY_PAD
+)
+from app.util.nonce import NonceStore
+
+import argparse
+import math
+import random
+import sys
+import threading
+import time
+import uuid
+
+
+
+RETENTION = TIMESTAMP_ERROR + TTL_SECURITY_PAD
+# nonce retention window (in seconds)
+
+
+REPLAY_INTERVAL = 64
+# every Nth check replays a packet shared by all threads
+
+
+REPLAY_PACKETS = 4096
+# number of shared replay packets (timestamps spread over the run)
+
+
+
+class LockedStore:
+    """
+    Previous global-lock nonce store (baseline).
+    """
+
+    CLEANUP_INTERVAL = 10
+    # full expiration scan interval (in seconds)
+
+
+    def __init__(self) -> None:
+        """
+        Baseline store initialization.
+        """
+
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.next_cleanup = time.time() + self.CLEANUP_INTERVAL
+
+
+    def add(self, nonce: str, timestamp: float) -> bool:
+        """
+        Record a nonce if it has not been seen.
+
+        :param nonce: request nonce
+        :param timestamp: request epoch timestamp
+        :return: True if the nonce is new and False if it is a repeat
+        """
+
+        with self.lock:
+            if nonce in self.entries:
+                return False
+
+            self.entries[nonce] = timestamp
+            now = time.time()
+
+            if self.next_cleanup <= now:
+                expired = [
+                    key for key, value in self.entries.items()
+                    if now > value + RETENTION
+                ]
+
+                for key in expired:
+                    del self.entries[key]
+
+                self.next_cleanup = now + self.CLEANUP_INTERVAL
+
+            return True
+
+
+    def __len__(self) -> int:
+        """
+        Get the number of currently tracked nonces.
+
+        :return: tracked nonce count
+        """
+
+        return len(self.entries)
+
+
+
+def hammer(
+    store,
+    deadline: float,
+    replays: list[tuple[str, float]],
+    accepted: list[int]
+) -> list[float]:
+    """
+    Check fresh (and periodically replayed) nonces until the deadline.
+
+    :param store: nonce store under test
+    :param deadline: perf_counter deadline
+    :param replays: (nonce, timestamp) packets shared by all threads, in timestamp
+        order and spaced evenly over the run
+    :param accepted: replay acceptance counters (owned by this thread)
+    :return: per-check latencies (in seconds)
+    """
+
+    latencies = []
+    count = 0
+    spacing = replays[1][1] - replays[0][1]
+
+    while time.perf_counter() < deadline:
+        count += 1
+        now = time.time()
+
+        if count % REPLAY_INTERVAL == 0:
+            low = (now - TIMESTAMP_ERROR - replays[0][1]) / spacing
+            high = (now + TIMESTAMP_ERROR - replays[0][1]) / spacing
+            index = random.randint(
+                max(0, math.ceil(low)),
+                min(len(replays) - 1, math.floor(high))
+            )
+            nonce, timestamp = replays[index]
+            # replay a shared packet that still passes the timestamp check
+
+        else:
+            index = None
+            nonce = str(uuid.uuid4())
+            timestamp = now + random.uniform(-TIMESTAMP_ERROR, TIMESTAMP_ERROR)
+            # client clocks spread over the whole accepted skew window
+
+        start = time.perf_counter()
+        new = store.add(nonce, timestamp)
+        latencies.append(time.perf_counter() - start)
+
+        if index is not None and new:
+            accepted[index] += 1
+
+        elif index is None and not new:
+            raise Exception(f"fresh nonce rejected: {nonce}")
+
+    return latencies
+
+
+def run(store, threads: int, seconds: float) -> tuple[list[float], int, int]:
+    """
+    Stress a nonce store from several threads.
+
+    :param store: nonce store under test
+    :param threads: number of concurrent threads
+    :param seconds: run duration (in seconds)
+    :return: sorted latencies, replays accepted more than once, peak tracked nonces
+    """
+
+    start = time.time()
+    replays = [
+        (str(uuid.uuid4()), start + seconds * i / REPLAY_PACKETS)
+        for i in range(REPLAY_PACKETS + 1)
+    ]
+    accepted = [[0] * len(replays) for _ in range(threads)]
+    # per-thread counters (so that no two threads increment the same slot)
+
+    results = [None] * threads
+    deadline = time.perf_counter() + seconds
+    peak = 0
+
+    def worker(i: int) -> None:
+        results[i] = hammer(store, deadline, replays, accepted[i])
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+
+    for thread in workers:
+        thread.start()
+
+    while any(thread.is_alive() for thread in workers):
+        peak = max(peak, len(store))
+        time.sleep(0.25)
+
+    for thread in workers:
+        thread.join()
+
+    if any(result is None for result in results):
+        raise Exception("stress worker failed")
+
+    errors = sum(
+        1 for i in range(len(replays))
+        if sum(counts[i] for counts in accepted) > 1
+    )
+    # a replayed packet must never be accepted twice
+
+    return sorted(latency for result in results for latency in result), errors, peak
+
+
+def main() -> None:
+    """
+    Stress test entry point.
+    """
+
+    parser = argparse.ArgumentParser(description="ZETA nonce store stress test")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=2 * RETENTION + 5)
+    args = parser.parse_args()
+
+    if args.seconds <= RETENTION:
+        print(f"warning: run shorter than the {RETENTION}s retention window "
+              "(expiration is not exercised)")
+
+    print(f"{'store':<10}{'checks':>10}{'checks/s':>12}{'p50 us':>10}{'p99 us':>10}"
+          f"{'max ms':>10}{'peak':>10}{'replays':>9}")
+
+    failed = False
+
+    for name, store in (
+        ("locked", LockedStore()),
+        ("sharded", NonceStore(RETENTION, NONCE_STORE_SHARDS, NONCE_BUCKET_WIDTH))
+    ):
+        latencies, errors, peak = run(store, args.threads, args.seconds)
+        failed |= errors > 0
+
+        print(
+            f"{name:<10}{len(latencies):>10}{len(latencies) / args.seconds:>12.0f}"
+            f"{latencies[len(latencies) // 2] * 1e6:>10.1f}"
+            f"{latencies[int(len(latencies) * 0.99)] * 1e6:>10.1f}"
+            f"{latencies[-1] * 1e3:>10.2f}{peak:>10}"
+            f"{'FAIL' if errors else 'ok':>9}"
+        )
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
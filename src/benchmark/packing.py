@@ -0,0 +1,105 @@
+"""
+Bulk ticket packing benchmark.
+
+Measures how long packing one bulk registration batch takes in the request thread and
+across worker process pools of several sizes (including the cost of sending tickets to
+and from the workers), to decide whether "PACK_PROCESSES" should be enabled on a given
+machine:
+
+    python -m benchmark.packing --tickets 1024 --processes 0,1,2,4 --seconds 2
+
+A pool only pays off when its speedup holds up with the cores each server process would
+actually get (under launch.py, the cores are divided among the workers).
+
+:author: Max Milazzo
+"""
+
+
+
+from app.API.models.endpoints.register import BULK_REGISTER_LIMIT
+from app.crypto.asymmetric import ALGORITHMS
+from app.crypto.symmetric import SKC
+from app.data.models.ticket import Ticket
+from app.util import executor
+from benchmark.signatures import rate
+
+import argparse
+import os
+import uuid
+
+
+
+def make_tickets(count: int) -> list[Ticket]:
+    """
+    Build a synthetic bulk registration batch.
+
+    :param count: number of tickets
+    :return: ticket models
+    """
+
+    event_id = str(uuid.uuid4())
+    event_key = SKC.key()
+
+    return [
+        Ticket(
+            event_id=event_id,
+            public_key=ALGORITHMS["ed25519"]().public_key,
+            number=number,
+            version=0,
+            transfer_limit=63,
+            metadata={"seat": f"A{number}", "tier": "general"},
+            event_key=event_key
+        )
+        for number in range(count)
+    ]
+
+
+def main() -> None:
+    """
+    Benchmark entry point.
+    """
+
+    parser = argparse.ArgumentParser(description="ZETA bulk ticket packing benchmark")
+    parser.add_argument("--tickets", type=int, default=BULK_REGISTER_LIMIT)
+    parser.add_argument(
+        "--processes",
+        default=",".join(
+            str(n) for n in sorted({0, 1, 2, 4, os.cpu_count() or 1})
+        )
+    )
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    counts = [int(n) for n in args.processes.split(",")]
+    counts = [0] + [n for n in counts if n != 0]
+    # in-thread packing is always measured first, as the speedup baseline
+
+    tickets = make_tickets(args.tickets)
+    baseline = None
+
+    print(f"{args.tickets} tickets per batch, {os.cpu_count()} cores")
+    print(f"{'processes':>10}{'batch ms':>12}{'tickets/s':>12}{'speedup':>10}")
+
+    for processes in counts:
+        executor.start_process_pool(processes)
+
+        try:
+            Ticket.pack_many(tickets)
+            # start the worker processes and warm them up outside the measurement
+
+            batches = rate(lambda: Ticket.pack_many(tickets), args.seconds)
+
+        finally:
+            executor.stop_process_pool()
+
+        if baseline is None:
+            baseline = batches
+
+        print(
+            f"{processes:>10}{1000 / batches:>12.1f}{batches * args.tickets:>12.0f}"
+            f"{batches / baseline:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
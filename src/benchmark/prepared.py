@@ -0,0 +1,176 @@
+"""
+Prepared statement benchmark.
+
+Creates a synthetic event in the configured PostgreSQL database, then times each storage
+query on the redeem / validate path through the storage layer itself, once on a
+connection that sends every statement as plain SQL text and once on a connection that
+prepares statements server-side (the pool configuration used by the server):
+
+    python -m benchmark.prepared --iterations 2000
+
+The synthetic event is removed when the benchmark finishes.
+
+:author: Max Milazzo
+"""
+
+
+
+from app.crypto import hash
+from app.data.storage import connection, event_store, permissions_store, ticket_store
+from config import DATABASE_CREDS
+
+import argparse
+import os
+import statistics
+import time
+import uuid
+from psycopg import conninfo
+from psycopg.rows import dict_row
+from psycopg_pool import ConnectionPool
+
+
+
+TICKETS = 4096
+# synthetic event ticket count
+
+
+BATCH = 32
+# tickets per batched state lookup
+
+
+
+def open_pool(prepare_threshold: int | None) -> ConnectionPool:
+    """
+    Open a single-connection pool.
+
+    :param prepare_threshold: psycopg prepare threshold (None never prepares)
+    :return: database connection pool
+    """
+
+    pool = ConnectionPool(
+        conninfo=conninfo.make_conninfo(**DATABASE_CREDS),
+        min_size=1,
+        max_size=1,
+        kwargs={
+            "row_factory": dict_row,
+            "prepare_threshold": prepare_threshold
+        }
+    )
+    pool.wait()
+
+    return pool
+
+
+def queries(event_id: str, owner_hash: bytes) -> dict:
+    """
+    Build the redeem / validate path storage calls.
+
+    :param event_id: synthetic event identifier
+    :param owner_hash: synthetic event owner public key hash
+    :return: query name -> call taking a ticket number
+    """
+
+    return {
+        "load_event": lambda _: event_store.load_event(event_id),
+        "load_event_key": lambda _: event_store.load_event_key(event_id),
+        "load_access": lambda _: permissions_store.load_access(event_id, owner_hash),
+        "load_state_byte": lambda n: ticket_store.load_state_byte(event_id, n),
+        "load_state_bytes": lambda n: ticket_store.load_state_bytes(
+            event_id, [(n + i) % TICKETS for i in range(BATCH)]
+        ),
+        "transition_state": lambda n: ticket_store.transition_state(event_id, n, 0, 0),
+        # locks and rewrites the state page without changing the ticket
+        "get_flag": lambda n: ticket_store.get_flag(event_id, n)
+    }
+
+
+def time_query(call, iterations: int) -> list[float]:
+    """
+    Time a storage call over several ticket numbers.
+
+    :param call: storage call taking a ticket number
+    :param iterations: number of calls
+    :return: per-call latencies (in seconds)
+    """
+
+    latencies = []
+
+    for i in range(iterations):
+        number = (i * 7919) % TICKETS
+        start = time.perf_counter()
+        call(number)
+        latencies.append(time.perf_counter() - start)
+
+    return latencies
+
+
+def main() -> None:
+    """
+    Benchmark entry point.
+    """
+
+    parser = argparse.ArgumentParser(description="ZETA prepared statement benchmark")
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    event_id = f"benchmark-prepared-{uuid.uuid4().hex}"
+    owner_hash = hash.generate_bytes(event_id)
+    now = time.time()
+
+    pools = {"text": open_pool(None), "prepared": open_pool(0)}
+    connection.pool = pools["text"]
+
+    event_store.create(
+        {
+            "id": event_id,
+            "name": "Prepared statement benchmark",
+            "description": None,
+            "tickets": TICKETS,
+            "issued": 0,
+            "start": now,
+            "finish": now + 86400,
+            "restricted": False,
+            "transfer_limit": 0,
+            "enable_flags": True
+        },
+        os.urandom(32),
+        owner_hash
+    )
+    ticket_store.issue(event_id, TICKETS)
+
+    try:
+        calls = queries(event_id, owner_hash)
+        results = {}
+
+        for mode, pool in pools.items():
+            connection.pool = pool
+
+            for name, call in calls.items():
+                call(0)
+                # first call (prepares the statement on the prepared connection)
+
+                results[name, mode] = statistics.median(
+                    time_query(call, args.iterations)
+                )
+
+        print(f"{'query':<20}{'text us':>10}{'prepared us':>14}{'saving':>10}")
+
+        for name in calls:
+            text = results[name, "text"] * 1e6
+            prepared = results[name, "prepared"] * 1e6
+
+            print(
+                f"{name:<20}{text:>10.1f}{prepared:>14.1f}"
+                f"{(text - prepared) / text:>10.1%}"
+            )
+
+    finally:
+        connection.pool = pools["text"]
+        event_store.delete(event_id)
+
+        for pool in pools.values():
+            pool.close()
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,157 @@
+"""
+Worker scaling benchmark.
+
+Starts the pre-fork launcher with increasing worker counts (against the configured
+PostgreSQL database and Redis), drives each deployment with the concurrent load test,
+and reports requests per second against worker count:
+
+    python -m benchmark.scaling --workers 1,2,4,8 --seconds 20 --concurrency 128
+
+Results are saved as JSON alongside the load test results.
+
+:author: Max Milazzo
+"""
+
+
+
+from app.crypto.asymmetric import ALGORITHMS
+from benchmark import load
+
+import argparse
+import asyncio
+import httpx
+import json
+import os
+import subprocess
+import sys
+import time
+
+
+
+LAUNCHER = os.path.join(os.path.dirname(os.path.dirname(__file__)), "launch.py")
+# pre-fork launcher script
+
+
+READY_TIMEOUT = 60
+# maximum time (in seconds) to wait for a launched deployment to accept requests
+
+
+
+def wait_ready(url: str, process: subprocess.Popen) -> None:
+    """
+    Wait until a launched deployment reports every dependency ready.
+
+    :param url: server URL
+    :param process: launcher process
+    """
+
+    deadline = time.monotonic() + READY_TIMEOUT
+
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise Exception(f"launcher exited with status {process.returncode}")
+
+        try:
+            httpx.get(url + "/ready", timeout=1).raise_for_status()
+            return
+
+        except httpx.HTTPError:
+            time.sleep(0.25)
+
+    raise Exception("deployment did not become ready")
+
+
+def main() -> None:
+    """
+    Benchmark entry point.
+    """
+
+    parser = argparse.ArgumentParser(description="ZETA worker scaling benchmark")
+    parser.add_argument("--workers", default=None)
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--concurrency", type=int, default=128)
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--warmup", type=float, default=5.0)
+    parser.add_argument("--users", type=int, default=256)
+    parser.add_argument("--events", type=int, default=4)
+    parser.add_argument("--mix", default=load.DEFAULT_MIX)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    counts = sorted({1 << i for i in range(cores.bit_length())} | {cores})
+    # powers of two up to (and including) the core count by default
+
+    if args.workers:
+        counts = [int(count) for count in args.workers.split(",")]
+
+    url = f"http://127.0.0.1:{args.port}"
+    users = [ALGORITHMS["ed25519"]() for _ in range(args.users)]
+    runs = []
+
+    print(f"{'workers':>8}{'req/s':>10}{'per worker':>12}{'p50 ms':>9}{'p99 ms':>9}"
+          f"{'errors':>9}")
+
+    for count in counts:
+        process = subprocess.Popen(
+            [
+                sys.executable, LAUNCHER,
+                "--workers", str(count),
+                "--port", str(args.port)
+            ],
+            cwd=os.path.dirname(LAUNCHER),
+            stdout=subprocess.DEVNULL
+        )
+
+        try:
+            wait_ready(url, process)
+
+            options = argparse.Namespace(
+                url=url,
+                concurrency=args.concurrency,
+                seconds=args.seconds,
+                warmup=args.warmup,
+                events=args.events,
+                mix=args.mix,
+                timeout=30.0
+            )
+            recorder, duration = asyncio.run(load.drive(options, users))
+            total = load.summarize(recorder, duration)["total"]
+
+        finally:
+            process.terminate()
+            process.wait()
+
+        runs.append({"workers": count, **total})
+
+        print(
+            f"{count:>8}{total['throughput']:>10.1f}"
+            f"{total['throughput'] / count:>12.1f}{total['p50_ms']:>9.1f}"
+            f"{total['p99_ms']:>9.1f}{total['error_rate']:>9.2%}"
+        )
+
+    output = args.output or os.path.join(
+        load.RESULTS_DIR,
+        time.strftime("scaling-%Y%m%d-%H%M%S.json")
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "timestamp": time.time(),
+                "cores": cores,
+                "config": {
+                    key: value for key, value in vars(args).items() if key != "output"
+                },
+                "runs": runs
+            },
+            f,
+            indent=2
+        )
+
+    print(f"results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
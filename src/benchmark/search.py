@@ -0,0 +1,189 @@
+"""
+Event search benchmark.
+
+Loads synthetic events into the configured PostgreSQL database (run the setup utility's
+database initialization or migration first so that the search indexes exist), then
+times name substring and ranked full-text searches with and without the indexes:
+
+    python -m benchmark.search --events 1000000 --queries 50
+
+The synthetic events are removed when the benchmark finishes.
+
+:author: Max Milazzo
+"""
+
+
+
+from app.data.storage import event_store
+from config import DATABASE_CREDS
+
+import argparse
+import psycopg
+import random
+import statistics
+import time
+
+
+
+WORDS = [
+    "jazz", "rock", "opera", "summer", "winter", "festival", "night", "open", "air",
+    "symphony", "comedy", "theatre", "gala", "charity", "marathon", "conference",
+    "workshop", "expo", "market", "film", "premiere", "tour", "live", "acoustic",
+    "classical", "electronic", "dance", "poetry", "science", "robotics", "chess",
+    "football", "basketball", "tennis", "cup", "final", "league", "championship",
+    "harbor", "river", "mountain", "garden", "museum", "gallery", "library", "park"
+]
+# synthetic event name / description vocabulary
+
+
+ID_PREFIX = "benchmark-search-"
+# synthetic event ID prefix (used for cleanup)
+
+
+
+def populate(conn: psycopg.Connection, events: int) -> None:
+    """
+    Insert synthetic events.
+
+    :param conn: open database connection
+    :param events: number of events to insert
+    """
+
+    conn.execute(
+        """
+        INSERT INTO events (
+            id,
+            name,
+            description,
+            tickets,
+            issued,
+            start,
+            finish,
+            restricted,
+            transfer_limit,
+            enable_flags
+        )
+        SELECT
+            %(prefix)s || i,
+            initcap(w[1 + i %% %(n)s] || ' ' || w[1 + (i / 7) %% %(n)s] || ' ' ||
+                w[1 + (i / 53) %% %(n)s]) || ' ' || i,
+            w[1 + (i / 3) %% %(n)s] || ' ' || w[1 + (i / 11) %% %(n)s] || ' ' ||
+                w[1 + (i / 101) %% %(n)s] || ' event number ' || i,
+            128,
+            0,
+            extract(epoch FROM now()),
+            extract(epoch FROM now()) + 86400,
+            FALSE,
+            0,
+            FALSE
+        FROM generate_series(1, %(events)s) AS i,
+            (SELECT %(words)s::TEXT[] AS w) AS vocabulary;
+        """,
+        {"prefix": ID_PREFIX, "events": events, "words": WORDS, "n": len(WORDS)}
+    )
+    conn.execute("ANALYZE events;")
+
+
+def time_queries(
+    conn: psycopg.Connection,
+    query: str,
+    texts: list[str],
+    limit: int,
+    indexed: bool
+) -> list[float]:
+    """
+    Time a search query over several search texts.
+
+    :param conn: open database connection
+    :param query: search query SQL (text and limit parameters)
+    :param texts: search texts
+    :param limit: query fetch limit
+    :param indexed: if False, plan the queries without index scans
+    :return: per-query latencies (in seconds)
+    """
+
+    latencies = []
+
+    with conn.transaction():
+        conn.execute(f"SET LOCAL enable_bitmapscan = {'on' if indexed else 'off'};")
+        conn.execute(f"SET LOCAL enable_indexscan = {'on' if indexed else 'off'};")
+
+        for text in texts:
+            start = time.perf_counter()
+            conn.execute(query, (text, limit)).fetchall()
+            latencies.append(time.perf_counter() - start)
+
+    return latencies
+
+
+def main() -> None:
+    """
+    Benchmark entry point.
+    """
+
+    parser = argparse.ArgumentParser(description="ZETA search benchmark")
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=16)
+    args = parser.parse_args()
+
+    rng = random.Random(13)
+    substrings = [
+        f"%{rng.choice(WORDS)} {rng.choice(WORDS)}%" if i % 2 else
+        f"%{rng.randrange(args.events)}%"
+        for i in range(args.queries)
+    ]
+    # word pairs (a few hundred matches) and event numbers (a handful of matches, so a
+    # sequential scan cannot stop early)
+    phrases = [
+        " ".join(rng.sample(WORDS, 2))
+        for _ in range(args.queries)
+    ]
+
+    substring = f"""
+        SELECT {event_store.PUBLIC_COLUMNS}
+        FROM events
+        WHERE name ILIKE %s
+        LIMIT %s;
+    """
+    ranked = f"""
+        SELECT {event_store.PUBLIC_COLUMNS}
+        FROM events,
+            websearch_to_tsquery('{event_store.SEARCH_CONFIG}', %s) AS query
+        WHERE search_document @@ query
+        ORDER BY ts_rank(search_document, query) DESC, id
+        LIMIT %s;
+    """
+    # same statements as event_store.search and event_store.search_ranked
+
+    with psycopg.connect(**DATABASE_CREDS, autocommit=True) as conn:
+        start = time.perf_counter()
+        populate(conn, args.events)
+        print(f"inserted {args.events} events in {time.perf_counter() - start:.1f}s")
+
+        try:
+            print(
+                f"{'search':<12}{'plan':<10}{'mean ms':>10}{'p50 ms':>10}"
+                f"{'max ms':>10}"
+            )
+
+            for name, query, texts in (
+                ("substring", substring, substrings),
+                ("fulltext", ranked, phrases)
+            ):
+                for indexed in (False, True):
+                    latencies = time_queries(conn, query, texts, args.limit, indexed)
+
+                    print(
+                        f"{name:<12}{'index' if indexed else 'seqscan':<10}"
+                        f"{statistics.mean(latencies) * 1000:>10.2f}"
+                        f"{statistics.median(latencies) * 1000:>10.2f}"
+                        f"{max(latencies) * 1000:>10.2f}"
+                    )
+
+        finally:
+            conn.execute("DELETE FROM events WHERE id LIKE %s;", (ID_PREFIX + "%",))
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,96 @@
+"""
+Signature scheme microbenchmark.
+
+Measures sign and verify operations per second for each supported signature algorithm
+over a typical response payload:
+
+    python -m benchmark.signatures --seconds 2
+
+:author: Max Milazzo
+"""
+
+
+
+from app.crypto.asymmetric import ALGORITHMS, Signer
+
+import argparse
+import time
+import uuid
+
+
+
+MESSAGE = {
+    "nonce": str(uuid.uuid4()),
+    "timestamp": time.time(),
+    "content": {
+        "ticket_number": 1,
+        "redeemed": True,
+        "stamped": True,
+        "version": 1,
+        "transfer_limit": 63,
+        "metadata": {"seat": "A12", "tier": "general"}
+    }
+}
+# representative signed payload
+
+
+
+def rate(operation, seconds: float) -> float:
+    """
+    Measure how many times an operation runs per second.
+
+    :param operation: zero-argument callable to measure
+    :param seconds: minimum measurement duration (in seconds)
+    :return: operations per second
+    """
+
+    count = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+
+    while time.perf_counter() < deadline:
+        operation()
+        count += 1
+
+    return count / (time.perf_counter() - start)
+
+
+def measure(cipher: Signer, seconds: float) -> tuple[float, float]:
+    """
+    Measure sign and verify throughput for a signing object.
+
+    :param cipher: signer-mode signing object
+    :param seconds: measurement duration per operation (in seconds)
+    :return: sign operations per second, verify operations per second
+    """
+
+    verifier = type(cipher)(public_key=cipher.public_key)
+    signature = cipher.sign(MESSAGE)
+
+    if not verifier.verify(signature, MESSAGE):
+        raise Exception(f"{cipher.ALGORITHM}: signature verification failed")
+
+    return (
+        rate(lambda: cipher.sign(MESSAGE), seconds),
+        rate(lambda: verifier.verify(signature, MESSAGE), seconds)
+    )
+
+
+def main() -> None:
+    """
+    Benchmark entry point.
+    """
+
+    parser = argparse.ArgumentParser(description="ZETA signature benchmark")
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    print(f"{'algorithm':<16}{'sign/s':>12}{'verify/s':>12}")
+
+    for name, algorithm in ALGORITHMS.items():
+        sign_rate, verify_rate = measure(algorithm(), args.seconds)
+        print(f"{name:<16}{sign_rate:>12.0f}{verify_rate:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
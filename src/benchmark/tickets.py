@@ -0,0 +1,130 @@
+"""
+Ticket format benchmark.
+
+Compares the encrypted ticket string size, the pack / load (decrypt and verify)
+throughput, and the rate at which forged tickets (encrypted under another key) are
+rejected for every ticket format, for tickets without metadata, with small metadata,
+and with larger metadata:
+
+    python -m benchmark.tickets --seconds 2
+
+:author: Max Milazzo
+"""
+
+
+
+from app.crypto.asymmetric import ALGORITHMS
+from app.crypto.symmetric import SKC
+from app.data.models.ticket import Ticket
+from app.error.errors import DomainException
+from benchmark.signatures import rate
+
+import argparse
+import uuid
+
+
+
+FORMATS = (1, 2, 3, 4)
+# benchmarked ticket formats
+
+
+METADATA = {
+    "none": None,
+    "small": {"seat": "A12", "tier": "general"},
+    "large": {
+        "seat": "Section 104, Row K, Seat 12",
+        "tier": "general admission",
+        "holder": "Registered attendee",
+        "notes": "Entry through the north gate; re-entry permitted until 21:00.",
+        "perks": ["parking", "lounge", "merchandise"]
+    }
+}
+# representative ticket metadata payloads
+
+
+
+def make_ticket(metadata) -> Ticket:
+    """
+    Build a synthetic ticket.
+
+    :param metadata: ticket metadata
+    :return: ticket model
+    """
+
+    return Ticket(
+        event_id=str(uuid.uuid4()),
+        public_key=ALGORITHMS["ed25519"]().public_key,
+        number=4321,
+        version=2,
+        transfer_limit=63,
+        metadata=metadata,
+        event_key=SKC.key()
+    )
+
+
+def reject(ticket: Ticket, forged: str) -> None:
+    """
+    Load a forged ticket string, expecting it to be rejected.
+
+    :param ticket: genuine ticket model
+    :param forged: ticket string encrypted under another key
+    """
+
+    try:
+        Ticket.decrypt(ticket.event_id, ticket.public_key, forged, ticket.event_key)
+
+    except DomainException:
+        return
+
+    raise Exception("forged ticket accepted")
+
+
+def main() -> None:
+    """
+    Benchmark entry point.
+    """
+
+    parser = argparse.ArgumentParser(description="ZETA ticket format benchmark")
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    print(
+        f"{'metadata':<10}{'format':>8}{'bytes':>8}{'vs v1':>8}{'pack/s':>12}"
+        f"{'load/s':>12}{'reject/s':>12}"
+    )
+
+    for name, metadata in METADATA.items():
+        ticket = make_ticket(metadata)
+        forger = ticket.model_copy(update={"event_key": SKC.key()})
+        sizes = {}
+
+        for ticket_format in FORMATS:
+            packed = ticket.pack(ticket_format)
+            loaded = Ticket.decrypt(
+                ticket.event_id, ticket.public_key, packed, ticket.event_key
+            )
+
+            if loaded != ticket:
+                raise Exception(f"format {ticket_format}: ticket round trip failed")
+
+            sizes[ticket_format] = len(packed)
+            forged = forger.pack(ticket_format)
+
+            pack_rate = rate(lambda: ticket.pack(ticket_format), args.seconds)
+            load_rate = rate(
+                lambda: Ticket.decrypt(
+                    ticket.event_id, ticket.public_key, packed, ticket.event_key
+                ),
+                args.seconds
+            )
+            reject_rate = rate(lambda: reject(ticket, forged), args.seconds)
+
+            print(
+                f"{name:<10}{ticket_format:>8}{len(packed):>8}"
+                f"{len(packed) / sizes[1]:>8.0%}{pack_rate:>12.0f}"
+                f"{load_rate:>12.0f}{reject_rate:>12.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
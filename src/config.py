@@ -16,6 +16,108 @@ DATABASE_CREDS = {
 # PostgreSQL database connection credentials
 
 
+DATABASE_READ_CREDS = None
+# optional read replica connection credentials (same keys as DATABASE_CREDS) used by
+# event searches (None runs searches on the primary database)
+
+
+DATABASE_POOL_MIN_SIZE = None
+DATABASE_POOL_MAX_SIZE = None
+# per-process database connection pool bounds (for each of the primary and read pools)
+# (None sizes the pool to one connection per worker thread -- every flow holds at most
+# one connection at a time -- and opens all of them at startup; the server does not
+# start until the minimum number of connections is established)
+
+
+DATABASE_POOL_TIMEOUT = 10
+# maximum time (in seconds) to wait for a pooled connection (or for the pool to fill
+# at startup)
+
+
+DATABASE_PREPARE_THRESHOLD = 0
+# number of times a statement runs on a pooled connection before it is prepared
+# server-side and its plan reused (0 prepares storage statements on first use; None
+# disables prepared statements, e.g. behind PgBouncer before 1.21 in transaction mode)
+
+
 REDIS_URL = "redis://localhost:6379/0"
 # set to None to use local memory replay prevention
-# (Redis must be active if using multiple pods/replicas)
\ No newline at end of file
+# (Redis must be active if using multiple pods/replicas)
+
+EXECUTION_MODE = "threaded"
+# request execution mode:
+# "threaded" runs the blocking API flows (database, Redis, and signature work) on a
+# bounded worker thread pool so that the event loop is never stalled
+# "inline" runs the API flows directly on the event loop (previous behavior)
+
+
+WORKER_THREADS = 8
+# maximum number of worker threads per server process (threaded execution mode)
+# (requests beyond this limit queue for a free worker instead of piling onto the
+# database connection pool)
+
+EVENT_KEY_CACHE_SIZE = 4096
+EVENT_KEY_CACHE_TTL = 300
+# per-process event ticket key cache size and entry lifetime (in seconds)
+# (deletions are broadcast over Redis when configured; otherwise other processes,
+# such as a separately run expired-event purge, are bounded by the entry lifetime)
+
+
+EVENT_CACHE_SIZE = 4096
+EVENT_CACHE_TTL = 1
+# per-process public event data cache size and entry lifetime (in seconds)
+# (the "issued" count shown for an event may lag registrations handled by other
+# processes by up to the entry lifetime; deletions are broadcast over Redis when
+# configured)
+
+
+PERMISSIONS_CACHE_SIZE = 4096
+PERMISSIONS_CACHE_TTL = None
+# per-process (event, public key) permissions cache size and entry lifetime (in seconds)
+# (None disables the cache, so revocations always take effect immediately; when enabled,
+# updates and deletions are broadcast over Redis if configured, but other processes may
+# still act on revoked permissions until the broadcast arrives, or for up to the entry
+# lifetime without Redis)
+
+
+PACK_PROCESSES = 0
+# number of worker processes used to pack bulk-issued tickets
+# (0 to pack in the request thread, None for an even share of the cores among server
+# processes; see "python -m benchmark.packing" before enabling)
+
+
+TICKET_FORMAT = 4
+# ticket string format issued by the server (1 for the legacy JSON format, 2 for the
+# compact binary format, 3 for the compact binary format with AES-GCM authenticated
+# encryption, 4 for format 3 encrypted under a derived event read key and sealed with
+# the event key); tickets in every format are accepted regardless
+# (only format 4 tickets can be checked by offline scanners, see "/snapshot")
+# (keep an older format until every server instance in a deployment can read the new one)
+
+
+SIGNATURE_CACHE_WINDOW = None
+# opt-in signature reuse window (in seconds) for public read responses (/search)
+# (None signs every response; otherwise identical results share one signature per
+# window and each response echoes the request nonce, unsigned, in "reply_to")
+# SECURITY TRADE-OFF: a cached response only proves that the server returned this
+# content within the window -- it is not bound to the individual request, so anyone
+# able to tamper with the transport can answer a search with any other search's signed
+# response from the same window, and results may be up to the window old
+
+
+METRICS_ENDPOINT = True
+# serve Prometheus text-format metrics (connection pools, caches, nonce batching, and
+# per-stage request latency histograms) on "/metrics" (unauthenticated -- disable or
+# restrict access at the proxy if the operational counters should not be public;
+# disabling also removes the latency timing from request flows)
+
+
+READINESS_TIMEOUT = 2
+# maximum time (in seconds) each dependency check of the "/ready" readiness probe may
+# take before the dependency is reported as unavailable
+
+
+SIGNATURE_ALGORITHM = "rsa"
+# server response signature algorithm ("rsa", "ed25519", or "ecdsa-p256")
+# (the server key in "data/priv.key" must match; regenerate it with the setup utility
+# after changing this -- clients may sign requests with any supported algorithm)
\ No newline at end of file
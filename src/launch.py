@@ -0,0 +1,206 @@
+"""
+ZETA pre-fork multi-process launcher.
+
+Imports the application and loads (or generates) the server key once in a master
+process, freezes the warmed-up heap out of garbage collection, and then forks one uvicorn
+worker per core sharing a single listening socket.  Workers inherit the key and imported
+code copy-on-write and open their own Redis and database connections in the application
+lifespan after the fork:
+
+    python launch.py --workers 8 --host 0.0.0.0 --port 8000
+
+:author: Max Milazzo
+"""
+
+
+
+from config import REDIS_URL
+
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+import uvicorn
+
+
+
+MIN_UPTIME = 5
+# minimum worker lifetime (in seconds) for a crashed worker to be replaced
+# (a worker that dies sooner most likely failed to start, so the launcher stops)
+
+
+
+def bind(host: str, port: int, backlog: int) -> socket.socket:
+    """
+    Open the listening socket shared by every worker.
+
+    :param host: bind address
+    :param port: bind port
+    :param backlog: listen backlog
+    :return: listening socket
+    """
+
+    sock = socket.socket(
+        socket.AF_INET6 if ":" in host else socket.AF_INET,
+        socket.SOCK_STREAM
+    )
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+
+    return sock
+
+
+def serve(app, sock: socket.socket, args: argparse.Namespace) -> None:
+    """
+    Worker process body (never returns).
+
+    :param app: ASGI application
+    :param sock: shared listening socket
+    :param args: command line arguments
+    """
+
+    status = 1
+
+    try:
+        os.setpgid(0, 0)
+        # own process group, so terminal interrupts reach only the master (which then
+        # stops every worker exactly once)
+
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        gc.enable()
+
+        server = uvicorn.Server(
+            uvicorn.Config(
+                app,
+                lifespan="on",
+                log_level=args.log_level,
+                backlog=args.backlog,
+                timeout_keep_alive=args.keep_alive
+            )
+        )
+        server.run(sockets=[sock])
+        status = 0 if server.started else 1
+
+    finally:
+        os._exit(status)
+
+
+def spawn(app, sock: socket.socket, args: argparse.Namespace) -> int:
+    """
+    Fork a worker process.
+
+    :param app: ASGI application
+    :param sock: shared listening socket
+    :param args: command line arguments
+    :return: worker process ID
+    """
+
+    pid = os.fork()
+
+    if pid == 0:
+        serve(app, sock, args)
+
+    return pid
+
+
+def main() -> None:
+    """
+    Launcher entry point.
+    """
+
+    parser = argparse.ArgumentParser(description="ZETA multi-process launcher")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--backlog", type=int, default=2048)
+    parser.add_argument("--keep-alive", type=int, default=5)
+    parser.add_argument("--log-level", default="warning")
+    args = parser.parse_args()
+
+    if args.workers > 1 and REDIS_URL is None:
+        raise Exception(
+            "multiple workers require REDIS_URL (in-memory replay prevention is per "
+            "process, so a request could be replayed against another worker)"
+        )
+
+    gc.disable()
+    # no collections while the shared heap is built
+
+    from app.util import executor, keys
+    from server import create_app
+
+    keys.load()
+    # import every module and load (or generate) the server key exactly once (worker
+    # lifespans then find the key already loaded)
+
+    executor.server_processes = args.workers
+    # divide the cores among the workers' ticket packing process pools
+
+    app = create_app()
+    sock = bind(args.host, args.port, args.backlog)
+
+    gc.freeze()
+    # move the warmed-up heap to the permanent generation so that worker collections
+    # never write to (and un-share) the pages inherited from the master
+
+    stopping = False
+    workers = {}
+
+    def stop(*_) -> None:
+        nonlocal stopping
+        stopping = True
+
+        for pid in workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    for _ in range(args.workers):
+        workers[spawn(app, sock, args)] = time.monotonic()
+
+    print(
+        f"ZETA serving on {args.host}:{args.port} with {args.workers} worker(s) "
+        f"(master {os.getpid()})"
+    )
+
+    failed = False
+
+    while workers:
+        try:
+            pid, status = os.wait()
+
+        except ChildProcessError:
+            break
+
+        started = workers.pop(pid, None)
+
+        if started is None or stopping:
+            continue
+
+        if time.monotonic() - started < MIN_UPTIME:
+            print(f"worker {pid} exited during startup (status {status}), stopping")
+            failed = True
+            stop()
+            continue
+
+        print(f"worker {pid} exited (status {status}), replacing it")
+        workers[spawn(app, sock, args)] = time.monotonic()
+        # replace a crashed worker
+
+    sock.close()
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -12,103 +12,182 @@ from app.API.models.endpoints import *
 from app.data.storage import connection
 from app.error.errors import DomainException, ErrorKind
 from app.error.map import HTTP_CODE
-from config import REDIS_URL
+from app.util import broadcast, executor, keys, metrics, readiness
+from config import (
+    EXECUTION_MODE, METRICS_ENDPOINT, PACK_PROCESSES, REDIS_URL, WORKER_THREADS
+)
 
+import asyncio
 import logging
 import os
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
 from typing import AsyncIterator
 
 
 
 logger = logging.getLogger("zeta")
-logger.setLevel(logging.ERROR)
+# application logger (file handler attached on startup)
 
-if not any(isinstance(h, logging.FileHandler) for h in logger.handlers):
-    fh = logging.FileHandler(
-        os.path.join("data", "error.log"),
-        mode="a",
-        encoding="utf-8"
-    )
-    fh.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
-    fh.setLevel(logging.ERROR)
-    logger.addHandler(fh)
-    # initialize application logger
+router = APIRouter()
+# API routes (attached to each application built by create_app)
+
+
+
+def configure_logging() -> None:
+    """
+    Attach the error log file handler to the application logger (once per process).
+    """
 
-Auth.start_service(REDIS_URL)
-# start the authentication nonce-tracker service
+    logger.setLevel(logging.ERROR)
 
-connection.start_pool()
-# initialize the database connection pool
+    if not any(isinstance(h, logging.FileHandler) for h in logger.handlers):
+        fh = logging.FileHandler(
+            os.path.join("data", "error.log"),
+            mode="a",
+            encoding="utf-8",
+            delay=True
+        )
+        fh.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+        fh.setLevel(logging.ERROR)
+        logger.addHandler(fh)
+        # the log file is only created once the first error is written
 
 
 @asynccontextmanager
 async def lifespan(_: FastAPI) -> AsyncIterator[None]:
     """
-    Automatically close database connection pool when the server shuts down.
+    Load the server key and start the nonce tracker, the cache invalidation listener,
+    the database connection pools, and the request executors on startup, and
+    automatically close them when the server shuts down.
+
+    Everything that reads files, opens connections, or starts threads runs here rather
+    than at import time, so that importing the application is cheap and side-effect
+    free and a pre-fork launcher can import it once in its master process while each
+    worker opens its own connections after the fork.  The time each dependency took to
+    start is reported by the "/ready" probe.
     """
 
-    yield
-    connection.stop_pool()
+    configure_logging()
 
+    await asyncio.gather(
+        asyncio.to_thread(readiness.start, "keys", keys.load),
+        asyncio.to_thread(readiness.start, "nonces", Auth.start_service, REDIS_URL),
+        asyncio.to_thread(
+            readiness.start, "broadcast", broadcast.start_service, REDIS_URL
+        ),
+        asyncio.to_thread(readiness.start, "database", connection.start_pool)
+    )
+    # load the server key, start the authentication nonce-tracker service and the
+    # cross-process cache invalidation listener, and pre-warm the database connection
+    # pools concurrently (they are independent, so startup takes as long as the
+    # slowest rather than the sum)
 
-app = FastAPI(lifespan=lifespan)
+    executor.start_executor(WORKER_THREADS if EXECUTION_MODE == "threaded" else None)
+    # start the bounded worker thread pool (or run flows inline)
 
+    executor.start_process_pool(PACK_PROCESSES)
+    # start the worker process pool for bulk ticket packing
+
+    yield
+    executor.stop_executor()
+    executor.stop_process_pool()
+    Auth.stop_service()
+    broadcast.stop_service()
+    connection.stop_pool()
 
 
-@app.post("/create", description="Create a new event on the server")
+@router.post("/create", description="Create a new event on the server")
 async def create_event(data: Auth[CreateRequest]) -> Auth[CreateResponse]:
-    return API.create_event(data)
+    return await executor.run(API.create_event, data)
 
 
-@app.post("/search", description="Search for events")
+@router.post("/search", description="Search for events")
 async def search_events(data: Auth[SearchRequest]) -> Auth[SearchResponse]:
-    return API.search_events(data)
+    return await executor.run(API.search_events, data)
 
 
-@app.post("/register", description="Register for an event and receieve a ticket")
+@router.post("/register", description="Register for an event and receieve a ticket")
 async def register_user(data: Auth[RegisterRequest]) -> Auth[RegisterResponse]:
-    return API.register_user(data)
+    return await executor.run(API.register_user, data)
+
+
+@router.post("/register/bulk", description="Issue tickets to several users at once")
+async def register_users(
+    data: Auth[BulkRegisterRequest]
+) -> Auth[BulkRegisterResponse]:
+    return await executor.run(API.register_users, data)
 
 
-@app.post("/transfer", description="Receive a ticket transfer from another user")
+@router.post("/transfer", description="Receive a ticket transfer from another user")
 async def transfer_ticket(data: Auth[TransferRequest]) -> Auth[TransferResponse]:
-    return API.transfer_ticket(data)
+    return await executor.run(API.transfer_ticket, data)
 
 
-@app.post("/redeem", description="Redeem a ticket")
+@router.post("/redeem", description="Redeem a ticket")
 async def redeem_ticket(data: Auth[RedeemRequest]) -> Auth[RedeemResponse]:
-    return API.redeem_ticket(data)
+    return await executor.run(API.redeem_ticket, data)
 
 
-@app.post("/validate", description="Validate a ticket and optionally stamp it")
+@router.post("/validate", description="Validate a ticket and optionally stamp it")
 async def validate_ticket(data: Auth[ValidateRequest]) -> Auth[ValidateResponse]:
-    return API.validate_ticket(data)
+    return await executor.run(API.validate_ticket, data)
+
+
+@router.post("/validate/batch", description="Validate and optionally stamp several tickets")
+async def validate_tickets(
+    data: Auth[BatchValidateRequest]
+) -> Auth[BatchValidateResponse]:
+    return await executor.run(API.validate_tickets, data)
+
+
+@router.post("/snapshot", description="Take a signed ticket state snapshot for scanners")
+async def snapshot_event(data: Auth[SnapshotRequest]) -> Auth[SnapshotResponse]:
+    return await executor.run(API.snapshot_event, data)
 
 
-@app.post("/flag", description="Set or retrieve a ticket's flag state")
+@router.post("/snapshot/stamps", description="Upload stamps buffered by a scanner")
+async def upload_stamps(data: Auth[StampUploadRequest]) -> Auth[StampUploadResponse]:
+    return await executor.run(API.upload_stamps, data)
+
+
+@router.post("/flag", description="Set or retrieve a ticket's flag state")
 async def flag_ticket(data: Auth[FlagRequest]) -> Auth[FlagResponse]:
-    return API.flag_ticket(data)
+    return await executor.run(API.flag_ticket, data)
 
 
-@app.post("/cancel", description="Cancel an event attendee's ticket")
+@router.post("/cancel", description="Cancel an event attendee's ticket")
 async def cancel_ticket(data: Auth[CancelRequest]) -> Auth[CancelResponse]:
-    return API.cancel_ticket(data)
+    return await executor.run(API.cancel_ticket, data)
 
 
-@app.post("/delete", description="Delete an event")
+@router.post("/delete", description="Delete an event")
 async def delete_event(data: Auth[DeleteRequest]) -> Auth[DeleteResponse]:
-    return API.delete_event(data)
+    return await executor.run(API.delete_event, data)
 
 
-@app.post("/permissions", description="Edit or view event access permissions")
+@router.post("/permissions", description="Edit or view event access permissions")
 async def update_permissions(data: Auth[PermissionsRequest]) -> Auth[PermissionsResponse]:
-    return API.update_permissions(data)
+    return await executor.run(API.update_permissions, data)
+
+
+@router.get("/ready", description="Readiness probe reporting each dependency")
+async def server_ready() -> JSONResponse:
+    ready, dependencies = await readiness.run_checks()
+
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"ready": ready, "dependencies": dependencies}
+    )
+
+
+if METRICS_ENDPOINT:
+    @router.get("/metrics", description="Prometheus text-format server metrics")
+    async def server_metrics() -> PlainTextResponse:
+        return PlainTextResponse(metrics.render(), media_type=metrics.CONTENT_TYPE)
 
 
-@app.exception_handler(DomainException)
 async def domain_exception_handler(
     _: Request,
     exception: DomainException
@@ -120,7 +199,7 @@ async def domain_exception_handler(
     :return: server error response
     """
 
-    auth_error = API.exception_handler(exception)
+    auth_error = await executor.run(API.exception_handler, exception)
     # generated authenticated error response
 
     return JSONResponse(
@@ -129,7 +208,6 @@ async def domain_exception_handler(
     )
 
 
-@app.exception_handler(Exception)
 async def exception_handler(_: Request, exception: Exception) -> JSONResponse:
     """
     Handle unexpected exceptions and return a generic internal error response.
@@ -140,7 +218,8 @@ async def exception_handler(_: Request, exception: Exception) -> JSONResponse:
 
     logger.error(repr(exception), exc_info=exception)
 
-    auth_error = API.exception_handler(
+    auth_error = await executor.run(
+        API.exception_handler,
         DomainException(
             kind=ErrorKind.INTERNAL,
             message="unknwon error"
@@ -151,4 +230,23 @@ async def exception_handler(_: Request, exception: Exception) -> JSONResponse:
     return JSONResponse(
         status_code=HTTP_CODE[ErrorKind.INTERNAL],
         content=auth_error.model_dump()
-    )
\ No newline at end of file
+    )
+
+
+def create_app() -> FastAPI:
+    """
+    Build a ZETA application (no connections are opened until its lifespan starts).
+
+    :return: FastAPI application
+    """
+
+    application = FastAPI(lifespan=lifespan)
+    application.include_router(router)
+    application.add_exception_handler(DomainException, domain_exception_handler)
+    application.add_exception_handler(Exception, exception_handler)
+
+    return application
+
+
+app = create_app()
+# default application (e.g. "uvicorn server:app" for a single worker)
\ No newline at end of file
@@ -7,8 +7,10 @@ Setup and information module.
 
 
 from app.data.models.event import TRANSFER_LIMIT
-from app.util import display, keys
-from config import DATABASE_CREDS
+from app.data.storage.event_store import SEARCH_DOCUMENT
+from app.data.storage.ticket_store import STATE_PAGE_SIZE
+from app.util import broadcast, display, keys
+from config import DATABASE_CREDS, REDIS_URL
 
 import psycopg
 import time
@@ -46,6 +48,103 @@ def key_setup() -> None:
     input()
 
 
+def _create_state_pages(conn: psycopg.Connection) -> None:
+    """
+    Create the paged ticket state table.
+
+    :param conn: open database connection
+    """
+
+    conn.execute(
+        """
+        CREATE TABLE event_state_pages (
+            event_id TEXT NOT NULL,
+            page INTEGER NOT NULL CHECK (page >= 0),
+            state_bytes BYTEA NOT NULL,
+            flag_bytes BYTEA,
+            PRIMARY KEY (event_id, page),
+            FOREIGN KEY (event_id)
+                REFERENCES events (id)
+                ON DELETE CASCADE
+        );
+        """
+    )
+
+    conn.execute(
+        """
+        ALTER TABLE event_state_pages
+            ALTER COLUMN state_bytes SET STORAGE PLAIN,
+            ALTER COLUMN flag_bytes SET STORAGE PLAIN;
+        """
+    )
+    # keep page bytes inline and uncompressed so that updates never re-TOAST them
+
+
+def _create_functions(conn: psycopg.Connection) -> None:
+    """
+    Create (or replace) the SQL helper functions used by the storage layer.
+
+    :param conn: open database connection
+    """
+
+    conn.execute(
+        """
+        CREATE OR REPLACE FUNCTION set_bytes(
+            data BYTEA,
+            offsets INTEGER[],
+            bytes INTEGER[]
+        )
+        RETURNS BYTEA
+        LANGUAGE plpgsql
+        IMMUTABLE
+        AS $$
+        BEGIN
+            FOR i IN 1 .. coalesce(array_length(offsets, 1), 0) LOOP
+                data := set_byte(data, offsets[i], bytes[i]);
+            END LOOP;
+
+            RETURN data;
+        END;
+        $$;
+        """
+    )
+    # set several bytes of one value (batched ticket state updates)
+
+
+def _create_search_indexes(conn: psycopg.Connection) -> None:
+    """
+    Create (if missing) the event search document column and indexes.
+
+    :param conn: open database connection
+    """
+
+    conn.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS events_name_trgm
+        ON events USING GIN (name gin_trgm_ops);
+        """
+    )
+    # trigram index for name substring (ILIKE) searches
+
+    conn.execute(
+        f"""
+        ALTER TABLE events
+        ADD COLUMN IF NOT EXISTS search_document TSVECTOR
+        GENERATED ALWAYS AS ({SEARCH_DOCUMENT}) STORED;
+        """
+    )
+
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS events_search_document
+        ON events USING GIN (search_document);
+        """
+    )
+    # full-text document and index over event names and descriptions (ranked searches)
+
+
 def db_setup() -> None:
     """
     Set up the database schema for storing events and their data.
@@ -53,6 +152,7 @@ def db_setup() -> None:
 
     try:
         with psycopg.connect(**DATABASE_CREDS) as conn:
+            conn.execute("DROP TABLE IF EXISTS event_state_pages;")
             conn.execute("DROP TABLE IF EXISTS event_data;")
             conn.execute("DROP TABLE IF EXISTS event_permissions;")
             conn.execute("DROP TABLE IF EXISTS events;")
@@ -84,8 +184,6 @@ def db_setup() -> None:
                     event_id TEXT PRIMARY KEY,
                     event_key BYTEA NOT NULL,
                     owner_public_key_hash BYTEA NOT NULL,
-                    state_bytes BYTEA NOT NULL,
-                    flag_bytes BYTEA,
                     FOREIGN KEY (event_id)
                         REFERENCES events (id)
                         ON DELETE CASCADE
@@ -93,6 +191,10 @@ def db_setup() -> None:
                 """
             )
 
+            _create_state_pages(conn)
+            _create_functions(conn)
+            _create_search_indexes(conn)
+
             conn.execute(
                 """
                 CREATE TABLE event_permissions (
@@ -124,6 +226,78 @@ def db_setup() -> None:
     input()
 
 
+def db_migrate() -> None:
+    """
+    Migrate an existing database to the current schema (search indexes and fixed-size
+    ticket state pages instead of single per-event state rows).
+    """
+
+    try:
+        with psycopg.connect(**DATABASE_CREDS) as conn:
+            row = conn.execute(
+                """
+                SELECT 1
+                FROM information_schema.columns
+                WHERE table_name = 'event_data'
+                    AND column_name = 'state_bytes';
+                """
+            ).fetchone()
+
+            _create_functions(conn)
+            _create_search_indexes(conn)
+
+            if row is None:
+                conn.commit()
+
+                display.clear()
+                print("SUCCESS: Search indexes created (database already uses paged "
+                      "ticket state)")
+                input()
+                return
+            
+            conn.execute("LOCK TABLE event_data IN ACCESS EXCLUSIVE MODE;")
+            # block ticket state updates for the duration of the migration
+
+            _create_state_pages(conn)
+
+            conn.execute(
+                """
+                INSERT INTO event_state_pages (event_id, page, state_bytes, flag_bytes)
+                SELECT
+                    d.event_id,
+                    p.page,
+                    substring(d.state_bytes FROM p.page * %(size)s + 1 FOR %(size)s),
+                    substring(d.flag_bytes FROM p.page * %(size)s + 1 FOR %(size)s)
+                FROM event_data d
+                CROSS JOIN LATERAL generate_series(
+                    0,
+                    (length(d.state_bytes) - 1) / %(size)s
+                ) AS p(page);
+                """,
+                {"size": STATE_PAGE_SIZE}
+            )
+            # split each event's state (and flag) bytes into pages
+
+            conn.execute(
+                """
+                ALTER TABLE event_data
+                    DROP COLUMN state_bytes,
+                    DROP COLUMN flag_bytes;
+                """
+            )
+
+            conn.commit()
+
+        display.clear()
+        print("SUCCESS: Database migration completed")
+
+    except Exception as e:
+        display.clear()
+        print(f"ERROR: Database migration failed --\n{e}")
+
+    input()
+
+
 def event_cleanup() -> None:
     """
     Delete expired events from the database.
@@ -132,7 +306,17 @@ def event_cleanup() -> None:
     try:
         with psycopg.connect(**DATABASE_CREDS) as conn:
             with conn.cursor() as cur:
-                cur.execute("DELETE FROM events WHERE finish < %s;", (time.time(),))
+                cur.execute(
+                    "DELETE FROM events WHERE finish < %s RETURNING id;",
+                    (time.time(),)
+                )
+                event_ids = [row[0] for row in cur.fetchall()]
+
+        broadcast.start_service(REDIS_URL, listen=False)
+
+        for event_id in event_ids:
+            broadcast.publish(event_id)
+            # invalidate cached data for purged events on running servers
 
         display.clear()
         print("SUCCESS: Database purge completed")
@@ -158,6 +342,7 @@ def main() -> None:
         print("2 - Database initialization")
         print("3 - Key initialization")
         print("4 - Clear expired events")
+        print("5 - Migrate database schema")
         print("x - Exit\n")
         # program options
         
@@ -181,6 +366,10 @@ def main() -> None:
                 event_cleanup()
                 # delete expired events
 
+            case "5":
+                db_migrate()
+                # migrate database to the current schema
+
             case "x":
                 return
                 # exit application
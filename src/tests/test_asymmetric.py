@@ -0,0 +1,43 @@
+"""
+Asymmetric signature backend tests.
+
+:author: Max Milazzo
+"""
+
+
+
+from app.crypto.asymmetric import ALGORITHMS, Signer
+
+import pytest
+
+
+
+MESSAGE = {"nonce": "nonce", "timestamp": 0.0, "content": {"ticket_number": 1}}
+# signed test payload
+
+
+
+@pytest.mark.parametrize("algorithm", ["ed25519", "ecdsa-p256"])
+def test_sign_and_verify(algorithm):
+    signer = ALGORITHMS[algorithm]()
+    signature = signer.sign(MESSAGE)
+
+    verifier = ALGORITHMS[algorithm](public_key=signer.public_key)
+
+    assert verifier.verify(signature, MESSAGE)
+    assert not verifier.verify(signature, MESSAGE | {"nonce": "other"})
+
+
+def test_incomplete_backend_fails_on_instantiation():
+    class Incomplete(Signer):
+        ALGORITHM = "ed25519"
+
+        def _generate_key(self):
+            pass
+
+        def _sign(self, message: bytes) -> bytes:
+            return b""
+        # no _verify
+
+    with pytest.raises(TypeError):
+        Incomplete()
\ No newline at end of file
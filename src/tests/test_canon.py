@@ -0,0 +1,72 @@
+"""
+Canonical JSON compatibility tests.
+
+:author: Max Milazzo
+"""
+
+
+
+from app.crypto import canon
+from app.crypto.canon import canonicalize
+
+import json
+import math
+import os
+import pytest
+
+
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "canon_corpus.json")
+# compatibility corpus (payloads and the exact canonical bytes clients sign)
+
+
+with open(CORPUS_PATH, "r", encoding="utf-8") as f:
+    CORPUS = json.load(f)
+
+
+SPECIAL_FLOATS = {"nan": math.nan, "inf": math.inf, "-inf": -math.inf}
+# non-standard JSON floats (not representable in the corpus file itself)
+
+
+
+def legacy(data: dict) -> bytes:
+    """
+    Legacy canonical form (the form existing clients sign).
+
+    :param data: data to convert
+    :return: canonicalized JSON bytes
+    """
+
+    return json.dumps(data, sort_keys=True, separators=(",", ":")).encode()
+
+
+
+@pytest.mark.parametrize("case", CORPUS, ids=[case["name"] for case in CORPUS])
+def test_corpus_byte_identical(case):
+    assert canonicalize(case["input"]) == case["canonical"].encode()
+    assert canonicalize(case["input"]) == legacy(case["input"])
+
+
+def test_non_finite_floats():
+    assert canonicalize(SPECIAL_FLOATS) == legacy(SPECIAL_FLOATS)
+    # legacy form emits NaN / Infinity literals, so they must survive unchanged
+
+
+def test_pure_python_fallback(monkeypatch):
+    monkeypatch.setattr(
+        canon,
+        "_encode",
+        json.JSONEncoder(
+            separators=(",", ":"),
+            sort_keys=True,
+            check_circular=False
+        ).iterencode
+    )
+
+    for case in CORPUS:
+        assert canonicalize(case["input"]) == case["canonical"].encode()
+
+
+def test_unserializable_value():
+    with pytest.raises(TypeError):
+        canonicalize({"value": object()})
\ No newline at end of file
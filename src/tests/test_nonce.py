@@ -0,0 +1,173 @@
+"""
+Request nonce tracking tests.
+
+:author: Max Milazzo
+"""
+
+
+
+from app.util import nonce
+from app.util.nonce import NonceStore, RedisNonceBatcher
+
+import pytest
+import random
+import threading
+import time
+from types import SimpleNamespace
+
+
+
+THREADS = 8
+# concurrent nonce store callers
+
+
+NONCES = 2000
+# distinct nonces submitted by every concurrent caller
+
+
+
+class FakePipeline:
+    """
+    Redis pipeline stand-in recording SET NX commands into a shared dictionary.
+    """
+
+    def __init__(self, client: "FakeRedis") -> None:
+        self.client = client
+        self.commands = []
+
+
+    def set(self, name: str, value: str, nx: bool, ex: int) -> None:
+        self.commands.append(name)
+
+
+    def execute(self, raise_on_error: bool = True) -> list:
+        self.client.release.wait()
+
+        results = []
+
+        with self.client.lock:
+            for name in self.commands:
+                results.append(name not in self.client.keys)
+                self.client.keys[name] = True
+
+        return results
+
+
+
+class FakeRedis:
+    """
+    Redis client stand-in (pipelines only).
+    """
+
+    def __init__(self, fail: bool = False) -> None:
+        self.fail = fail
+        self.keys = {}
+        self.lock = threading.Lock()
+        self.release = threading.Event()
+        self.release.set()
+
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        if self.fail:
+            raise ConnectionError("connection refused")
+
+        return FakePipeline(self)
+
+
+
+def test_batcher_rejects_repeats():
+    batcher = RedisNonceBatcher(FakeRedis(), 0.001)
+
+    try:
+        assert batcher.add("a", "0", 10)
+        assert not batcher.add("a", "0", 10)
+        assert batcher.add("b", "0", 10)
+
+    finally:
+        batcher.stop()
+
+
+def test_batcher_pipeline_failure_fails_every_check():
+    batcher = RedisNonceBatcher(FakeRedis(fail=True), 0.001, timeout=5)
+
+    try:
+        with pytest.raises(ConnectionError):
+            batcher.add("a", "0", 10)
+
+    finally:
+        batcher.stop()
+
+
+def test_batcher_timeout_fails_check():
+    client = FakeRedis()
+    client.release.clear()
+    batcher = RedisNonceBatcher(client, 0.001, flushers=1, timeout=0.05)
+
+    try:
+        with pytest.raises(TimeoutError):
+            batcher.add("a", "0", 10)
+
+    finally:
+        client.release.set()
+        batcher.stop()
+
+
+@pytest.fixture
+def clock(monkeypatch) -> list[float]:
+    """
+    Controllable epoch clock for the nonce store.
+    """
+
+    clock = [1000.0]
+    monkeypatch.setattr(nonce, "time", SimpleNamespace(time=lambda: clock[0]))
+
+    return clock
+
+
+
+def test_store_accepts_each_nonce_once_under_concurrency():
+    store = NonceStore(retention=60, shards=4)
+    nonces = [f"nonce-{i}" for i in range(NONCES)]
+    accepted = [[] for _ in range(THREADS)]
+    barrier = threading.Barrier(THREADS)
+
+    def run(index: int) -> None:
+        order = nonces[:]
+        random.Random(index).shuffle(order)
+        barrier.wait()
+
+        for value in order:
+            if store.add(value, time.time()):
+                accepted[index].append(value)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(THREADS)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    accepted = [value for values in accepted for value in values]
+
+    assert sorted(accepted) == sorted(nonces)
+    # every nonce accepted exactly once (none twice, none lost)
+
+
+def test_store_evicts_expired_generations(clock):
+    store = NonceStore(retention=10, shards=1, bucket_width=1)
+
+    assert store.add("a", 1000)
+    assert not store.add("a", 1000)
+
+    clock[0] = 1011
+    assert store.add("b", 1011)
+    assert not store.add("a", 1000)
+    # expired, but kept for one more generation as a grace period
+
+    clock[0] = 1012
+    assert store.add("c", 1012)
+    assert len(store) == 2
+    # the generation holding "a" was dropped
+
+    assert store.add("a", 1012)
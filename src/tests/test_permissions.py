@@ -0,0 +1,117 @@
+"""
+Permissions loading, caching, and revocation tests.
+
+:author: Max Milazzo
+"""
+
+
+
+from app.crypto import hash
+from app.data.models import permissions
+from app.data.models.permissions import Permissions
+from app.data.storage import permissions_store
+from app.util import broadcast
+from app.util.cache import LRUCache
+
+import pytest
+
+
+
+EVENT_ID = "event"
+# test event identifier
+
+
+OWNER = "owner public key"
+USER = "user public key"
+# test public keys
+
+
+
+@pytest.fixture
+def store(monkeypatch) -> dict:
+    """
+    In-memory permissions standing in for the permissions store.
+    """
+
+    store = {}
+
+    def load_access(event_id, public_key_hash):
+        return {
+            "owner_public_key_hash": hash.generate_bytes(OWNER),
+            "permissions": store.get(public_key_hash)
+        }
+
+    def update_permissions(event_id, public_key, values):
+        store[hash.generate_bytes(public_key)] = values
+
+    def remove_permissions(event_id, public_key):
+        store.pop(hash.generate_bytes(public_key), None)
+
+    monkeypatch.setattr(permissions_store, "load_access", load_access)
+    monkeypatch.setattr(permissions_store, "update_permissions", update_permissions)
+    monkeypatch.setattr(permissions_store, "remove_permissions", remove_permissions)
+
+    return store
+
+
+@pytest.fixture
+def cache(monkeypatch) -> LRUCache:
+    """
+    Enable the permissions cache (with a long entry lifetime) and its invalidation.
+    """
+
+    cache = LRUCache(16, 60)
+
+    monkeypatch.setattr(permissions, "CACHE", cache)
+    monkeypatch.setattr(
+        broadcast,
+        "handlers",
+        [lambda event_id: cache.invalidate_where(lambda key: key[0] == event_id)]
+    )
+
+    return cache
+
+
+
+def test_cache_disabled_by_default():
+    assert permissions.CACHE is None
+
+
+def test_owner_has_all_permissions(store):
+    assert all(dict(Permissions.load(EVENT_ID, OWNER)).values())
+    assert not any(dict(Permissions.load(EVENT_ID, USER)).values())
+
+
+def test_revocation_takes_effect_immediately(store):
+    Permissions(stamp_ticket=True).update(EVENT_ID, USER)
+    assert Permissions.load(EVENT_ID, USER).is_authorized("stamp_ticket")
+
+    Permissions().update(EVENT_ID, USER)
+    assert not Permissions.load(EVENT_ID, USER).is_authorized("stamp_ticket")
+
+
+def test_cached_revocation_takes_effect_immediately(store, cache):
+    Permissions(stamp_ticket=True).update(EVENT_ID, USER)
+    assert Permissions.load(EVENT_ID, USER).is_authorized("stamp_ticket")
+    assert Permissions.load(EVENT_ID, USER).is_authorized("stamp_ticket")
+    assert cache.hits == 1
+
+    Permissions().update(EVENT_ID, USER)
+    assert not Permissions.load(EVENT_ID, USER).is_authorized("stamp_ticket")
+
+
+def test_load_racing_update_is_not_cached(store, cache, monkeypatch):
+    Permissions(stamp_ticket=True).update(EVENT_ID, USER)
+    load_access = permissions_store.load_access
+
+    def racing_load_access(event_id, public_key_hash):
+        access = load_access(event_id, public_key_hash)
+        Permissions().update(EVENT_ID, USER)
+        return access
+        # the permissions are revoked after they were read, before they are cached
+
+    monkeypatch.setattr(permissions_store, "load_access", racing_load_access)
+    assert Permissions.load(EVENT_ID, USER).is_authorized("stamp_ticket")
+
+    monkeypatch.setattr(permissions_store, "load_access", load_access)
+    assert not Permissions.load(EVENT_ID, USER).is_authorized("stamp_ticket")
\ No newline at end of file
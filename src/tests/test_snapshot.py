@@ -0,0 +1,197 @@
+"""
+Offline scanner snapshot and buffered stamp upload tests.
+
+:author: Max Milazzo
+"""
+
+
+
+from app.API.models.endpoints import snapshot
+from app.crypto import exchange
+from app.crypto.asymmetric import ALGORITHMS
+from app.crypto.symmetric import SKC
+from app.data.models.permissions import Permissions
+from app.data.models.ticket import Ticket, REDEEMED_BYTE, STAMPED_BYTE
+from app.data.storage import ticket_store
+from app.error.errors import DomainException
+
+import pytest
+import uuid
+
+
+
+EVENT_ID = str(uuid.uuid4())
+# test event identifier
+
+
+EVENT_KEY = SKC.key()
+# test event ticket encryption key
+
+
+
+def make_ticket(number: int, version: int = 0) -> Ticket:
+    """
+    Build a ticket for a fresh holder.
+
+    :param number: 0-indexed ticket number
+    :param version: ticket version
+    :return: ticket model
+    """
+
+    return Ticket(
+        event_id=EVENT_ID,
+        public_key=ALGORITHMS["ed25519"]().public_key,
+        number=number,
+        version=version,
+        transfer_limit=3,
+        metadata=None,
+        event_key=EVENT_KEY
+    )
+
+
+def buffered(ticket: Ticket) -> snapshot.BufferedStamp:
+    """
+    Build a buffered stamp for a ticket.
+
+    :param ticket: ticket model
+    :return: buffered stamp
+    """
+
+    return snapshot.BufferedStamp(
+        ticket=ticket.pack(),
+        check_public_key=ticket.public_key
+    )
+
+
+@pytest.fixture
+def state(monkeypatch) -> bytearray:
+    """
+    In-memory ticket state bytes standing in for the ticket store.
+    """
+
+    state = bytearray(16)
+
+    def stamp_many(event_id, tickets, redeemed_byte, stamped_byte):
+        prior = {number: state[number] for number, _ in tickets}
+
+        for number, version in tickets:
+            if state[number] == version | redeemed_byte:
+                state[number] = version | stamped_byte
+
+        return prior
+
+    def load_snapshot(event_id):
+        return {"issued": len(state), "state_bytes": bytes(state), "flag_bytes": None}
+
+    monkeypatch.setattr(ticket_store, "stamp_many", stamp_many)
+    monkeypatch.setattr(ticket_store, "load_snapshot", load_snapshot)
+    monkeypatch.setattr(
+        snapshot.Event,
+        "get_key",
+        staticmethod(lambda event_id: EVENT_KEY)
+    )
+    monkeypatch.setattr(
+        Permissions,
+        "load",
+        classmethod(
+            lambda cls, event_id, public_key: Permissions(
+                stamp_ticket=True,
+                see_stamped_ticket=True
+            )
+        )
+    )
+
+    return state
+
+
+
+def test_exchange_round_trip():
+    private_key, public_key = exchange.generate()
+    key = SKC.key()
+
+    ephemeral, wrapped = exchange.wrap(key, public_key, b"context")
+
+    assert exchange.unwrap(wrapped, ephemeral, private_key, b"context") == key
+
+    with pytest.raises(Exception):
+        exchange.unwrap(wrapped, ephemeral, private_key, b"other context")
+
+    other_private_key, _ = exchange.generate()
+
+    with pytest.raises(Exception):
+        exchange.unwrap(wrapped, ephemeral, other_private_key, b"context")
+
+
+def test_exchange_rejects_non_x25519_key():
+    with pytest.raises(ValueError):
+        exchange.wrap(SKC.key(), ALGORITHMS["ed25519"]().public_key, b"context")
+
+
+def test_snapshot_wraps_read_key_only(state):
+    private_key, public_key = exchange.generate()
+
+    response = snapshot.SnapshotResponse.generate(
+        snapshot.SnapshotRequest(event_id=EVENT_ID, exchange_key=public_key),
+        "scanner"
+    )
+    read_key = exchange.unwrap(
+        response.read_key,
+        response.exchange_key,
+        private_key,
+        EVENT_ID.encode("utf-8")
+    )
+
+    assert read_key == Ticket.read_key(EVENT_ID, EVENT_KEY)
+    assert read_key != EVENT_KEY
+
+    ticket = make_ticket(1)
+    scanned = Ticket.scan(EVENT_ID, ticket.public_key, ticket.pack(), read_key)
+    assert scanned["number"] == 1
+    # a scanner can read genuine tickets
+
+    body = ticket.model_copy(update={"event_key": read_key}).pack(3)[len("3."):]
+    forged = "4." + Ticket._b64encode(Ticket._b64decode(body) + bytes(16))
+    # encrypt a ticket body under the read key (as a scanner could) with a made-up seal
+
+    assert Ticket.scan(EVENT_ID, ticket.public_key, forged, read_key)["number"] == 1
+
+    with pytest.raises(DomainException):
+        Ticket.decrypt(EVENT_ID, ticket.public_key, forged, EVENT_KEY)
+    # but the server rejects it
+
+
+def test_stamp_upload_results(state):
+    redeemed, unredeemed, stamped = make_ticket(0), make_ticket(1), make_ticket(2)
+    state[0] = REDEEMED_BYTE
+    state[2] = STAMPED_BYTE
+
+    stamps = [
+        buffered(redeemed),
+        buffered(unredeemed),
+        buffered(stamped),
+        snapshot.BufferedStamp(
+            ticket=redeemed.pack(),
+            check_public_key=unredeemed.public_key
+        ),
+        buffered(unredeemed),
+        buffered(redeemed)
+    ]
+
+    response = snapshot.StampUploadResponse.generate(
+        snapshot.StampUploadRequest(event_id=EVENT_ID, stamps=stamps),
+        "scanner"
+    )
+    results = response.results
+
+    assert response.stamped == 1
+    assert state[0] == STAMPED_BYTE
+
+    assert results[0].ticket_number == 1 and results[0].error is None
+    assert results[1].error.detail == "ticket has not been redeemed"
+    assert results[2].error.detail == "ticket is already stamped"
+    assert results[3].ticket_number is None
+    assert results[3].error.detail == "ticket for different user"
+
+    assert results[4] == results[1]
+    assert results[5] == results[0]
+    # duplicates within one upload share the result of their first occurrence
\ No newline at end of file
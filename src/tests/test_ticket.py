@@ -0,0 +1,215 @@
+"""
+Ticket state machine tests.
+
+:author: Max Milazzo
+"""
+
+
+
+from app.crypto.symmetric import SKC
+from app.data.models import ticket as ticket_model
+from app.data.models.ticket import Ticket, CANCELED_BYTE, REDEEMED_BYTE, STAMPED_BYTE
+from app.data.storage import ticket_store
+from app.error.errors import DomainException, ErrorKind
+
+import pytest
+
+
+
+EVENT_ID = "event"
+# test event identifier
+
+
+EVENT_KEY = SKC.key()
+# test event ticket encryption key
+
+
+
+class FakeStore:
+    """
+    In-memory ticket state bytes standing in for the ticket store.
+    """
+
+    def __init__(self, issued: int) -> None:
+        self.state = bytearray(issued)
+
+
+    def transition_state(self, event_id, number, expected, data):
+        if event_id != EVENT_ID or number >= len(self.state):
+            return None
+
+        prior = self.state[number]
+
+        if prior == expected:
+            self.state[number] = data
+
+        return prior, self.state[number]
+
+
+    def load_state_byte(self, event_id, number):
+        if event_id != EVENT_ID or number >= len(self.state):
+            return None
+
+        return self.state[number]
+
+
+    def advance_state(self, event_id, number, data, threshold):
+        if self.state[number] >= threshold:
+            return False
+
+        self.state[number] = data
+        return True
+
+
+
+@pytest.fixture
+def store(monkeypatch) -> FakeStore:
+    """
+    Replace the ticket store state operations with an in-memory store.
+    """
+
+    store = FakeStore(4)
+
+    for name in ("transition_state", "load_state_byte", "advance_state"):
+        monkeypatch.setattr(ticket_store, name, getattr(store, name))
+
+    monkeypatch.setattr(
+        ticket_model.Event,
+        "get_key",
+        staticmethod(lambda event_id: EVENT_KEY)
+    )
+
+    return store
+
+
+def make_ticket(number: int = 0, version: int = 0, event_id: str = EVENT_ID) -> Ticket:
+    """
+    Build a ticket model.
+
+    :param number: 0-indexed ticket number
+    :param version: ticket version
+    :param event_id: event identifier
+    :return: ticket model
+    """
+
+    return Ticket(
+        event_id=event_id,
+        public_key="holder public key",
+        number=number,
+        version=version,
+        transfer_limit=2,
+        metadata=None,
+        event_key=EVENT_KEY
+    )
+
+
+def conflict(action, message: str, kind: ErrorKind = ErrorKind.CONFLICT) -> None:
+    """
+    Run a ticket action, expecting a domain error.
+
+    :param action: ticket action
+    :param message: expected error message
+    :param kind: expected error kind
+    """
+
+    with pytest.raises(DomainException) as error:
+        action()
+
+    assert error.value.kind == kind
+    assert error.value.message == message
+
+
+
+def test_redeem(store):
+    ticket = make_ticket()
+
+    assert ticket.verify() == (False, False)
+    ticket.redeem()
+    assert ticket.verify() == (True, False)
+    assert store.state[0] == REDEEMED_BYTE
+
+
+def test_double_redeem(store):
+    ticket = make_ticket()
+    ticket.redeem()
+
+    conflict(ticket.redeem, "ticket redemption failed")
+
+
+def test_stamp_before_redeem(store):
+    ticket = make_ticket()
+
+    conflict(ticket.stamp, "ticket has not been redeemed")
+    assert store.state[0] == 0
+
+
+def test_stamp_and_double_stamp(store):
+    ticket = make_ticket()
+    ticket.redeem()
+    ticket.stamp()
+
+    assert ticket.verify() == (True, True)
+    assert store.state[0] == STAMPED_BYTE
+
+    conflict(ticket.stamp, "ticket is already stamped")
+
+
+def test_superseded(store):
+    old = make_ticket()
+    new = Ticket.reissue(EVENT_ID, "recipient public key", 0, 0, 2, None)
+
+    assert new.version == 1
+    assert store.state[0] == 1
+
+    conflict(old.verify, "ticket superseded")
+    conflict(old.redeem, "ticket superseded")
+    conflict(old.stamp, "ticket superseded")
+    conflict(
+        lambda: Ticket.reissue(EVENT_ID, "other public key", 0, 0, 2, None),
+        "ticket superseded"
+    )
+
+    new.redeem()
+    assert new.verify() == (True, False)
+
+
+def test_canceled(store):
+    ticket = make_ticket()
+    Ticket.cancel(EVENT_ID, 0, 5)
+
+    assert store.state[0] == CANCELED_BYTE | 5
+
+    conflict(ticket.verify, "ticket canceled")
+    conflict(ticket.redeem, "ticket canceled")
+    conflict(ticket.stamp, "ticket canceled")
+    conflict(
+        lambda: Ticket.reissue(EVENT_ID, "recipient public key", 0, 0, 2, None),
+        "ticket canceled"
+    )
+
+
+def test_missing_event(store):
+    conflict(make_ticket(event_id="other").redeem, "event not found", ErrorKind.NOT_FOUND)
+
+
+def test_transfer_limit_checks_state_first(store):
+    reissue = lambda: Ticket.reissue(EVENT_ID, "recipient public key", 0, 2, 2, None)
+    # transfer a ticket at its event's transfer limit (version 2)
+
+    store.state[0] = 2
+    conflict(reissue, "ticket transfer limit reached")
+
+    store.state[0] = 3
+    conflict(reissue, "ticket superseded")
+
+    store.state[0] = CANCELED_BYTE
+    conflict(reissue, "ticket canceled")
+
+
+def test_redeemed_ticket_cannot_transfer(store):
+    make_ticket().redeem()
+
+    conflict(
+        lambda: Ticket.reissue(EVENT_ID, "recipient public key", 0, 0, 2, None),
+        "ticket transfer failed"
+    )
\ No newline at end of file
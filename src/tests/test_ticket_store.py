@@ -0,0 +1,137 @@
+"""
+Ticket state storage statement tests (against a recording connection pool).
+
+:author: Max Milazzo
+"""
+
+
+
+from app.crypto.symmetric import SKC
+from app.data.models.ticket import Ticket, REDEEMED_BYTE, STAMPED_BYTE
+from app.data.storage import connection, ticket_store
+from app.data.storage.ticket_store import STATE_PAGE_SIZE
+
+import contextlib
+import pytest
+
+
+
+class RecordingCursor:
+    """
+    Cursor stand-in recording executed statements (every query returns no rows).
+    """
+
+    def __init__(self, statements: list) -> None:
+        self.statements = statements
+
+
+    def __enter__(self) -> "RecordingCursor":
+        return self
+
+
+    def __exit__(self, *_) -> None:
+        pass
+
+
+    def execute(self, query: str, params=None) -> None:
+        self.statements.append((" ".join(query.split()), params))
+
+
+    def fetchall(self) -> list:
+        return []
+
+
+
+class RecordingConnection:
+    """
+    Connection stand-in (one transaction per connection).
+    """
+
+    def __init__(self) -> None:
+        self.statements = []
+
+
+    def cursor(self) -> RecordingCursor:
+        return RecordingCursor(self.statements)
+
+
+
+class RecordingPool:
+    """
+    Connection pool stand-in keeping every connection handed out.
+    """
+
+    def __init__(self) -> None:
+        self.connections = []
+
+
+    @contextlib.contextmanager
+    def connection(self):
+        conn = RecordingConnection()
+        self.connections.append(conn)
+
+        yield conn
+
+
+
+@pytest.fixture
+def pool(monkeypatch) -> RecordingPool:
+    """
+    Replace the database connection pool with a recording pool.
+    """
+
+    pool = RecordingPool()
+    monkeypatch.setattr(connection, "get_pool", lambda: pool)
+
+    return pool
+
+
+
+def test_stamp_many_locks_pages_in_order(pool):
+    high, low = 2 * STATE_PAGE_SIZE + 7, 5
+
+    ticket_store.stamp_many("event", [(high, 0), (low, 0)], REDEEMED_BYTE, STAMPED_BYTE)
+    ticket_store.stamp_many("event", [(low, 0), (high, 0)], REDEEMED_BYTE, STAMPED_BYTE)
+    # two multi-page batches overlapping on the same pages, in opposite order
+
+    assert len(pool.connections) == 2
+
+    for conn in pool.connections:
+        lock, params = conn.statements[0]
+
+        assert lock.startswith("SELECT page FROM event_state_pages")
+        assert lock.endswith("ORDER BY page FOR UPDATE;")
+        assert params == ("event", [0, 2])
+        # every batch takes the same page locks in the same (ascending) order before
+        # it updates any page
+
+
+def test_ticket_stamp_many_sorts_tickets(monkeypatch):
+    calls = []
+
+    def stamp_many(event_id, tickets, redeemed, stamped):
+        calls.append(tickets)
+        return {}
+
+    monkeypatch.setattr(ticket_store, "stamp_many", stamp_many)
+
+    tickets = [
+        Ticket(
+            event_id="event",
+            public_key="holder public key",
+            number=number,
+            version=0,
+            transfer_limit=3,
+            metadata=None,
+            event_key=SKC.key()
+        )
+        for number in (2000, 5, 1030)
+    ]
+
+    results = Ticket.stamp_many(tickets)
+
+    assert calls == [[(5, 0), (1030, 0), (2000, 0)]]
+    # tickets scanned in any order (as /validate/batch and /snapshot/stamps pass
+    # them) reach the store in ticket number order
+    assert len(results) == 3
+    # results stay in ticket order (every ticket is missing from the empty store)
\ No newline at end of file